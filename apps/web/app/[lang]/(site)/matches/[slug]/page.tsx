@@ -6,7 +6,7 @@ import ChartFigure from "@/components/ChartFigure";
 import FormationPitch from "@/components/FormationPitch";
 import AdUnit from "@/components/AdUnit";
 import { buildArticleMetadata, buildBreadcrumbJsonLd, buildJsonLd } from "@/lib/seo";
-import { listMatchIds, readMatchArticle } from "@/lib/content";
+import { listMatchIds, readArticleSidecar, readMatchArticle, type MatchArticle } from "@/lib/content";
 import { buildLocalizedPath, getT, normalizeLang, SUPPORTED_LANGS } from "@/i18n";
 
 import SocialShare from "@/components/SocialShare";
@@ -38,6 +38,9 @@ export default async function MatchPage({ params }: MatchPageProps) {
   if (!article) {
     notFound();
   }
+  if (!article.players && article.sidecars?.players) {
+    article.players = (await readArticleSidecar<MatchArticle["players"]>(article, "players")) ?? undefined;
+  }
 
   const articleJsonLd = buildJsonLd(article, lang);
   const breadcrumbJsonLd = buildBreadcrumbJsonLd(article, lang, { home: t("nav.home") });
@@ -6,7 +6,7 @@ const R2_PUBLIC_URL =
   "https://assets.goalgazer.xyz";
 
 interface ChartFigureProps {
-  src: string;
+  src?: string;
   alt: string;
   caption: string;
   width?: number;
@@ -20,6 +20,10 @@ export default function ChartFigure({
   width,
   height,
 }: ChartFigureProps) {
+  if (!src) {
+    return null;
+  }
+
   const normalizedSrc = (() => {
     let currentSrc = src;
     // Replace old R2 domain with new custom domain if present
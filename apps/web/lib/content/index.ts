@@ -1,6 +1,7 @@
 export * from "./types";
 export {
   listMatchIds,
+  readArticleSidecar,
   readContentJson,
   readLeagueIndex,
   readMatchArticle,
@@ -2,10 +2,16 @@ import "server-only";
 
 import { promises as fs } from "fs";
 import path from "path";
-import { contentPaths, contentRoot } from "@/lib/paths";
+import { contentPaths, contentRoot, repoRoot } from "@/lib/paths";
 import { normalizeLang, type Lang } from "@/i18n";
 import sql from "@/lib/db";
-import type { LeagueIndexContent, MatchArticle, MatchIndexEntry, SitePageContent } from "./types";
+import type {
+  LeagueIndexContent,
+  MatchArticle,
+  MatchIndexEntry,
+  SidecarBlock,
+  SitePageContent,
+} from "./types";
 
 const R2_PUBLIC_URL =
   process.env.R2_PUBLIC_URL ?? "https://assets.goalgazer.xyz";
@@ -62,7 +68,8 @@ function normalizeArticleImages(article: MatchArticle) {
     frontmatter.image = ensureAbsoluteImageUrl(frontmatter.image) ?? frontmatter.image;
   }
   if (article.figures?.length) {
-    article.figures = article.figures.map((figure) => ({
+    // Spec-only figures have no image for an <img> to show yet.
+    article.figures = article.figures.filter((figure) => figure.src).map((figure) => ({
       ...figure,
       src: ensureAbsoluteImageUrl(figure.src) ?? figure.src,
     }));
@@ -168,6 +175,26 @@ export async function readMatchArticle(
   return { article: null, resolvedLang: "en", fallback: true };
 }
 
+// Load one block of a slim-layout article on demand. Uploaded sidecars are
+// fetched from R2; sidecars not yet uploaded are read from the pipeline cache.
+export async function readArticleSidecar<T>(article: MatchArticle, block: SidecarBlock): Promise<T | null> {
+  const ref = article.sidecars?.[block];
+  if (!ref) {
+    return null;
+  }
+  try {
+    if (ref.src.startsWith("http://") || ref.src.startsWith("https://")) {
+      // Sidecars are content-addressed, so a cached copy never goes stale.
+      const response = await fetch(ref.src, { cache: "force-cache" });
+      return response.ok ? ((await response.json()) as T) : null;
+    }
+    return await readJsonIfExists<T>(path.join(repoRoot, "tools", "pipeline", ".cache", ref.src.replace(/^\/+/, "")));
+  } catch (e) {
+    console.error(`Failed to load ${block} sidecar ${ref.src}:`, e);
+    return null;
+  }
+}
+
 export interface MatchListOptions {
   lang?: string;
   league?: string;
@@ -1,11 +1,16 @@
 export interface FigureMeta {
     id: string;
+    /** Image URL. Figures published as a chart spec only are dropped by the reader. */
     src: string;
     alt: string;
     caption: string;
     width?: number;
     height?: number;
     kind?: string;
+    /** Optional JSON chart spec for client-side rendering. */
+    spec?: string;
+    /** Content hash of the rendered files; unchanged figures are not re-uploaded. */
+    sha256?: string;
 }
 
 export interface ArticleSection {
@@ -90,6 +95,16 @@ export interface MatchArticle {
     data_citations?: string[];
     data_provenance?: Record<string, any>;
     multiverse?: MultiverseData;
+    sidecars?: Partial<Record<SidecarBlock, SidecarRef>>;
+}
+
+// Blocks moved out of slim-layout articles (see goalgazer/sidecars.py).
+export type SidecarBlock = "team_stats_raw" | "players" | "provenance";
+
+export interface SidecarRef {
+    src: string;
+    sha256: string;
+    bytes: number;
 }
 
 export interface PlayerRow {
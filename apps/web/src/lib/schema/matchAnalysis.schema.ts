@@ -48,15 +48,18 @@ const normalizedStatsSchema = z.object({
   pass_accuracy: z.number().nullable().optional(),
 });
 
-const figureSchema = z.object({
-  id: z.string(),
-  src: z.string(),
-  alt: z.string(),
-  caption: z.string(),
-  width: z.number(),
-  height: z.number(),
-  kind: z.enum(["stats_comparison", "timeline", "pass_network", "shot_proxy", "other"]),
-});
+const figureSchema = z
+  .object({
+    id: z.string(),
+    src: z.string().optional(),
+    alt: z.string(),
+    caption: z.string(),
+    width: z.number(),
+    height: z.number(),
+    kind: z.enum(["stats_comparison", "timeline", "pass_network", "shot_proxy", "other"]),
+    spec: z.string().optional(),
+  })
+  .refine((figure) => figure.src || figure.spec, { message: "figure needs a src or a spec" });
 
 const claimSchema = z.object({
   claim: z.string(),
@@ -142,6 +145,15 @@ export const matchAnalysisSchema = z.object({
   player_notes: z.array(playerNoteSchema),
   data_limitations: z.array(z.string()),
   cta: z.string(),
+  sidecars: z
+    .record(
+      z.object({
+        src: z.string(),
+        sha256: z.string(),
+        bytes: z.number(),
+      })
+    )
+    .optional(),
 });
 
 export type MatchAnalysis = z.infer<typeof matchAnalysisSchema>;
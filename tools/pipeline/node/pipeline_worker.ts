@@ -0,0 +1,59 @@
+// Client for a long-lived Python worker started with
+//   python -m goalgazer --mode worker --listen 127.0.0.1:8765
+// Jobs are POSTed to /jobs and the worker streams newline-delimited JSON
+// events back (queued, progress..., then article or error), so a run skips
+// interpreter start-up and warm-up and costs only the work itself.
+
+export interface WorkerJobOptions {
+  narrative?: "llm" | "rules";
+  layout?: "full" | "slim";
+  refresh_llm?: boolean;
+}
+
+export interface WorkerJobResult {
+  article: Record<string, any>;
+  diff?: { patch: any; summary: any };
+}
+
+export async function runOnWorker(
+  workerUrl: string,
+  matchId: string,
+  league: string,
+  previous?: Record<string, any> | null,
+  options: WorkerJobOptions = {},
+  onProgress?: (event: Record<string, any>) => void
+): Promise<WorkerJobResult> {
+  const response = await fetch(`${workerUrl.replace(/\/$/, "")}/jobs`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ id: matchId, matchId, league, options, ...(previous ? { previous } : {}) }),
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Worker rejected job ${matchId}: ${response.status} ${await response.text()}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    buffered += decoder.decode(value ?? new Uint8Array(), { stream: !done });
+    let newline: number;
+    while ((newline = buffered.indexOf("\n")) >= 0) {
+      const line = buffered.slice(0, newline).trim();
+      buffered = buffered.slice(newline + 1);
+      if (!line) continue;
+      const event = JSON.parse(line);
+      if (event.event === "article") {
+        return { article: event.article, diff: event.diff };
+      }
+      if (event.event === "error") {
+        throw new Error(`Worker job ${matchId} failed: ${event.error}`);
+      }
+      onProgress?.(event);
+    }
+    if (done) {
+      throw new Error(`Worker closed the stream for ${matchId} without a result.`);
+    }
+  }
+}
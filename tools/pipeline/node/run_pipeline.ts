@@ -1,8 +1,9 @@
 #!/usr/bin/env node
-import { spawnSync } from "child_process";
+import { spawn, spawnSync } from "child_process";
 import fs from "fs";
 import path from "path";
-import { translateArticle } from "./translate";
+import readline from "readline";
+import { translateArticle, translateArticlesWithPython } from "./translate";
 import sql from "./db";
 import { generateImageBuffer } from "../../../apps/web/lib/pollinations";
 import { uploadToR2 } from "../../../apps/web/lib/r2";
@@ -37,6 +38,8 @@ function getImageContentType(filePath: string) {
       return "image/webp";
     case ".svg":
       return "image/svg+xml";
+    case ".json":
+      return "application/json";
     default:
       return "image/png";
   }
@@ -80,6 +83,29 @@ async function uploadFiguresToR2(matchId: string, article: Record<string, any>)
     }
   }
 
+  for (const figure of figures) {
+    if (!figure?.spec || typeof figure.spec !== "string" || figure.spec.startsWith("http")) {
+      continue;
+    }
+    const relativeSpec = figure.spec.replace(/^\/+/, "");
+    const specPath = path.join(figuresRoot, relativeSpec);
+    if (uploadedMap.has(relativeSpec)) {
+      figure.spec = uploadedMap.get(relativeSpec);
+      continue;
+    }
+    if (!fs.existsSync(specPath)) {
+      console.warn(`⚠️  Chart spec missing for ${matchId}: ${specPath}`);
+      continue;
+    }
+    try {
+      const body = await fs.promises.readFile(specPath);
+      figure.spec = await uploadToR2(relativeSpec, body, getImageContentType(specPath));
+      await fs.promises.unlink(specPath);
+    } catch (err) {
+      console.warn(`⚠️  Failed to upload ${specPath} to R2:`, err);
+    }
+  }
+
   if (article.frontmatter?.heroImage) {
     const heroImage = article.frontmatter.heroImage as string;
     article.frontmatter.heroImage = uploadedMap.get(heroImage) ?? heroImage;
@@ -95,6 +121,29 @@ async function uploadFiguresToR2(matchId: string, article: Record<string, any>)
   }
 }
 
+// Slim-layout articles (ARTICLE_LAYOUT=slim) reference content-addressed sidecar
+// files under /generated/sidecars; upload them next to the figures.
+async function uploadSidecarsToR2(matchId: string, article: Record<string, any>) {
+  const sidecarsRoot = path.resolve(process.cwd(), "tools/pipeline/.cache");
+  for (const ref of Object.values<any>(article.sidecars ?? {})) {
+    if (!ref?.src || typeof ref.src !== "string" || ref.src.startsWith("http")) {
+      continue;
+    }
+    const relativeSrc = ref.src.replace(/^\/+/, "");
+    const filePath = path.join(sidecarsRoot, relativeSrc);
+    if (!fs.existsSync(filePath)) {
+      console.warn(`⚠️  Sidecar missing for ${matchId}: ${filePath}`);
+      continue;
+    }
+    try {
+      const body = await fs.promises.readFile(filePath);
+      ref.src = await uploadToR2(relativeSrc, body, "application/json");
+    } catch (err) {
+      console.warn(`⚠️  Failed to upload ${filePath} to R2:`, err);
+    }
+  }
+}
+
 // ... imports
 
 async function main() {
@@ -129,15 +178,26 @@ async function main() {
     const toProcess = recentMatches.filter(m => !existingIds.includes(m.matchId));
     console.log(`📝 ${toProcess.length} new matches to process.`);
 
-    // 4. Process Loop
-    for (const match of toProcess) {
-      console.log(`\n▶️  Processing ${match.home} vs ${match.away} (${match.matchId})...`);
-      try {
-        await processSingleMatch(match.matchId, league, season, pythonCmd, pythonCwd);
-      } catch (err) {
-        console.error(`❌ Failed to process match ${match.matchId}:`, err);
-        // Continue to next match
+    // 4. Generate every match in one Python process and publish each article as it arrives
+    const published = await generateArticlesInBatch(
+      toProcess.map((m) => m.matchId),
+      league,
+      pythonCmd,
+      pythonCwd,
+      async (matchId, englishPayload) => {
+        const match = toProcess.find((m) => m.matchId === matchId);
+        console.log(`\n▶️  Publishing ${match ? `${match.home} vs ${match.away} ` : ""}(${matchId})...`);
+        try {
+          await publishArticle(matchId, englishPayload, pythonCmd, pythonCwd);
+        } catch (err) {
+          console.error(`❌ Failed to publish match ${matchId}:`, err);
+          // Continue to next match
+        }
       }
+    );
+    const missing = toProcess.filter((m) => !published.has(m.matchId));
+    if (missing.length) {
+      console.warn(`⚠️  No article generated for: ${missing.map((m) => m.matchId).join(", ")}`);
     }
   }
 
@@ -219,7 +279,64 @@ async function processSingleMatch(matchId: string, league: string, season: strin
     throw new Error(`Unable to parse generated article for matchId ${matchId}.`);
   }
 
+  await publishArticle(matchId, englishPayload, pythonCmd, pythonCwd);
+}
+
+// Runs `python -m goalgazer --mode batch` once for all matches: match IDs go in
+// on stdin and one article JSON line comes back per match as soon as it is ready,
+// so imports and matplotlib warm-up are paid once per run instead of per match.
+// Set BATCH_WORKERS to fan preparation out over several processes.
+function generateArticlesInBatch(
+  matchIds: string[],
+  league: string,
+  pythonCmd: string,
+  pythonCwd: string,
+  onArticle: (matchId: string, article: Record<string, any>) => Promise<void>
+): Promise<Set<string>> {
+  const published = new Set<string>();
+  if (!matchIds.length) {
+    return Promise.resolve(published);
+  }
+  return new Promise((resolve, reject) => {
+    const child = spawn(pythonCmd, ["-m", "goalgazer", "--mode", "batch", "--matchIds-file", "-", "--league", league], {
+      cwd: pythonCwd,
+      stdio: ["pipe", "pipe", "inherit"],
+    });
+    child.stdin.end(matchIds.join("\n"));
+
+    // Publish one article at a time while Python keeps generating the rest.
+    let queue = Promise.resolve();
+    const lines = readline.createInterface({ input: child.stdout });
+    lines.on("line", (line) => {
+      if (!line.trim().startsWith("{")) {
+        return;
+      }
+      let article: Record<string, any>;
+      try {
+        article = JSON.parse(line);
+      } catch (e) {
+        console.error("❌ Failed to parse a batch article line:", (e as Error).message);
+        return;
+      }
+      const matchId = String(article.frontmatter?.matchId ?? "");
+      published.add(matchId);
+      queue = queue.then(() => onArticle(matchId, article));
+    });
+    child.on("error", reject);
+    child.on("close", (code) => {
+      queue.then(() => {
+        if (code !== 0) {
+          console.error(`❌ Python batch exited with code ${code}`);
+        }
+        resolve(published);
+      }, reject);
+    });
+  });
+}
+
+async function publishArticle(matchId: string, englishPayload: Record<string, any>, pythonCmd: string, pythonCwd: string) {
   await uploadFiguresToR2(matchId, englishPayload);
+  await uploadSidecarsToR2(matchId, englishPayload);
 
   // 2. Generate AI Match Illustration (English phase)
   console.log(`   🎨 Generating AI illustration for ${matchId}...`);
@@ -244,10 +361,12 @@ async function processSingleMatch(matchId: string, league: string, season: strin
   }
 
   // 4. Translate & Save Localized Versions
-  for (const lang of ["zh", "ja"] as const) {
-    console.log(`   Translating to ${lang}...`);
+  const languages = ["zh", "ja"] as const;
+  console.log(`   Translating to ${languages.join(", ")}...`);
+  const batched = (await translateArticlesWithPython(englishPayload, [...languages], pythonCmd, pythonCwd)) || {};
+  for (const lang of languages) {
     try {
-      const translated = await translateArticle(englishPayload, lang);
+      const translated = batched[lang] || (await translateArticle(englishPayload, lang));
       await saveToDatabase(matchId, lang, translated);
     } catch (err) {
       console.error(`❌ Translation/Save failed for ${matchId}/${lang}:`, err);
@@ -1,8 +1,10 @@
 #!/usr/bin/env node
 import { spawnSync } from "child_process";
 import fs from "fs";
+import os from "os";
 import path from "path";
-import { translateArticle } from "./translate";
+import { translateArticle, translateArticlesWithPython } from "./translate";
+import { runOnWorker, type WorkerJobResult } from "./pipeline_worker";
 import sql from "./db";
 import { generateImageBuffer } from "../../../apps/web/lib/pollinations";
 import { uploadToR2 } from "../../../apps/web/lib/r2";
@@ -113,6 +115,29 @@ async function uploadFiguresToR2(matchId: string, article: Record<string, any>)
     }
 }
 
+// Slim-layout articles (ARTICLE_LAYOUT=slim) reference content-addressed sidecar
+// files under /generated/sidecars; upload them next to the figures.
+async function uploadSidecarsToR2(matchId: string, article: Record<string, any>) {
+    const sidecarsRoot = path.resolve(process.cwd(), "tools/pipeline/.cache");
+    for (const ref of Object.values<any>(article.sidecars ?? {})) {
+        if (!ref?.src || typeof ref.src !== "string" || ref.src.startsWith("http")) continue;
+
+        const relativeSrc = ref.src.replace(/^\/+/, "");
+        const filePath = path.join(sidecarsRoot, relativeSrc);
+        if (!fs.existsSync(filePath)) {
+            log(`   ⚠️ Sidecar missing for ${matchId}: ${filePath}`);
+            continue;
+        }
+        try {
+            const body = await fs.promises.readFile(filePath);
+            ref.src = await uploadToR2(relativeSrc, body, "application/json");
+            log(`   ✅ Uploaded sidecar: ${relativeSrc} -> ${ref.src}`);
+        } catch (err) {
+            log(`   ❌ Failed to upload sidecar ${relativeSrc}:`, err);
+        }
+    }
+}
+
 async function main() {
     loadEnv();
     const args = process.argv.slice(2);
@@ -154,11 +179,64 @@ async function main() {
     }
 }
 
-async function processSingleMatch(matchId: string, league: string, season: string, pythonCmd: string, pythonCwd: string) {
+async function loadPublishedArticle(matchId: string): Promise<Record<string, any> | null> {
+    try {
+        const rows = await sql`
+      SELECT content FROM match_content WHERE match_id = ${matchId} AND lang = 'en' LIMIT 1
+    `;
+        return rows.length ? (rows[0].content as Record<string, any>) : null;
+    } catch (err) {
+        log(`   ⚠️ Could not load the published article for ${matchId}; republishing in full.`, err);
+        return null;
+    }
+}
+
+// Figures and sidecars the diff reports as unchanged keep their published
+// URLs; only added or re-rendered files go to R2.
+function reusePublishedAssets(article: Record<string, any>, previous: Record<string, any>, summary: any) {
+    const upload: string[] = summary.figures.upload;
+    const figuresRoot = path.resolve(process.cwd(), "tools/pipeline/.cache");
+    const published = new Map<string, any>((previous.figures || []).map((figure: any) => [figure.id, figure]));
+    const reused = new Map<string, string>();
+    for (const figure of article.figures || []) {
+        const old = published.get(figure.id);
+        if (!old || upload.includes(figure.id)) continue;
+        for (const field of ["src", "spec"]) {
+            if (typeof figure[field] !== "string" || !old[field]) continue;
+            reused.set(figure[field], old[field]);
+            fs.rmSync(path.join(figuresRoot, figure[field].replace(/^\/+/, "")), { force: true });
+            figure[field] = old[field];
+        }
+    }
+    const heroImage = article.frontmatter?.heroImage;
+    if (heroImage && heroImage.startsWith("/generated/") && previous.frontmatter?.heroImage) {
+        article.frontmatter.heroImage = reused.get(heroImage) ?? previous.frontmatter.heroImage;
+    }
+    if (article.sidecars && previous.sidecars && !summary.fields.includes("sidecars")) {
+        article.sidecars = previous.sidecars;
+    }
+    log(`   ♻️ Reusing ${reused.size} published figure file(s); uploading ${upload.length ? upload.join(", ") : "none"}.`);
+}
+
+async function generateWithPython(
+    matchId: string,
+    league: string,
+    previous: Record<string, any> | null,
+    pythonCmd: string,
+    pythonCwd: string
+): Promise<{ article: Record<string, any>; diff: WorkerJobResult["diff"] | null }> {
     const pythonModule = "goalgazer";
 
     log(`   ⚙️ Invoking Python module: ${pythonModule} for analysis...`);
     const pythonArgs = ["-m", pythonModule, "--matchId", matchId, "--league", league];
+
+    const workDir = fs.mkdtempSync(path.join(os.tmpdir(), `goalgazer-${matchId}-`));
+    const previousPath = path.join(workDir, "previous.json");
+    const diffPath = path.join(workDir, "diff.json");
+    if (previous) {
+        fs.writeFileSync(previousPath, JSON.stringify(previous));
+        pythonArgs.push("--previous", previousPath, "--diff-out", diffPath);
+    }
     log(`   Command: ${pythonCmd} ${pythonArgs.join(" ")}`);
 
     const pythonResult = spawnSync(pythonCmd, pythonArgs, {
@@ -194,9 +272,54 @@ async function processSingleMatch(matchId: string, league: string, season: strin
         throw new Error(`Unable to parse generated article for matchId ${matchId}.`);
     }
 
+    let diff: { patch: any; summary: any } | null = null;
+    if (previous && fs.existsSync(diffPath)) {
+        diff = JSON.parse(fs.readFileSync(diffPath, "utf-8"));
+    }
+    fs.rmSync(workDir, { recursive: true, force: true });
+    return { article: englishPayload, diff };
+}
+
+
+async function processSingleMatch(matchId: string, league: string, season: string, pythonCmd: string, pythonCwd: string) {
+    // Diff against the published article so only what changed is redone.
+    const previous = await loadPublishedArticle(matchId);
+
+    // A running worker (python -m goalgazer --mode worker --listen ...) skips interpreter start-up.
+    const workerUrl = process.env.GOALGAZER_WORKER_URL;
+    let generated;
+    if (workerUrl) {
+        log(`   ⚙️ Sending ${matchId} to the pipeline worker at ${workerUrl}...`);
+        generated = await runOnWorker(workerUrl, matchId, league, previous, {}, (event) =>
+            log(`   ⏱️ ${event.stage ?? event.event}${event.seconds != null ? ` (${event.seconds}s)` : ""}`)
+        );
+    } else {
+        generated = await generateWithPython(matchId, league, previous, pythonCmd, pythonCwd);
+    }
+    const englishPayload: any = generated.article;
+    const diff = generated.diff ?? null;
+
+    if (diff && !diff.summary.changed) {
+        log(`   ⏭️ No changes since the published version of ${matchId}; nothing to republish.`);
+        return;
+    }
+    const fields: string[] | undefined = diff?.summary.fields;
+    if (diff) {
+        log(`   🔀 Changed: ${fields!.join(", ")} (${diff.summary.strings.changed}/${diff.summary.strings.total} strings new).`);
+        reusePublishedAssets(englishPayload, previous!, diff.summary);
+    }
+
     // Upload figures
     await uploadFiguresToR2(matchId, englishPayload);
+    await uploadSidecarsToR2(matchId, englishPayload);
 
+    // The published illustration stays valid while the fixture is unchanged.
+    if (diff && !fields!.includes("match")) {
+        log(`   💾 Saving English version to database (changed fields only)...`);
+        await saveToDatabase(matchId, "en", englishPayload, "", fields);
+        await translateAndSave(matchId, englishPayload, pythonCmd, pythonCwd, fields);
+        return;
+    }
     // AI Match Illustration
     log(`   🎨 Generating AI illustration for ${matchId}...`);
     const teams = englishPayload.frontmatter?.teams || [];
@@ -215,24 +338,45 @@ async function processSingleMatch(matchId: string, league: string, season: strin
 
     // Save English
     log(`   💾 Saving English version to database (OVERWRITE)...`);
-    await saveToDatabase(matchId, "en", englishPayload, imageUrl);
+    await saveToDatabase(matchId, "en", englishPayload, imageUrl, fields);
+    await translateAndSave(matchId, englishPayload, pythonCmd, pythonCwd, fields);
+}
 
-    // Translate
-    for (const lang of ["zh", "ja"] as const) {
-        log(`   🌏 Translating to ${lang}...`);
+// Strings already in the translation memory are not sent to the model again,
+// so retranslating an edited article only pays for the new strings.
+async function translateAndSave(
+    matchId: string,
+    englishPayload: Record<string, any>,
+    pythonCmd: string,
+    pythonCwd: string,
+    fields?: string[]
+) {
+    const languages = ["zh", "ja"] as const;
+    log(`   🌏 Translating to ${languages.join(", ")}...`);
+    const batched = (await translateArticlesWithPython(englishPayload, [...languages], pythonCmd, pythonCwd)) || {};
+    for (const lang of languages) {
         try {
-            const translated = await translateArticle(englishPayload, lang);
+            const translated = batched[lang] || (await translateArticle(englishPayload, lang));
             log(`   ✅ Translation (${lang}) successful.`);
-            log(`   💾 Saving ${lang} version to database (OVERWRITE)...`);
-            await saveToDatabase(matchId, lang, translated);
+            log(`   💾 Saving ${lang} version to database (${fields ? "changed fields only" : "OVERWRITE"})...`);
+            await saveToDatabase(matchId, lang, translated, "", fields);
         } catch (err) {
             log(`   ❌ Translation/Save failed for ${lang}:`, err);
         }
     }
 }
 
-async function saveToDatabase(matchId: string, lang: string, article: Record<string, any>, imageUrl: string = "") {
+async function saveToDatabase(
+    matchId: string,
+    lang: string,
+    article: Record<string, any>,
+    imageUrl: string = "",
+    fields?: string[]
+) {
     const sanitizedArticle = sanitizeForDatabase(article);
+    if (fields && (await updateChangedFields(matchId, lang, sanitizedArticle, fields))) {
+        return;
+    }
     const frontmatter = sanitizedArticle.frontmatter || {};
     const match = sanitizedArticle.match || {};
     const teams = frontmatter.teams || [];
@@ -302,6 +446,41 @@ async function saveToDatabase(matchId: string, lang: string, article: Record<str
     }
 }
 
+// Rewrite only the top-level content keys the diff reported. A changed fixture
+// also touches the matches row, so it takes the full upsert instead; so does
+// a language with no stored row yet (returns false).
+async function updateChangedFields(
+    matchId: string,
+    lang: string,
+    article: Record<string, any>,
+    fields: string[]
+): Promise<boolean> {
+    if (fields.includes("match")) {
+        return false;
+    }
+    const frontmatter = article.frontmatter || {};
+    const changed = Object.fromEntries(fields.filter((key) => key in article).map((key) => [key, article[key]]));
+    const removed = fields.filter((key) => !(key in article));
+    try {
+        const result = await sql`
+      UPDATE match_content
+      SET content = (content - ${removed}::text[]) || ${sql.json(changed)},
+          title = ${frontmatter.title || ""},
+          description = ${frontmatter.description || ""},
+          updated_at = NOW()
+      WHERE match_id = ${matchId} AND lang = ${lang}
+    `;
+        if (result.count === 0) {
+            return false;
+        }
+        log(`   ✅ DB fields updated for ${matchId} (${lang}): ${fields.join(", ")}`);
+        return true;
+    } catch (err) {
+        log(`   ❌ DB Error updating fields for ${matchId} (${lang}):`, err);
+        throw err;
+    }
+}
+
 function sanitizeForDatabase<T>(value: T): T {
     if (typeof value === "string") {
         return value.replace(/\u0000/g, "") as T;
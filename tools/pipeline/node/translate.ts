@@ -1,4 +1,4 @@
-import { spawnSync } from "child_process";
+import { spawn, spawnSync } from "child_process";
 import fs from "fs";
 import os from "os";
 import path from "path";
@@ -70,6 +70,50 @@ Hard rules:
 
 const schemaPath = path.resolve(process.cwd(), "tools/pipeline/python/goalgazer/schema_match_analysis.json");
 
+// Translate into every language in one call to the Python stage, which reuses
+// its translation memory and only sends unseen strings to the model. Returns
+// null when the stage is unavailable so callers can fall back to translateArticle.
+// Runs asynchronously so the event loop keeps draining a batch run's output
+// while the model translates.
+export function translateArticlesWithPython(
+  englishArticle: Record<string, unknown>,
+  languages: SupportedLanguage[],
+  pythonCmd: string,
+  pythonCwd: string
+): Promise<Partial<Record<SupportedLanguage, Record<string, unknown>>> | null> {
+  return new Promise((resolve) => {
+    const child = spawn(pythonCmd, ["-m", "goalgazer.translate", "--langs", ...languages], {
+      cwd: pythonCwd,
+      stdio: ["pipe", "pipe", "pipe"],
+    });
+    const stdout: Buffer[] = [];
+    const stderr: Buffer[] = [];
+    child.stdout.on("data", (chunk: Buffer) => stdout.push(chunk));
+    child.stderr.on("data", (chunk: Buffer) => stderr.push(chunk));
+    child.on("error", (err) => {
+      console.error(`Python translation stage unavailable: ${err.message}`);
+      resolve(null);
+    });
+    child.on("close", (code) => {
+      const errors = Buffer.concat(stderr).toString("utf-8").trim();
+      if (errors) {
+        console.error(errors);
+      }
+      if (code !== 0) {
+        resolve(null);
+        return;
+      }
+      try {
+        resolve(JSON.parse(Buffer.concat(stdout).toString("utf-8")));
+      } catch {
+        resolve(null);
+      }
+    });
+    child.stdin.on("error", () => undefined);
+    child.stdin.end(JSON.stringify(englishArticle));
+  });
+}
+
 export async function translateArticle(
   englishArticle: Record<string, unknown>,
   targetLanguage: SupportedLanguage
@@ -91,6 +135,7 @@ export async function translateArticle(
         team_stats: englishArticle.team_stats,
         players: englishArticle.players,
         data_provenance: englishArticle.data_provenance,
+        ...(englishArticle.sidecars ? { sidecars: englishArticle.sidecars } : {}),
       };
 
       // Restore locked frontmatter fields
@@ -195,7 +240,7 @@ function ensureFactParity(
   englishArticle: Record<string, unknown>,
   translatedArticle: Record<string, unknown>
 ): void {
-  const factKeys = ["match", "team_stats", "players", "data_provenance"];
+  const factKeys = ["match", "team_stats", "players", "data_provenance", "sidecars"];
   for (const key of factKeys) {
     if (!deepEqual(englishArticle[key], translatedArticle[key])) {
       throw new Error(`Fact subtree mismatch: ${key}`);
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List
+
+from goalgazer.config import settings
+from goalgazer.normalize import load_mock_match
+from goalgazer.schemas import Event, MatchData, PlayerInfo, PlayerStats
+from goalgazer.plots_pass_network import render_pass_network
+from goalgazer.plots_shot_map import render_shot_map
+from goalgazer.plots_heatmap import render_touch_heatmap
+
+
+def build_synthetic_match(n_events: int, seed: int = 0) -> MatchData:
+    """Mock match padded with an away squad and ``n_events`` random events."""
+    rng = random.Random(seed)
+    match = load_mock_match("12345")
+    away_team = next(team for team in match.teams if team.side == "away")
+    players = list(match.players)
+    for idx in range(11):
+        players.append(
+            PlayerInfo(
+                id=f"bench-{idx}",
+                name=f"Bench Player{idx}",
+                teamId=away_team.id,
+                position="M",
+                minutes=90,
+                stats=PlayerStats(),
+            )
+        )
+
+    events: List[Event] = []
+    for _ in range(n_events):
+        player = rng.choice(players)
+        roll = rng.random()
+        is_shot = roll < 0.05
+        events.append(
+            Event(
+                type="Shot" if is_shot else "Pass",
+                teamId=player.teamId,
+                playerId=player.id,
+                minute=rng.randint(0, 90),
+                second=0,
+                x=rng.uniform(0, 120),
+                y=rng.uniform(0, 80),
+                outcome=rng.choice(["Goal", "Saved", "Miss", "Blocked"]) if is_shot else "Complete",
+            )
+        )
+    return match.model_copy(update={"players": players, "events": events})
+
+
+def _time_render(render: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark figure render time against event count")
+    parser.add_argument("--events", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the best time is reported")
+    args = parser.parse_args()
+
+    out_dir = settings.figure_output_base_dir / "bench"
+    renderers: Dict[str, Callable[[MatchData], object]] = {
+        "pass_network": lambda match: render_pass_network(match, "home", out_dir / "pass_network.png"),
+        "shot_map": lambda match: render_shot_map(match, out_dir / "shot_map.png"),
+        "heatmap_grid": lambda match: render_touch_heatmap(match, "both", out_dir / "heatmap_grid.png", "grid"),
+        "heatmap_kde": lambda match: render_touch_heatmap(match, "both", out_dir / "heatmap_kde.png", "kde"),
+    }
+
+    print(f"{'events':>8} | " + " | ".join(f"{name:>14}" for name in renderers))
+    print("-" * (11 + 17 * len(renderers)))
+    for n_events in args.events:
+        match = build_synthetic_match(n_events)
+        timings = [_time_render(lambda: render(match), args.repeat) for render in renderers.values()]
+        print(f"{n_events:>8} | " + " | ".join(f"{seconds * 1000:>11.1f} ms" for seconds in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,6 @@ from __future__ import annotations
 
 import argparse
 import json
-import requests
-from goalgazer.config import settings
 
 # League IDs: 39=Premier League, 2=UCL, 140=La Liga, 78=Bundesliga, 135=Serie A, 61=Ligue 1
 LEAGUES = {
@@ -16,6 +14,10 @@ LEAGUES = {
 }
 
 def fetch_recent_matches(league_code: str = "epl", last_n: int = 5, output_json: bool = False, **kwargs):
+    # Deferred so argument errors and --help never pay for dotenv/requests.
+    import requests
+    from goalgazer.config import settings
+
     if not settings.api_football_key:
         if output_json:
             print(json.dumps({"error": "API_FOOTBALL_KEY not found"}))
@@ -99,6 +101,9 @@ def fetch_recent_matches(league_code: str = "epl", last_n: int = 5, output_json:
     print("-" * 60)
 
 def get_latest_finished_fixture_id(league_code: str = "epl", season: int = 2025) -> str | None:
+    import requests
+    from goalgazer.config import settings
+
     if not settings.api_football_key:
         print("Error: API_FOOTBALL_KEY not found in environment variables.")
         return None
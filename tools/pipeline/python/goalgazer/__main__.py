@@ -1,68 +1,114 @@
 from __future__ import annotations
 
 import argparse
+import importlib
 import json
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timezone
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# Fix a non-interactive backend before any renderer can pull in matplotlib.
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+_STARTED_AT = time.perf_counter()
+_IMPORT_TIMINGS: List[Tuple[str, float]] = []
 
 if __package__ in (None, ""):
     package_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if package_root not in sys.path:
         sys.path.insert(0, package_root)
-    from goalgazer.config import settings
-    from goalgazer.fetch_api_football import (
-        fetch_events,
-        fetch_fixture,
-        fetch_lineups,
-        fetch_stats,
-        fetch_players,
-    )
-    from goalgazer.normalize import load_mock_match, normalize_api_payload
-    from goalgazer.plots_pass_network import render_pass_network
-    from goalgazer.plots_shot_map import render_shot_map, render_shot_proxy
-    from goalgazer.plots_heatmap import render_touch_heatmap
-    from goalgazer.plots_timeline import render_match_timeline
-    from goalgazer.plots_stats import render_stats_comparison
-    from goalgazer.compose_article import (
-        build_article_json,
-        derive_metrics,
-        summarize_pass_network,
-        summarize_shots,
-        write_article,
-        build_data_provenance,
-    )
-    from goalgazer.llm_generate import generate_llm_output
-else:
-    from .config import settings
-    from .fetch_api_football import fetch_events, fetch_fixture, fetch_lineups, fetch_stats, fetch_players
-    from .normalize import load_mock_match, normalize_api_payload
-    from .plots_pass_network import render_pass_network
-    from .plots_shot_map import render_shot_map, render_shot_proxy
-    from .plots_heatmap import render_touch_heatmap
-    from .plots_timeline import render_match_timeline
-    from .plots_stats import render_stats_comparison
-    from .compose_article import (
-        build_article_json,
-        derive_metrics,
-        summarize_pass_network,
-        summarize_shots,
-        write_article,
-        build_data_provenance,
-    )
-    from .llm_generate import generate_llm_output
+_PACKAGE = __package__ or "goalgazer"
+
+
+def _load(module: str) -> ModuleType:
+    """Import a goalgazer submodule on first use and record how long it took."""
+    name = f"{_PACKAGE}.{module}"
+    if name in sys.modules:
+        return sys.modules[name]
+    started = time.perf_counter()
+    loaded = importlib.import_module(name)
+    _IMPORT_TIMINGS.append((module, time.perf_counter() - started))
+    return loaded
+
 
+def _print_startup_report() -> None:
+    print("Startup report (seconds, first import incl. new dependencies):", file=sys.stderr)
+    for module, seconds in _IMPORT_TIMINGS:
+        print(f"  import {module:<22} {seconds:8.3f}", file=sys.stderr)
+    total_imports = sum(seconds for _, seconds in _IMPORT_TIMINGS)
+    print(f"  {'total imports':<29} {total_imports:8.3f}", file=sys.stderr)
+    print(f"  {'wall since __main__':<29} {time.perf_counter() - _STARTED_AT:8.3f}", file=sys.stderr)
+    print(f"  {'modules loaded':<29} {len(sys.modules):8d}", file=sys.stderr)
+
+
+def _render_figures(match, availability, match_public_dir, pass_network):
+    """Render every figure under the configured isolation; return (figures, failures)."""
+    settings = _load("config").settings
+    guard = _load("render_guard")
+    RenderJob = guard.RenderJob
+    jobs = []
+    if availability["has_shot_locations"]:
+        render_pass_network = _load("plots_pass_network").render_pass_network
+        render_touch_heatmap = _load("plots_heatmap").render_touch_heatmap
+        render_shot_map = _load("plots_shot_map").render_shot_map
+        jobs.extend(
+            [
+                RenderJob("pass_network_home", render_pass_network, (match, "home", match_public_dir / "pass_network_home.png", pass_network)),
+                RenderJob("pass_network_away", render_pass_network, (match, "away", match_public_dir / "pass_network_away.png", pass_network)),
+                RenderJob("shot_map", render_shot_map, (match, match_public_dir / "shot_map.png")),
+                RenderJob("touch_heatmap_home", render_touch_heatmap, (match, "home", match_public_dir / "touch_heatmap_home.png")),
+            ]
+        )
+        if settings.heatmap_engine == "grid":
+            # The away heatmap is only cheap enough to add with the grid engine.
+            jobs.append(RenderJob("touch_heatmap_away", render_touch_heatmap, (match, "away", match_public_dir / "touch_heatmap_away.png")))
+    else:
+        render_shot_proxy = _load("plots_shot_map").render_shot_proxy
+        out_path = match_public_dir / "shot_proxy.png"
+        jobs.append(RenderJob("shot_proxy", render_shot_proxy, (match, out_path), fallback=lambda: render_shot_proxy(match, out_path, "spec")))
+
+    # Simple charts fall back to a matplotlib-free chart spec, published without
+    # an image (src) so the site skips it; pitch charts are dropped.
+    render_match_timeline = _load("plots_timeline").render_match_timeline
+    render_stats_comparison = _load("plots_stats").render_stats_comparison
+    timeline_path = match_public_dir / "goals_timeline.png"
+    stats_path = match_public_dir / "stats_comparison.png"
+    jobs.append(RenderJob("timeline", render_match_timeline, (match, timeline_path), fallback=lambda: render_match_timeline(match, timeline_path, "spec")))
+    jobs.append(RenderJob("stats_comparison", render_stats_comparison, (match, stats_path), fallback=lambda: render_stats_comparison(match, stats_path, "spec")))
+
+    if settings.figure_isolation == "inline":
+        outcomes = guard.run_inline(jobs)
+    else:
+        outcomes = guard.run_guarded(
+            jobs,
+            timeout=settings.figure_timeout_seconds,
+            memory_mb=settings.figure_memory_mb,
+            max_parallel=settings.figure_max_parallel or None,
+        )
+    figures = [outcome.figure for outcome in outcomes if outcome.figure is not None]
+    return figures, guard.figure_failures(outcomes)
+
+
+def prepare_match(match_id: str, league: str) -> Dict[str, Any]:
+    """Fetch, normalize and render figures for one match: everything before the narrative."""
+    settings = _load("config").settings
+    normalize = _load("normalize")
+    compose = _load("compose_article")
 
-def run_pipeline(match_id: str, league: str) -> None:
     endpoints_used = ["fixtures"]
     fetched_at_utc = datetime.now(timezone.utc).isoformat()
     if settings.api_football_key:
-        fixture = fetch_fixture(match_id)
-        events = fetch_events(match_id)
-        lineups = fetch_lineups(match_id)
-        stats = fetch_stats(match_id)
-        players_detailed = fetch_players(match_id)
-        match = normalize_api_payload(fixture, events, lineups, stats, players_detailed)
+        api = _load("fetch_api_football")
+        fixture = api.fetch_fixture(match_id)
+        events = api.fetch_events(match_id)
+        lineups = api.fetch_lineups(match_id)
+        stats = api.fetch_stats(match_id)
+        players_detailed = api.fetch_players(match_id)
+        match = normalize.normalize_api_payload(fixture, events, lineups, stats, players_detailed)
         endpoints_used.extend(
             [
                 endpoint
@@ -76,14 +122,14 @@ def run_pipeline(match_id: str, league: str) -> None:
             ]
         )
     else:
-        match = load_mock_match(match_id)
+        match = normalize.load_mock_match(match_id)
         fixture = {}
         events = {}
         lineups = {}
         stats = {}
         players_detailed = {}
 
-    data_provenance = build_data_provenance(
+    data_provenance = compose.build_data_provenance(
         match=match,
         endpoints_used=endpoints_used,
         fetched_at_utc=fetched_at_utc,
@@ -94,36 +140,100 @@ def run_pipeline(match_id: str, league: str) -> None:
     )
 
     match_public_dir = settings.figure_output_dir / match_id
-    figures = []
+    pass_network = None
     if data_provenance["availability"]["has_shot_locations"]:
-        figures.append(render_pass_network(match, "home", match_public_dir / "pass_network_home.png"))
-        figures.append(render_pass_network(match, "away", match_public_dir / "pass_network_away.png"))
-        figures.append(render_shot_map(match, match_public_dir / "shot_map.png"))
-        figures.append(render_touch_heatmap(match, "home", match_public_dir / "touch_heatmap_home.png"))
-    else:
-        figures.append(render_shot_proxy(match, match_public_dir / "shot_proxy.png"))
-    figures.append(render_match_timeline(match, match_public_dir / "goals_timeline.png"))
-    figures.append(render_stats_comparison(match, match_public_dir / "stats_comparison.png"))
-
-    metrics = derive_metrics(match, data_provenance["availability"])
-    figure_summaries = {
-        "pass_network": summarize_pass_network(match),
-        "shot_map": summarize_shots(match),
+        pass_network = _load("pass_network").compute_pass_network(match)
+    figures, failures = _render_figures(match, data_provenance["availability"], match_public_dir, pass_network)
+    if failures:
+        data_provenance["figure_failures"] = failures
+
+    return {
+        "match": match,
+        "figures": figures,
+        "data_provenance": data_provenance,
+        "metrics": compose.derive_metrics(match, data_provenance["availability"]),
+        "figure_summaries": {
+            "pass_network": compose.summarize_pass_network(match, pass_network),
+            "shot_map": compose.summarize_shots(match),
+        },
     }
 
-    llm_output = generate_llm_output(match, metrics, figure_summaries, data_provenance["availability"])
 
-    article = build_article_json(
-        match=match,
+def compose_match(prepared: Dict[str, Any], llm_output) -> Dict[str, Any]:
+    settings = _load("config").settings
+    prepared["data_provenance"]["narrative_engine"] = settings.narrative_engine
+    article = _load("compose_article").build_article_json(
+        match=prepared["match"],
         llm_output=llm_output,
-        figures=figures,
-        data_provenance=data_provenance,
+        figures=prepared["figures"],
+        data_provenance=prepared["data_provenance"],
+        evidence_catalog=prepared["metrics"],
     )
+    if settings.article_layout == "slim":
+        article = _load("sidecars").slim_article(article)
+    return article
+
+
+def _rule_output(prepared: Dict[str, Any]):
+    return _load("narrative_rules").build_rule_output(
+        prepared["match"], prepared["metrics"], prepared["data_provenance"]["availability"]
+    )
+
+
+def diff_against_previous(article: Dict[str, Any], previous_path: str, diff_out: str | None) -> None:
+    """Diff ``article`` against the published version; write {patch, summary} to ``diff_out``."""
+    article_diff = _load("article_diff")
+    with open(previous_path, encoding="utf-8") as handle:
+        previous = json.load(handle)
+    result = article_diff.diff_articles(previous, article)
+    summary = result["summary"]
+    print(
+        f"Diff vs previous: {'changed ' + ', '.join(summary['fields']) if summary['changed'] else 'no changes'}; "
+        f"{summary['strings']['changed']}/{summary['strings']['total']} strings new; "
+        f"figures to upload: {', '.join(summary['figures']['upload']) or 'none'}.",
+        file=sys.stderr,
+    )
+    if diff_out:
+        with open(diff_out, "w", encoding="utf-8") as handle:
+            json.dump(result, handle, ensure_ascii=False)
+
+
+def generate_article(match_id: str, league: str, progress: Callable[..., None] | None = None) -> Dict[str, Any]:
+    """Prepare, narrate and compose one match; ``progress(stage, **info)`` is told after each stage."""
+    settings = _load("config").settings
+    report = progress or (lambda stage, **info: None)
+    started = time.perf_counter()
+    prepared = prepare_match(match_id, league)
+    report("prepared", seconds=round(time.perf_counter() - started, 3), figures=len(prepared["figures"]))
+
+    started = time.perf_counter()
+    if settings.narrative_engine == "rules":
+        llm_output = _rule_output(prepared)
+    else:
+        with _load("llm_metrics").track(match_id) as ledger:
+            llm_output = _load("llm_generate").generate_llm_output(
+                prepared["match"],
+                prepared["metrics"],
+                prepared["figure_summaries"],
+                prepared["data_provenance"]["availability"],
+            )
+        prepared["data_provenance"]["llm_usage"] = ledger.summary()
+    report("narrated", seconds=round(time.perf_counter() - started, 3), engine=settings.narrative_engine)
+
+    started = time.perf_counter()
+    article = compose_match(prepared, llm_output)
+    report("composed", seconds=round(time.perf_counter() - started, 3))
+    return article
+
+
+def run_pipeline(match_id: str, league: str, previous_path: str | None = None, diff_out: str | None = None) -> None:
+    article = generate_article(match_id, league)
+    if previous_path:
+        diff_against_previous(article, previous_path, diff_out)
 
     # article_path = write_article(
     #     article,
     #     settings.web_content_dir / "matches",
-    #     settings.web_content_dir / "index.json",
     #     lang="en"
     # )
 
@@ -133,15 +243,212 @@ def run_pipeline(match_id: str, league: str) -> None:
     # print("Generated figures:", [figure.src_relative for figure in figures])
 
 
+def read_match_ids(text: str) -> List[str]:
+    """Match IDs separated by whitespace or commas; "#" starts a comment."""
+    ids: List[str] = []
+    for line in text.splitlines():
+        ids.extend(item for item in line.split("#", 1)[0].replace(",", " ").split() if item)
+    return ids
+
+
+def warm_worker(overrides: Dict[str, Any]) -> None:
+    """Apply the parent's CLI overrides and pay the heavy imports once per worker."""
+    settings = _load("config").settings
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    for module in ("normalize", "compose_article", "render_guard", "plots_stats", "plots_timeline", "plots_shot_map"):
+        _load(module)
+    if settings.chart_output != "spec":
+        # Pitch charts pull in mplsoccer; rendered figures need pyplot and its font cache.
+        for module in ("plots_pass_network", "plots_heatmap"):
+            _load(module)
+        importlib.import_module("matplotlib.pyplot")
+
+
+def _prepare_in_worker(task: Tuple[str, str]) -> Tuple[str, Any, str | None]:
+    match_id, league = task
+    try:
+        return match_id, prepare_match(match_id, league), None
+    except Exception as e:
+        return match_id, None, f"{type(e).__name__}: {e}"
+
+
+def _prepared_matches(match_ids: List[str], league: str, executor) -> Iterator[Tuple[str, Any, str | None]]:
+    """(match_id, prepared, error) per match; in completion order when an executor is given."""
+    if executor is None:
+        return (_prepare_in_worker((match_id, league)) for match_id in match_ids)
+    futures = [executor.submit(_prepare_in_worker, (match_id, league)) for match_id in match_ids]
+    return (future.result() for future in as_completed(futures))
+
+
+def run_batch(match_ids: List[str], league: str, workers: int = 0) -> int:
+    """Generate many matches in one process, printing one article JSON line per match.
+
+    Fetching, normalizing and figure rendering run in ``workers`` processes
+    (0 = in this process) while narratives generate concurrently on threads;
+    each article is printed as soon as it is composed. Returns the exit
+    status: 1 when any match failed.
+    """
+    settings = _load("config").settings
+    llm_batch = _load("llm_batch")
+    started = time.perf_counter()
+    written: List[str] = []
+    failed: List[str] = []
+
+    def emit(match_id: str, prepared: Dict[str, Any], llm_output) -> None:
+        try:
+            article = compose_match(prepared, llm_output)
+        except Exception as e:
+            print(f"Batch: composing {match_id} failed: {type(e).__name__}: {e}", file=sys.stderr)
+            failed.append(match_id)
+            return
+        print(json.dumps(article), flush=True)
+        written.append(match_id)
+
+    def jobs(prepared_matches):
+        for match_id, prepared, error in prepared_matches:
+            if prepared is None:
+                print(f"Batch: preparing {match_id} failed: {error}", file=sys.stderr)
+                failed.append(match_id)
+                continue
+            if settings.narrative_engine == "rules":
+                emit(match_id, prepared, _rule_output(prepared))
+                continue
+            yield llm_batch.LLMJob(
+                key=match_id,
+                match=prepared["match"],
+                metrics=prepared["metrics"],
+                figure_summaries=prepared["figure_summaries"],
+                availability=prepared["data_provenance"]["availability"],
+                context=prepared,
+            )
+
+    # Workers are not daemonic, so figure rendering can still isolate itself in
+    # child processes. Every match is submitted up front: a fork-based executor
+    # starts all its workers on the first submit, before any generation thread.
+    # Preparing in this process would fork render processes while narrative
+    # threads hold locks, so LLM batches always prepare in at least one worker.
+    if settings.narrative_engine != "rules":
+        workers = max(workers, 1)
+    executor = None
+    if workers > 0 and len(match_ids) > 1:
+        workers = min(workers, len(match_ids))
+        overrides = {name: getattr(settings, name) for name in vars(settings)}
+        # Share the cores between workers instead of each rendering cpu_count figures at once.
+        overrides["figure_max_parallel"] = settings.figure_max_parallel or max(1, (os.cpu_count() or 1) // workers)
+        executor = ProcessPoolExecutor(
+            workers,
+            mp_context=_load("render_guard").mp_context(),
+            initializer=warm_worker,
+            initargs=(overrides,),
+        )
+    try:
+        for result in llm_batch.run_llm_batch(jobs(_prepared_matches(match_ids, league, executor))):
+            prepared = result.job.context
+            if result.output is None:
+                print(f"Batch: narrative for {result.job.key} failed ({result.error}); using the rule-based draft.", file=sys.stderr)
+                llm_output = _rule_output(prepared)
+            else:
+                llm_output = result.output
+            prepared["data_provenance"]["llm_usage"] = result.usage
+            emit(result.job.key, prepared, llm_output)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    print(
+        f"Batch: {len(written)} article(s) written, {len(failed)} failed"
+        f"{' (' + ', '.join(failed) + ')' if failed else ''} in {time.perf_counter() - started:.1f}s.",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run GoalGazer content pipeline")
-    parser.add_argument("--matchId", required=True)
-    parser.add_argument("--mode", default="single")
+    parser.add_argument("--matchId")
+    parser.add_argument("--matchIds", nargs="+", default=[], help="Match IDs for --mode batch")
+    parser.add_argument(
+        "--matchIds-file",
+        help='File of match IDs for --mode batch ("-" = stdin; stdin is also read when no IDs are given)',
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Prepare batch matches in N processes (default: BATCH_WORKERS or 0 = in-process)",
+    )
+    parser.add_argument("--mode", choices=["single", "batch", "worker"], default="single")
+    parser.add_argument(
+        "--listen",
+        default="stdio",
+        help='Worker mode: "stdio" for JSON lines on stdin/stdout, or [HOST:]PORT for local HTTP',
+    )
+    parser.add_argument("--max-jobs", type=int, help="Worker mode: replace the warm process after N jobs (default: WORKER_MAX_JOBS)")
     parser.add_argument("--league", default="epl")
     parser.add_argument("--date", default="")
+    parser.add_argument(
+        "--chart-output",
+        choices=["png", "spec", "both"],
+        help=(
+            "Emit PNGs, JSON chart specs, or both (default: CHART_OUTPUT or png). "
+            "The web app does not draw specs yet: with spec, charts without a PNG are not displayed"
+        ),
+    )
+    parser.add_argument(
+        "--narrative",
+        choices=["llm", "rules"],
+        help="Write the narrative with the LLM or the instant rule-based engine (default: NARRATIVE_ENGINE or llm)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=["full", "slim"],
+        help="Embed every block, or move raw stats, players and provenance into sidecar files (default: ARTICLE_LAYOUT or full)",
+    )
+    parser.add_argument("--previous", help="Previously published article JSON to diff the new article against")
+    parser.add_argument("--diff-out", help="Write the patch and change summary against --previous to this file")
+    parser.add_argument(
+        "--refresh-llm",
+        action="store_true",
+        help="Ignore cached LLM responses and regenerate (new responses are still cached)",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Print per-module import times to stderr when the run finishes",
+    )
     args = parser.parse_args()
+    if args.chart_output:
+        _load("config").settings.chart_output = args.chart_output
+    if args.narrative:
+        _load("config").settings.narrative_engine = args.narrative
+    if args.layout:
+        _load("config").settings.article_layout = args.layout
+    if args.refresh_llm:
+        _load("config").settings.llm_cache_refresh = True
+
+    if args.mode == "worker":
+        _load("worker").serve(args.listen, args.max_jobs)
+        return
+    if args.mode == "single" and not args.matchId:
+        parser.error("--matchId is required in single mode")
 
-    run_pipeline(match_id=args.matchId, league=args.league)
+    status = 0
+    try:
+        if args.mode == "batch":
+            match_ids = list(args.matchIds) + ([args.matchId] if args.matchId else [])
+            if args.matchIds_file == "-" or (not args.matchIds_file and not match_ids):
+                match_ids += read_match_ids(sys.stdin.read())
+            elif args.matchIds_file:
+                with open(args.matchIds_file, encoding="utf-8") as handle:
+                    match_ids += read_match_ids(handle.read())
+            workers = args.workers if args.workers is not None else _load("config").settings.batch_workers
+            status = run_batch(list(dict.fromkeys(match_ids)), league=args.league, workers=workers)
+        else:
+            run_pipeline(match_id=args.matchId, league=args.league, previous_path=args.previous, diff_out=args.diff_out)
+    finally:
+        if args.startup_report:
+            _print_startup_report()
+    if status:
+        sys.exit(status)
 
 
 if __name__ == "__main__":
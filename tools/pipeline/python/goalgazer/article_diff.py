@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .translate import extract_strings
+
+# Structural diff between a previously published article and a regenerated
+# one, so an overwrite run only redoes what changed. Sections (by heading),
+# figures (by id) and player notes (by player) are matched by key rather than
+# position; claims are compared one by one inside a matched section. The
+# result has two parts:
+#   patch    {"order": {list: [keys]}, "ops": [{"op": "set"|"delete", "path", "value"}]}
+#            JSON-pointer paths into the new article; apply_patch(previous, patch)
+#            rebuilds it from the previous one.
+#   summary  what changed per unit, which figures need uploading, which
+#            top-level fields (DB columns/JSON keys) to rewrite and how many
+#            translatable strings are new.
+# A figure's src/spec are where it was uploaded, not what it shows: figures
+# are compared on their metadata and content hash, and an unchanged figure
+# keeps its published URL. Sidecar references are compared on their hashes
+# for the same reason, and a local heroImage path is not a change when the
+# previous article already has a hero image.
+
+KEYED_LISTS = ("sections", "figures", "player_notes")
+FIGURE_LOCATION_FIELDS = ("src", "spec")
+# Refreshed on every run; written through but never a reason to republish.
+VOLATILE_PATHS = ("/data_provenance/fetched_at_utc", "/data_provenance/llm_usage")
+# Objects diffed field by field rather than replaced whole.
+FIELDWISE = ("frontmatter", "data_provenance")
+
+Op = Dict[str, Any]
+
+
+def _pointer(*parts: Any) -> str:
+    return "/" + "/".join(str(part).replace("~", "~0").replace("/", "~1") for part in parts)
+
+
+def _keys(items: List[Dict[str, Any]], key: Callable[[Dict[str, Any]], str]) -> List[str]:
+    """Unique keys in list order; repeats get a "#n" suffix."""
+    seen: Dict[str, int] = {}
+    keys = []
+    for item in items:
+        base = str(key(item))
+        seen[base] = seen.get(base, 0) + 1
+        keys.append(base if seen[base] == 1 else f"{base}#{seen[base]}")
+    return keys
+
+
+KEY_FUNCS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "sections": lambda section: section.get("heading", ""),
+    "figures": lambda figure: figure.get("id", ""),
+    "player_notes": lambda note: note.get("player", ""),
+}
+
+
+def _figure_content(figure: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Without a content hash there is no way to know the image is the same.
+    if not figure.get("sha256"):
+        return None
+    return {key: value for key, value in figure.items() if key not in FIGURE_LOCATION_FIELDS}
+
+
+def _diff_fields(previous: Dict[str, Any], current: Dict[str, Any], prefix: Tuple[Any, ...]) -> List[Op]:
+    ops: List[Op] = []
+    for field, value in current.items():
+        if field not in previous or previous[field] != value:
+            ops.append({"op": "set", "path": _pointer(*prefix, field), "value": value})
+    for field in previous:
+        if field not in current:
+            ops.append({"op": "delete", "path": _pointer(*prefix, field)})
+    return ops
+
+
+def _diff_section(previous: Dict[str, Any], current: Dict[str, Any], index: int, claims: Dict[str, int]) -> List[Op]:
+    ops = _diff_fields(
+        {k: v for k, v in previous.items() if k != "claims"},
+        {k: v for k, v in current.items() if k != "claims"},
+        ("sections", index),
+    )
+    old_claims, new_claims = previous.get("claims") or [], current.get("claims") or []
+    if len(old_claims) != len(new_claims):
+        claims["added"] += max(0, len(new_claims) - len(old_claims))
+        claims["removed"] += max(0, len(old_claims) - len(new_claims))
+        claims["changed"] += sum(a != b for a, b in zip(old_claims, new_claims))
+        ops.append({"op": "set", "path": _pointer("sections", index, "claims"), "value": new_claims})
+    else:
+        for position, (old, new) in enumerate(zip(old_claims, new_claims)):
+            if old != new:
+                claims["changed"] += 1
+                ops.append({"op": "set", "path": _pointer("sections", index, "claims", position), "value": new})
+    return ops
+
+
+def diff_articles(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """{"patch": ..., "summary": ...} turning ``previous`` into ``current``."""
+    ops: List[Op] = []
+    order: Dict[str, List[str]] = {}
+    summary: Dict[str, Any] = {"claims": {"added": 0, "removed": 0, "changed": 0}}
+
+    for field in current:
+        if field in KEYED_LISTS:
+            continue
+        if field in FIELDWISE and isinstance(previous.get(field), dict) and isinstance(current[field], dict):
+            ops.extend(_diff_fields(previous[field], current[field], (field,)))
+        elif field not in previous or previous[field] != current[field]:
+            ops.append({"op": "set", "path": _pointer(field), "value": current[field]})
+    for field in previous:
+        if field not in current and field not in KEYED_LISTS:
+            ops.append({"op": "delete", "path": _pointer(field)})
+
+    def sidecar_hashes(article: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: ref.get("sha256") for name, ref in (article.get("sidecars") or {}).items()}
+
+    if "sidecars" in current and sidecar_hashes(previous) == sidecar_hashes(current):
+        ops = [op for op in ops if op["path"] != _pointer("sidecars")]
+
+    hero = _pointer("frontmatter", "heroImage")
+    if str((current.get("frontmatter") or {}).get("heroImage", "")).startswith("/generated/") and (
+        previous.get("frontmatter") or {}
+    ).get("heroImage"):
+        ops = [op for op in ops if op["path"] != hero]
+
+    for name in KEYED_LISTS:
+        old_items, new_items = previous.get(name) or [], current.get(name) or []
+        old_keys, new_keys = _keys(old_items, KEY_FUNCS[name]), _keys(new_items, KEY_FUNCS[name])
+        old_by_key = dict(zip(old_keys, old_items))
+        unit = {"added": [], "removed": [k for k in old_keys if k not in set(new_keys)], "changed": []}
+        if name in current or name in previous:
+            order[name] = new_keys
+        for index, (key, item) in enumerate(zip(new_keys, new_items)):
+            old = old_by_key.get(key)
+            if old is None:
+                unit["added"].append(key)
+                ops.append({"op": "set", "path": _pointer(name, index), "value": item})
+            elif name == "sections":
+                section_ops = _diff_section(old, item, index, summary["claims"])
+                if section_ops:
+                    unit["changed"].append(key)
+                    ops.extend(section_ops)
+            elif name == "figures":
+                old_content = _figure_content(old)
+                if old_content is None or old_content != _figure_content(item):
+                    unit["changed"].append(key)
+                    ops.append({"op": "set", "path": _pointer(name, index), "value": item})
+            elif old != item:
+                unit["changed"].append(key)
+                ops.append({"op": "set", "path": _pointer(name, index), "value": item})
+        unit["reordered"] = [k for k in old_keys if k in set(new_keys)] != [k for k in new_keys if k in old_by_key]
+        summary[name] = unit
+
+    summary["figures"]["upload"] = summary["figures"]["added"] + summary["figures"]["changed"]
+    substantive = [op for op in ops if op["path"] not in VOLATILE_PATHS]
+    summary["fields"] = sorted({op["path"].split("/")[1] for op in substantive} | {
+        name for name in KEYED_LISTS
+        if summary[name]["added"] or summary[name]["removed"] or summary[name]["reordered"]
+    })
+    previous_texts = {text for _, text in extract_strings(previous)}
+    current_texts = [text for _, text in extract_strings(current)]
+    summary["strings"] = {
+        "total": len(current_texts),
+        "changed": sum(text not in previous_texts for text in current_texts),
+    }
+    summary["changed"] = bool(summary["fields"])
+    summary["ops"] = len(ops)
+    return {"patch": {"order": order, "ops": ops}, "summary": summary}
+
+
+def _resolve(document: Any, path: str) -> Tuple[Any, Any]:
+    parts = [part.replace("~1", "/").replace("~0", "~") for part in path.split("/")[1:]]
+    node = document
+    for part in parts[:-1]:
+        node = node[int(part)] if isinstance(node, list) else node.setdefault(part, {})
+    last = parts[-1]
+    return node, int(last) if isinstance(node, list) else last
+
+
+def apply_patch(previous: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the new article from ``previous`` and a patch from diff_articles."""
+    article = copy.deepcopy(previous)
+    for name, keys in patch.get("order", {}).items():
+        old_items = article.get(name) or []
+        by_key = dict(zip(_keys(old_items, KEY_FUNCS[name]), old_items))
+        article[name] = [by_key.get(key) for key in keys]
+    for op in patch.get("ops", []):
+        node, key = _resolve(article, op["path"])
+        if op["op"] == "set":
+            node[key] = copy.deepcopy(op["value"])
+        else:
+            node.pop(key, None)
+    return article
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Diff two article JSON files")
+    parser.add_argument("previous", help="Previously published article JSON")
+    parser.add_argument("current", help="Regenerated article JSON")
+    parser.add_argument("--summary-only", action="store_true", help="Print only the change summary")
+    args = parser.parse_args()
+    with open(args.previous, encoding="utf-8") as handle:
+        previous = json.load(handle)
+    with open(args.current, encoding="utf-8") as handle:
+        current = json.load(handle)
+    result = diff_articles(previous, current)
+    print(json.dumps(result["summary"] if args.summary_only else result, ensure_ascii=False))
+    summary = result["summary"]
+    print(
+        f"{summary['ops']} op(s); fields {summary['fields'] or 'none'}; "
+        f"{summary['strings']['changed']}/{summary['strings']['total']} strings to translate; "
+        f"figures to upload {summary['figures']['upload'] or 'none'}.",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .config import settings
+from .schemas import MatchData
+from .figure_paths import build_src_relative
+
+if TYPE_CHECKING:
+    from .pass_network import TeamPassNetwork
+
+# Compact JSON chart specs for drawing charts client-side. This module must
+# not import matplotlib: spec-only output exists to keep it off the hot path.
+# The web app has no spec renderer yet; it skips figures that have no PNG, so
+# charts emitted as spec only are not shown on the site.
+
+SPEC_VERSION = 1
+HOME_COLOR = "#3b82f6"
+AWAY_COLOR = "#ef4444"
+GOAL_COLOR = "#fbbf24"
+CHART_OUTPUTS = ("png", "spec", "both")
+STATSBOMB_PITCH = {"type": "statsbomb", "length": 120, "width": 80}
+
+STATS_COMPARISON_METRICS = [
+    ("Possession (%)", "possession"),
+    ("Total Shots", "total_shots"),
+    ("Shots on Target", "shots_on_target"),
+    ("Pass Accuracy (%)", "pass_accuracy"),
+    ("Corners", "corners"),
+    ("Fouls", "fouls"),
+]
+
+SHOT_PROXY_METRICS = [
+    ("Total Shots", "total_shots"),
+    ("Shots on Target", "shots_on_target"),
+]
+
+SHOT_OUTCOME_COLORS = {
+    "Goal": GOAL_COLOR,
+    "Miss": "#ef4444",
+    "Saved": "#3b82f6",
+    "Blocked": "#f97316",
+    "Off Target": "#ef4444",
+    "Woodwork": "#a855f7",
+}
+SHOT_DEFAULT_COLOR = "#6b7280"
+
+
+def resolve_output(output: Optional[str]) -> str:
+    output = output or settings.chart_output
+    if output not in CHART_OUTPUTS:
+        raise ValueError(f"Unknown chart output {output!r}; expected one of {CHART_OUTPUTS}")
+    return output
+
+
+def wants_png(output: str) -> bool:
+    return output in ("png", "both")
+
+
+def wants_spec(output: str) -> bool:
+    return output in ("spec", "both")
+
+
+def write_chart_spec(spec: Dict[str, Any], out_path: Path) -> str:
+    """Write ``spec`` next to the figure as ``<name>.json`` and return its src."""
+    spec_path = out_path.with_suffix(".json")
+    spec_path.parent.mkdir(parents=True, exist_ok=True)
+    spec_path.write_text(json.dumps(spec, separators=(",", ":"), ensure_ascii=False))
+    return build_src_relative(spec_path)
+
+
+def _round(value: float) -> float:
+    return round(float(value), 1)
+
+
+def _team_pair(match: MatchData):
+    home_team = next(t for t in match.teams if t.side == "home")
+    away_team = next(t for t in match.teams if t.side == "away")
+    return home_team, away_team
+
+
+def _bar_spec(
+    match: MatchData,
+    chart_id: str,
+    title: str,
+    orientation: str,
+    metrics: List[tuple[str, str]],
+) -> Dict[str, Any]:
+    home_team, away_team = _team_pair(match)
+    normalized = match.aggregates.normalized or {}
+    h_stats = normalized.get(home_team.id, {})
+    a_stats = normalized.get(away_team.id, {})
+    return {
+        "version": SPEC_VERSION,
+        "id": chart_id,
+        "type": "bar",
+        "orientation": orientation,
+        "title": title,
+        "categories": [label for label, _ in metrics],
+        "series": [
+            {"name": home_team.name, "color": HOME_COLOR, "values": [h_stats.get(key, 0) or 0 for _, key in metrics]},
+            {"name": away_team.name, "color": AWAY_COLOR, "values": [a_stats.get(key, 0) or 0 for _, key in metrics]},
+        ],
+    }
+
+
+def build_stats_comparison_spec(match: MatchData) -> Dict[str, Any]:
+    home_team, away_team = _team_pair(match)
+    return _bar_spec(
+        match,
+        "stats_comparison",
+        f"Team Stats Comparison: {home_team.name} vs {away_team.name}",
+        "horizontal",
+        STATS_COMPARISON_METRICS,
+    )
+
+
+def build_shot_proxy_spec(match: MatchData) -> Dict[str, Any]:
+    home_team, away_team = _team_pair(match)
+    return _bar_spec(
+        match,
+        "shot_proxy",
+        f"Shot Proxy Comparison: {home_team.name} vs {away_team.name}",
+        "vertical",
+        SHOT_PROXY_METRICS,
+    )
+
+
+def build_timeline_spec(match: MatchData) -> Dict[str, Any]:
+    home_team, _ = _team_pair(match)
+    events = match.timeline
+    max_minute = max([90] + [event.minute for event in events])
+    return {
+        "version": SPEC_VERSION,
+        "id": "timeline",
+        "type": "timeline",
+        "title": f"Match Timeline: {match.match.homeTeam['name']} vs {match.match.awayTeam['name']}",
+        "max_minute": max_minute,
+        "events": [
+            {
+                "minute": event.minute,
+                "side": "home" if event.teamId == home_team.id else "away",
+                "type": event.type,
+                "red_card": bool(event.detail and "Red Card" in event.detail),
+                "player": event.playerName or "Unknown",
+                "detail": event.detail or "",
+                "color": GOAL_COLOR if event.type == "goal" else "#ffffff",
+            }
+            for event in events
+        ],
+    }
+
+
+def shot_sizes(xs, ys):
+    """Marker sizes for shots at ``xs``/``ys``; larger nearer the goal. Shared by PNG and spec."""
+    import numpy as np
+
+    distance = np.hypot(100 - np.asarray(xs, dtype=float), 50 - np.asarray(ys, dtype=float))
+    return np.maximum(80.0, 320 - distance * 3)
+
+
+def build_shot_map_spec(match: MatchData) -> Dict[str, Any]:
+    shots = [event for event in match.events if event.type == "Shot"]
+    sizes = shot_sizes([shot.x for shot in shots], [shot.y for shot in shots])
+    return {
+        "version": SPEC_VERSION,
+        "id": "shot_map",
+        "type": "pitch_points",
+        "title": f"{match.match.homeTeam['name']} vs {match.match.awayTeam['name']}: Shot Map - All Attempts",
+        "pitch": STATSBOMB_PITCH,
+        "points": [
+            {
+                "x": _round(shot.x),
+                "y": _round(shot.y),
+                "size": _round(size),
+                "color": SHOT_OUTCOME_COLORS.get(shot.outcome or "Unknown", SHOT_DEFAULT_COLOR),
+                "outcome": shot.outcome,
+                "teamId": shot.teamId,
+            }
+            for shot, size in zip(shots, sizes)
+        ],
+    }
+
+
+def build_pass_network_spec(match: MatchData, team_side: str, team_network: "TeamPassNetwork") -> Dict[str, Any]:
+    team = next(team for team in match.teams if team.side == team_side)
+    max_link = team_network.max_link
+    return {
+        "version": SPEC_VERSION,
+        "id": f"pass_network_{team_side}",
+        "type": "pitch_network",
+        "title": f"{team.name} Pass Network & Formation",
+        "pitch": STATSBOMB_PITCH,
+        "color": HOME_COLOR if team_side == "home" else AWAY_COLOR,
+        "nodes": [
+            {
+                "id": player.id,
+                "label": player.name,
+                "position": player.position or None,
+                "x": _round(x),
+                "y": _round(y),
+                "passes": int(passes),
+            }
+            for player, x, y, passes in zip(
+                team_network.players, team_network.x, team_network.y, team_network.pass_counts
+            )
+        ],
+        "links": [
+            {"source": int(src), "target": int(dst), "count": int(count), "weight": round(int(count) / max_link, 3)}
+            for src, dst, count in zip(team_network.link_src, team_network.link_dst, team_network.link_counts)
+        ],
+    }
+
+
+def build_heatmap_spec(match: MatchData, team_side: str, bins: tuple[int, int] = (12, 8)) -> Dict[str, Any]:
+    if team_side == "both":
+        team_ids = {team.id for team in match.teams}
+    else:
+        team_ids = {next(team.id for team in match.teams if team.side == team_side)}
+    nx, ny = bins
+    grid: List[List[int]] = [[0] * nx for _ in range(ny)]
+    for event in match.events:
+        if event.teamId not in team_ids:
+            continue
+        col = min(max(int(event.x / STATSBOMB_PITCH["length"] * nx), 0), nx - 1)
+        row = min(max(int(event.y / STATSBOMB_PITCH["width"] * ny), 0), ny - 1)
+        grid[row][col] += 1
+    return {
+        "version": SPEC_VERSION,
+        "id": f"touch_heatmap_{team_side}",
+        "type": "pitch_grid",
+        "pitch": STATSBOMB_PITCH,
+        "bins": [nx, ny],
+        "values": grid,
+    }
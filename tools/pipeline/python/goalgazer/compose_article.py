@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from jsonschema import validate
 
+from .config import settings
+from .content_index import ContentIndex, index_entry
+from .evidence import EvidenceCatalog, citation_path
 from .schemas import MatchData, FigureMeta, LLMOutput
+from .validation import check_article, find_forbidden, narrative_texts
+
+if TYPE_CHECKING:
+    from .pass_network import PassNetwork
 
 
 STAT_SOURCE_MAP = {
@@ -225,9 +232,23 @@ def build_evidence_catalog(match: MatchData, players_output: Optional[Dict[str,
     return evidence
 
 
-def summarize_pass_network(match: MatchData) -> Dict[str, Any]:
-    # Legacy wrapper or enhanced summary
-    return {"status": "Complete"}
+def summarize_pass_network(match: MatchData, network: Optional[PassNetwork] = None) -> Dict[str, Any]:
+    if network is None:
+        from .pass_network import compute_pass_network
+
+        network = compute_pass_network(match)
+    teams = {}
+    for team in match.teams:
+        team_network = network.get(team.id)
+        if team_network is None or team_network.total_passes == 0:
+            continue
+        teams[team.side] = {
+            "team": team.name,
+            "completed_passes": team_network.total_passes,
+            "top_passers": team_network.top_passers(),
+            "strongest_links": team_network.strongest_links(),
+        }
+    return {"status": "Complete", **({"teams": teams} if teams else {})}
 
 
 def summarize_shots(match: MatchData) -> Dict[str, Any]:
@@ -254,21 +275,6 @@ def _filter_limitations(limitations: List[str], availability: Dict[str, bool]) -
     return filtered
 
 
-def _find_player_row(
-    players_output: Optional[Dict[str, List[Dict[str, Any]]]],
-    team_name: str,
-    player_name: str,
-) -> Optional[tuple[str, int, Dict[str, Any]]]:
-    if not players_output:
-        return None
-    team_key = team_name.strip().lower()
-    for side, players in players_output.items():
-        for idx, player in enumerate(players):
-            if player.get("name", "").strip().lower() == player_name.strip().lower():
-                return side, idx, player
-    return None
-
-
 def _extract_rating_from_summary(summary: str) -> Optional[str]:
     match = re.search(r"(\d+(?:\.\d+)?)\s*rating", summary, re.IGNORECASE)
     if match:
@@ -285,10 +291,12 @@ def build_article_json(
     llm_output: LLMOutput,
     figures: List[FigureMeta],
     data_provenance: Dict[str, Any],
+    evidence_catalog: Optional[EvidenceCatalog] = None,
 ) -> Dict[str, Any]:
     availability = data_provenance["availability"]
-    players_output = build_players_output(match, availability)
-    evidence_catalog = build_evidence_catalog(match, players_output)
+    if evidence_catalog is None:
+        evidence_catalog = derive_metrics(match, availability)
+    players_output = evidence_catalog.players_output
 
     sections = [
         {
@@ -308,7 +316,7 @@ def build_article_json(
         evidence = list(note.evidence)
 
         if availability.get("has_players") and rating_in_summary and not rating_value:
-            player_row = _find_player_row(players_output, note.team, note.player)
+            player_row = evidence_catalog.find_player(note.player)
             if player_row and player_row[2].get("rating") is not None:
                 rating_value = str(player_row[2].get("rating"))
                 rating_path = f"players.{player_row[0]}.{player_row[1]}.rating={rating_value}"
@@ -317,7 +325,7 @@ def build_article_json(
             else:
                 summary = _strip_rating_from_summary(summary)
         elif rating_value and not any(".rating" in item for item in evidence):
-            player_row = _find_player_row(players_output, note.team, note.player)
+            player_row = evidence_catalog.find_player(note.player)
             if player_row and player_row[2].get("rating") is not None:
                 rating_path = f"players.{player_row[0]}.{player_row[1]}.rating={rating_value}"
                 evidence.append(rating_path)
@@ -355,8 +363,9 @@ def build_article_json(
         "teams": [match.match.homeTeam["name"], match.match.awayTeam["name"]],
         "tags": llm_output.tags,
     }
-    if figures:
-        frontmatter["heroImage"] = figures[0].src_relative
+    hero = next((figure.src_relative for figure in figures if figure.src_relative), None)
+    if hero:
+        frontmatter["heroImage"] = hero
 
     article = {
         "frontmatter": frontmatter,
@@ -371,12 +380,14 @@ def build_article_json(
         "figures": [
             {
                 "id": figure.id,
-                "src": figure.src_relative,
+                **({"src": figure.src_relative} if figure.src_relative else {}),
                 "alt": figure.alt,
                 "caption": figure.caption,
                 "width": figure.width,
                 "height": figure.height,
                 "kind": figure.kind,
+                **({"spec": figure.spec_relative} if figure.spec_relative else {}),
+                **({"sha256": digest} if (digest := _figure_digest(figure)) else {}),
             }
             for figure in figures
         ],
@@ -392,38 +403,32 @@ def build_article_json(
     return article
 
 
-def derive_metrics(match: MatchData, availability: Dict[str, bool]) -> Dict[str, Any]:
-    players_output = build_players_output(match, availability)
-    return build_evidence_catalog(match, players_output)
+def _figure_digest(figure: FigureMeta) -> Optional[str]:
+    """SHA-256 over the rendered files, so republishing can skip unchanged figures."""
+    digest = hashlib.sha256()
+    found = False
+    for relative in (figure.src_relative, figure.spec_relative):
+        if not relative or not relative.startswith("/generated/"):
+            continue
+        path = settings.figure_output_base_dir / relative[len("/generated/"):]
+        if path.is_file():
+            digest.update(path.read_bytes())
+            found = True
+    return digest.hexdigest() if found else None
 
 
-def _validate_article(article: Dict[str, Any], evidence_catalog: Dict[str, Any], availability: Dict[str, bool]) -> None:
-    schema_path = Path(__file__).with_name("schema_match_analysis.json")
-    if schema_path.exists():
-        schema = json.loads(schema_path.read_text())
-        validate(instance=article, schema=schema)
+def derive_metrics(match: MatchData, availability: Dict[str, bool]) -> EvidenceCatalog:
+    """Build the indexed evidence catalog once per match; later stages reuse it."""
+    players_output = build_players_output(match, availability)
+    return EvidenceCatalog(build_evidence_catalog(match, players_output), players_output)
 
-    forbidden_terms = []
-    if not availability.get("has_xg"):
-        forbidden_terms.append(r"\bxg\b")
-        forbidden_terms.append(r"expected goals")
-    if not availability.get("has_players"):
-        forbidden_terms.append(r"\brating\b")
-        forbidden_terms.append(r"\bduel")
 
-    text_fields = []
-    for section in article.get("sections", []):
-        text_fields.extend(section.get("paragraphs", []))
-        text_fields.extend(section.get("bullets", []))
-        for claim in section.get("claims", []):
-            text_fields.append(claim.get("claim", ""))
-    for note in article.get("player_notes", []):
-        text_fields.append(note.get("summary", ""))
+def _validate_article(article: Dict[str, Any], evidence_catalog: EvidenceCatalog, availability: Dict[str, bool]) -> None:
+    check_article(article)
 
-    for term in forbidden_terms:
-        pattern = re.compile(term, re.IGNORECASE)
-        if any(pattern.search(text or "") for text in text_fields):
-            raise ValueError(f"Forbidden term detected in narrative: {term}")
+    term = find_forbidden(narrative_texts(article), availability)
+    if term:
+        raise ValueError(f"Forbidden term detected in narrative: {term}")
 
     for section in article.get("sections", []):
         for claim in section.get("claims", []):
@@ -447,11 +452,8 @@ def _validate_article(article: Dict[str, Any], evidence_catalog: Dict[str, Any],
         raise ValueError("Players data present when availability.has_players is false.")
 
 
-def _validate_evidence(evidence: str, evidence_catalog: Dict[str, Any]) -> None:
-    if "=" in evidence:
-        path = evidence.split("=")[0].strip()
-    else:
-        path = evidence.strip()
+def _validate_evidence(evidence: str, evidence_catalog: EvidenceCatalog) -> None:
+    path = citation_path(evidence)
     if path not in evidence_catalog:
         # Relax validation: just warn instead of failing the entire pipeline
         print(f"⚠️ Warning: Evidence path not found in catalog: {path}")
@@ -476,6 +478,9 @@ def _build_provenance_notes(article: Dict[str, Any], evidence_catalog: Dict[str,
             notes.append(
                 f"team_stats.normalized[*].{stat_key} sourced from fixtures/statistics.statistics['{source_label}']"
             )
+    for failure in article["data_provenance"].get("figure_failures", []):
+        outcome = "replaced by chart spec" if failure.get("fallback") else "omitted"
+        notes.append(f"figures.{failure['id']} {outcome}: {failure['reason']}")
     if availability.get("has_players"):
         notes.append("players[*] sourced from fixtures/players.statistics")
         for key, source in PLAYER_SOURCE_MAP.items():
@@ -485,46 +490,29 @@ def _build_provenance_notes(article: Dict[str, Any], evidence_catalog: Dict[str,
 
 
 def _extract_paths(evidence_list: List[str]) -> List[str]:
-    paths = []
-    for item in evidence_list:
-        if "=" in item:
-            paths.append(item.split("=")[0].strip())
-        else:
-            paths.append(item.strip())
-    return paths
+    return [citation_path(item) for item in evidence_list]
 
 
-def write_article(article: Dict[str, Any], output_dir: Path, index_path: Path, lang: str = "en") -> Path:
+def write_article(
+    article: Dict[str, Any],
+    output_dir: Path,
+    index: Optional[ContentIndex] = None,
+    lang: str = "en",
+) -> Path:
     match_id = article["frontmatter"]["matchId"]
-    
+
     # New structure: content/matches/<match_id>/index.<lang>.json
     match_dir = output_dir / match_id
     match_dir.mkdir(parents=True, exist_ok=True)
-    
+
     file_path = match_dir / f"index.{lang}.json"
     file_path.write_text(json.dumps(article, indent=2))
 
-    existing = []
-    if index_path.exists():
-        try:
-            existing = json.loads(index_path.read_text())
-        except json.JSONDecodeError:
-            existing = []
-            
-    date_key = article["frontmatter"]["date"].split("T")[0]
-    entry = {
-        "title": article["frontmatter"]["title"],
-        "description": article["frontmatter"]["description"],
-        "date": article["frontmatter"]["date"],
-        "matchId": match_id,
-        "slug": f"{date_key}_{match_id}", # Keep slug consistency for now
-        "teams": article["frontmatter"]["teams"],
-        "league": article["frontmatter"]["league"],
-    }
-    existing = [item for item in existing if item.get("matchId") != match_id]
-    existing.insert(0, entry)
-    
-    index_path.parent.mkdir(parents=True, exist_ok=True)
-    index_path.write_text(json.dumps(existing, indent=2))
-    
+    index = index or ContentIndex()
+    try:
+        relative = file_path.relative_to(index.root.parent).as_posix()
+    except ValueError:
+        relative = file_path.as_posix()
+    index.upsert(index_entry(article, relative, lang))
+
     return file_path
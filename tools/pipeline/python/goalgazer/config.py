@@ -16,12 +16,49 @@ class Settings:
     pollinations_api_key: str | None = os.getenv("POLLINATIONS_API_KEY")
     pollinations_model: str = os.getenv("POLLINATIONS_MODEL", "openai")
     pollinations_endpoint: str = "https://gen.pollinations.ai/v1/chat/completions"
+    heatmap_engine: str = os.getenv("HEATMAP_ENGINE", "kde")  # kde | grid (histogram + blur, linear in events)
+    chart_output: str = os.getenv("CHART_OUTPUT", "png")  # png | spec | both; the site does not draw specs yet
+    figure_isolation: str = os.getenv("FIGURE_ISOLATION", "process")  # process | inline
+    figure_timeout_seconds: float = float(os.getenv("FIGURE_TIMEOUT_SECONDS", "60"))
+    figure_memory_mb: int = int(os.getenv("FIGURE_MEMORY_MB", "1024"))
+    figure_max_parallel: int = int(os.getenv("FIGURE_MAX_PARALLEL", "0"))  # 0 = cpu count
+    narrative_engine: str = os.getenv("NARRATIVE_ENGINE", "llm")  # llm | rules (instant first publish)
+    article_layout: str = os.getenv("ARTICLE_LAYOUT", "full")  # full | slim (heavy blocks in sidecars)
+    llm_cache_enabled: bool = os.getenv("LLM_CACHE", "1") != "0"
+    llm_cache_refresh: bool = os.getenv("LLM_CACHE_REFRESH", "0") == "1"  # skip reads, still store
+    llm_cache_ttl_hours: float = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))  # 0 = never expire
+    llm_stream: bool = os.getenv("LLM_STREAM", "0") == "1"  # stream and abort early on certain violations
+    llm_hedge: bool = os.getenv("LLM_HEDGE", "0") == "1"  # race providers when both are configured
+    llm_hedge_delay_seconds: float = float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "15"))  # 0 = fire all at once
+    llm_repair: bool = os.getenv("LLM_REPAIR", "1") == "1"  # fix failing fragments before a full retry
+    llm_repair_max_fragments: int = int(os.getenv("LLM_REPAIR_MAX_FRAGMENTS", "4"))
+    llm_section_parallel: bool = os.getenv("LLM_SECTION_PARALLEL", "0") == "1"  # one concurrent call per article part
+    llm_section_attempts: int = int(os.getenv("LLM_SECTION_ATTEMPTS", "2"))
+    llm_max_in_flight: int = int(os.getenv("LLM_MAX_IN_FLIGHT", "0"))  # concurrent requests, 0 = unlimited
+    llm_rate_limits: str = os.getenv("LLM_RATE_LIMITS", "")  # requests/minute, e.g. "pollinations=30,openai=120"
+    llm_batch_concurrency: int = int(os.getenv("LLM_BATCH_CONCURRENCY", "8"))  # matches generating at once
+    batch_workers: int = int(os.getenv("BATCH_WORKERS", "0"))  # processes preparing batch matches, 0 = in-process
+    worker_max_jobs: int = int(os.getenv("WORKER_MAX_JOBS", "50"))  # jobs per warm worker process before it is replaced
+    content_index_page_size: int = int(os.getenv("CONTENT_INDEX_PAGE_SIZE", "50"))
+    translation_batch_items: int = int(os.getenv("TRANSLATION_BATCH_ITEMS", "40"))
+    translation_batch_chars: int = int(os.getenv("TRANSLATION_BATCH_CHARS", "6000"))
+    llm_stub: bool = os.getenv("LLM_STUB", "0") == "1"  # route LLM calls to an in-process stub
+    llm_stub_url: str | None = os.getenv("LLM_STUB_URL")  # or to a stub started with python -m goalgazer.llm_stub
+    llm_stub_latency_ms: float = float(os.getenv("LLM_STUB_LATENCY_MS", "0"))
+    llm_stub_error_rate: float = float(os.getenv("LLM_STUB_ERROR_RATE", "0"))
+    llm_stub_malformed_rate: float = float(os.getenv("LLM_STUB_MALFORMED_RATE", "0"))
+    llm_stub_seed: int = int(os.getenv("LLM_STUB_SEED", "0"))
+    llm_prompt_token_budget: int = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "6000"))  # 0 = unlimited
     output_root: Path = Path(__file__).resolve().parents[4]
 
     @property
     def web_content_dir(self) -> Path:
         return self.output_root / "apps" / "web" / "content"
 
+    @property
+    def content_index_dir(self) -> Path:
+        return self.web_content_dir / "index"
+
     @property
     def figure_output_base_dir(self) -> Path:
         return self.output_root / "tools" / "pipeline" / ".cache" / "generated"
@@ -34,5 +71,13 @@ class Settings:
     def cache_dir(self) -> Path:
         return self.output_root / "tools" / "pipeline" / ".cache" / "api-football"
 
+    @property
+    def translation_memory_dir(self) -> Path:
+        return self.output_root / "tools" / "pipeline" / ".cache" / "translation-memory"
+
+    @property
+    def llm_cache_dir(self) -> Path:
+        return self.output_root / "tools" / "pipeline" / ".cache" / "llm"
+
 
 settings = Settings()
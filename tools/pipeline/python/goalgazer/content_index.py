@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from .config import settings
+
+# Sharded content index for published articles, replacing the single
+# index.json that was rewritten on every write. Layout under the index root:
+#   shards/<league>/<season>.json          {matchId: entry} for one league season
+#   pages/<league>/<season>/manifest.json  {total, page_size, pages, updated_at}
+#   pages/<league>/<season>/<n>.json       newest-first listing page n (1-based)
+#                                          (the page count lives in the manifest)
+#   lookup/<hh>.json                       {matchId: {path, league, season, langs}}
+#   leagues.json                           [{league, season, count}] for discovery
+# An upsert rewrites one shard, its listing pages and one lookup bucket, so the
+# cost grows with the league season, not with the whole archive. Every file is
+# replaced atomically and each read-modify-write runs under a lock file, so
+# concurrent writers in separate processes do not lose updates.
+
+LOCK_TIMEOUT_SECONDS = 30.0
+STALE_LOCK_SECONDS = 120.0
+
+
+def _segment(value: Any) -> str:
+    return re.sub(r"[^a-z0-9-]+", "-", str(value or "unknown").lower()).strip("-") or "unknown"
+
+
+def _bucket(match_id: str) -> str:
+    return hashlib.sha1(str(match_id).encode("utf-8")).hexdigest()[:2]
+
+
+def _sort_key(entry: Dict[str, Any]) -> tuple:
+    return entry.get("date") or "", str(entry.get("matchId"))
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path: Path, value: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(value, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _break_stale_lock(path: Path, seen: os.stat_result) -> None:
+    """Remove the stale lock ``seen`` without deleting a lock re-created since.
+
+    The rename is atomic, so only one waiter takes the file. If what it took is
+    not the stale lock it saw, another waiter broke that one first and a writer
+    has re-created it; the fresh lock is handed back.
+    """
+    taken = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.stale")
+    try:
+        os.rename(path, taken)
+    except FileNotFoundError:
+        return
+    moved = taken.stat()
+    if (moved.st_ino, moved.st_mtime_ns) != (seen.st_ino, seen.st_mtime_ns):
+        try:
+            os.link(taken, path)
+        except FileExistsError:
+            pass
+    taken.unlink()
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Cross-process lock: exclusive creation of ``path``; stale locks are broken."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + LOCK_TIMEOUT_SECONDS
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            break
+        except FileExistsError:
+            try:
+                seen = path.stat()
+            except FileNotFoundError:
+                continue
+            if time.time() - seen.st_mtime > STALE_LOCK_SECONDS:
+                _break_stale_lock(path, seen)
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for index lock {path}")
+            time.sleep(0.02)
+    try:
+        yield
+    finally:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ContentIndex:
+    def __init__(self, root: Optional[Path] = None, page_size: Optional[int] = None):
+        self.root = root or settings.content_index_dir
+        self.page_size = max(1, page_size or settings.content_index_page_size)
+
+    def _shard_path(self, league: str, season: str) -> Path:
+        return self.root / "shards" / league / f"{season}.json"
+
+    def _pages_dir(self, league: str, season: str) -> Path:
+        return self.root / "pages" / league / season
+
+    def _lookup_path(self, match_id: str) -> Path:
+        return self.root / "lookup" / f"{_bucket(match_id)}.json"
+
+    def upsert(self, entry: Dict[str, Any]) -> None:
+        """Insert or update one article entry (``entry["lang"]`` is merged into ``langs``)."""
+        match_id = str(entry["matchId"])
+        league, season = _segment(entry.get("league")), _segment(entry.get("season"))
+        lang = entry.get("lang", "en")
+
+        with file_lock(self.root / "locks" / f"{league}.{season}.lock"):
+            shard_path = self._shard_path(league, season)
+            shard: Dict[str, Dict[str, Any]] = _read_json(shard_path, {})
+            previous = shard.get(match_id)
+            current = previous
+            langs = sorted(set((current or {}).get("langs", [])) | {lang})
+            if current is None or lang == "en":
+                current = {key: value for key, value in entry.items() if key != "lang"}
+            current["langs"] = langs
+            shard[match_id] = current
+            _write_json(shard_path, shard)
+            self._write_pages(league, season, shard, previous, current)
+            count = len(shard)
+
+            # Written from the shard row while its lock is held, so concurrent
+            # upserts of one match (en + zh) cannot put back an older langs list.
+            # Lock order is always shard, then lookup bucket.
+            with file_lock(self.root / "locks" / f"lookup.{_bucket(match_id)}.lock"):
+                lookup_path = self._lookup_path(match_id)
+                table = _read_json(lookup_path, {})
+                table[match_id] = {"path": current.get("path"), "league": league, "season": season, "langs": langs}
+                _write_json(lookup_path, table)
+
+        with file_lock(self.root / "locks" / "leagues.lock"):
+            leagues_path = self.root / "leagues.json"
+            leagues = [
+                item for item in _read_json(leagues_path, [])
+                if (item.get("league"), item.get("season")) != (league, season)
+            ]
+            leagues.append({"league": league, "season": season, "count": count})
+            leagues.sort(key=lambda item: (item["league"], item["season"]))
+            _write_json(leagues_path, leagues)
+
+    def _write_pages(
+        self,
+        league: str,
+        season: str,
+        shard: Dict[str, Dict[str, Any]],
+        previous: Optional[Dict[str, Any]],
+        current: Dict[str, Any],
+    ) -> None:
+        """Rewrite only the listing pages the upsert can have changed, plus the manifest."""
+        entries = sorted(shard.values(), key=_sort_key, reverse=True)
+        pages_dir = self._pages_dir(league, season)
+        page_count = max(1, -(-len(entries) // self.page_size))
+        manifest = _read_json(pages_dir / "manifest.json", {})
+
+        new_position = sum(1 for item in entries if _sort_key(item) > _sort_key(current))
+        if manifest.get("page_size") != self.page_size:
+            # New listing or new page size: every page boundary may have moved,
+            # so rewrite all pages and drop any beyond the new page count.
+            first, last = 0, page_count - 1
+            for stale in range(page_count + 1, int(manifest.get("pages") or 0) + 1):
+                (pages_dir / f"{stale}.json").unlink(missing_ok=True)
+        elif previous is None:
+            # An insert shifts every later entry down by one.
+            first, last = new_position // self.page_size, page_count - 1
+        else:
+            others = (item for item in entries if item is not current)
+            old_position = sum(1 for item in others if _sort_key(item) > _sort_key(previous))
+            first = min(old_position, new_position) // self.page_size
+            last = max(old_position, new_position) // self.page_size
+        for page in range(first, last + 1):
+            chunk = entries[page * self.page_size : (page + 1) * self.page_size]
+            _write_json(pages_dir / f"{page + 1}.json", {"page": page + 1, "items": chunk})
+        _write_json(
+            pages_dir / "manifest.json",
+            {"total": len(entries), "page_size": self.page_size, "pages": page_count, "updated_at": time.time()},
+        )
+
+    def lookup(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """{path, league, season, langs} for ``match_id``; one small file read."""
+        return _read_json(self._lookup_path(str(match_id)), {}).get(str(match_id))
+
+    def page(self, league: str, season: str, page: int = 1) -> Dict[str, Any]:
+        path = self._pages_dir(_segment(league), _segment(season)) / f"{page}.json"
+        return _read_json(path, {"page": page, "items": []})
+
+
+def index_entry(article: Dict[str, Any], path: str, lang: str) -> Dict[str, Any]:
+    frontmatter = article["frontmatter"]
+    return {
+        "matchId": str(frontmatter["matchId"]),
+        "title": frontmatter["title"],
+        "description": frontmatter["description"],
+        "date": frontmatter["date"],
+        "slug": frontmatter.get("slug"),
+        "teams": frontmatter["teams"],
+        "league": frontmatter["league"],
+        "season": str((article.get("match") or {}).get("season") or "unknown"),
+        "path": path,
+        "lang": lang,
+    }
+
+
+def rebuild(content_dir: Path, index: ContentIndex) -> int:
+    """Index every content/matches/<id>/index.<lang>.json, English first."""
+    count = 0
+    matches_dir = content_dir / "matches"
+    files = sorted(matches_dir.glob("*/index.*.json"), key=lambda p: (p.parent.name, p.name != "index.en.json"))
+    for article_path in files:
+        lang = article_path.name.split(".")[1]
+        article = _read_json(article_path, None)
+        if not article or "frontmatter" not in article:
+            continue
+        en_path = article_path.parent / "index.en.json"
+        relative = (en_path if en_path.exists() else article_path).relative_to(content_dir).as_posix()
+        index.upsert(index_entry(article, relative, lang))
+        count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the sharded content index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="Index every article under the web content directory")
+    lookup_parser = sub.add_parser("lookup", help="Print the index entry for a match")
+    lookup_parser.add_argument("match_id")
+    args = parser.parse_args()
+
+    index = ContentIndex()
+    if args.command == "rebuild":
+        print(f"Indexed {rebuild(settings.web_content_dir, index)} article files.", file=sys.stderr)
+    else:
+        print(json.dumps(index.lookup(args.match_id)))
+
+
+if __name__ == "__main__":
+    main()
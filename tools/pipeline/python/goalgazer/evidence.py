@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+# Indexed evidence catalog. Built once per match by compose_article.derive_metrics
+# and passed through the LLM and compose stages. It behaves as a read-only
+# mapping of "path" -> typed value (int, float, bool or str, never stringified)
+# and adds the indexes those stages need:
+#   rows        "team_stats.normalized.50" -> {"possession": 58, ...}
+#   namespaces  "team_stats" -> ["team_stats.normalized.50", ...]
+#   players     lower-cased player name -> (side, index, player row)
+# so checking a citation or finding a player is a dictionary lookup.
+
+PlayerRef = Tuple[str, int, Dict[str, Any]]
+
+
+def citation_path(item: str) -> str:
+    """The catalog path of a citation such as "match.score.home=2"."""
+    return item.partition("=")[0].strip()
+
+
+def _name_key(name: str) -> str:
+    return name.strip().lower()
+
+
+class EvidenceCatalog(Mapping[str, Any]):
+    def __init__(
+        self,
+        values: Dict[str, Any],
+        players_output: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    ):
+        self._values = values
+        self.players_output = players_output
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.namespaces: Dict[str, List[str]] = {}
+        for path, value in values.items():
+            # Null values carry no citable fact and are left out of the rows.
+            if value is None:
+                continue
+            row, _, field = path.rpartition(".")
+            if row not in self.rows:
+                self.rows[row] = {}
+                self.namespaces.setdefault(row.split(".", 1)[0], []).append(row)
+            self.rows[row][field] = value
+        self._players: Dict[str, PlayerRef] = {}
+        for side, players in (players_output or {}).items():
+            for idx, player in enumerate(players):
+                self._players.setdefault(_name_key(player.get("name") or ""), (side, idx, player))
+        self._citations: Optional[List[str]] = None
+
+    def __getitem__(self, path: str) -> Any:
+        return self._values[path]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._values
+
+    def cites(self, item: str) -> bool:
+        """True when the citation's path is in the catalog."""
+        return citation_path(item) in self._values
+
+    def citation(self, path: str) -> Optional[str]:
+        """"path=value" for a non-null catalog value, else None."""
+        value = self._values.get(path)
+        return None if value is None else f"{path}={value}"
+
+    def citations(self) -> List[str]:
+        if self._citations is None:
+            self._citations = [f"{path}={value}" for path, value in self._values.items()]
+        return self._citations
+
+    def find_player(self, name: str) -> Optional[PlayerRef]:
+        return self._players.get(_name_key(name))
+
+    def in_namespace(self, namespace: str) -> bool:
+        return bool(self.namespaces.get(namespace))
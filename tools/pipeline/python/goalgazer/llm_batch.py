@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+from . import llm_metrics
+from .config import settings
+from .evidence import EvidenceCatalog
+from .llm_generate import generate_llm_output
+from .schemas import LLMOutput, MatchData
+
+# Queued LLM generation across many matches. Jobs are pulled lazily from the
+# caller's iterable, so the next match is prepared while earlier ones are
+# waiting on the model; at most ``concurrency`` matches are in generation at
+# once. Results are yielded in completion order so the caller can compose and
+# publish each article as soon as its narrative lands. Request-level limits
+# (in-flight cap, provider rate limits) are enforced by llm_limits.
+
+
+@dataclass
+class LLMJob:
+    key: str
+    match: MatchData
+    metrics: EvidenceCatalog
+    figure_summaries: Dict[str, Any]
+    availability: Dict[str, bool]
+    context: Any = None  # carried through to the result untouched
+
+
+@dataclass
+class LLMResult:
+    job: LLMJob
+    output: Optional[LLMOutput]
+    usage: Dict[str, Any] = field(default_factory=dict)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def _generate(job: LLMJob) -> LLMResult:
+    started = time.perf_counter()
+    with llm_metrics.track(job.key) as ledger:
+        try:
+            output = generate_llm_output(job.match, job.metrics, job.figure_summaries, job.availability)
+            error = None
+        except Exception as e:
+            output, error = None, f"{type(e).__name__}: {e}"
+    return LLMResult(job, output, ledger.summary(), time.perf_counter() - started, error)
+
+
+def run_llm_batch(jobs: Iterable[LLMJob], concurrency: Optional[int] = None) -> Iterator[LLMResult]:
+    """Generate narratives for ``jobs`` concurrently, yielding each result as it completes."""
+    concurrency = max(1, concurrency or settings.llm_batch_concurrency)
+    source = iter(jobs)
+    pending: Set[Future] = set()
+    exhausted = False
+    started = time.perf_counter()
+    done_count = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llm-batch") as executor:
+        while pending or not exhausted:
+            timeout = None
+            if not exhausted and len(pending) < concurrency:
+                job = next(source, None)
+                if job is None:
+                    exhausted = True
+                else:
+                    pending.add(executor.submit(_generate, job))
+                    # Hand back anything already finished before preparing the next job.
+                    timeout = 0
+            if not pending:
+                continue
+            finished, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                done_count += 1
+                status = result.error or f"{result.usage.get('calls', 0)} call(s)"
+                print(
+                    f"Batch: {result.job.key} done in {result.seconds:.1f}s ({status}); "
+                    f"{done_count} finished, {len(pending)} in flight, {time.perf_counter() - started:.1f}s elapsed.",
+                    file=sys.stderr,
+                )
+                yield result
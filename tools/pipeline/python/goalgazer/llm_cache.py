@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .config import settings
+
+# Persistent LLM response cache. Entries are keyed by a fingerprint of the
+# provider, model and exact messages, so any prompt change is a miss. Callers
+# only store responses that already passed validation.
+
+
+def fingerprint(provider: str, model: str, messages: List[Dict[str, str]]) -> str:
+    key = json.dumps(
+        {"provider": provider, "model": model, "messages": messages},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return settings.llm_cache_dir / key[:2] / f"{key}.json"
+
+
+def lookup(provider: str, model: str, messages: List[Dict[str, str]]) -> Optional[str]:
+    """Return the cached response text, or None on a miss, expiry or refresh run."""
+    if not settings.llm_cache_enabled or settings.llm_cache_refresh:
+        return None
+    path = _entry_path(fingerprint(provider, model, messages))
+    try:
+        entry: Dict[str, Any] = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    ttl_seconds = settings.llm_cache_ttl_hours * 3600
+    if ttl_seconds > 0 and time.time() - entry.get("created_at", 0) > ttl_seconds:
+        return None
+    return entry.get("response")
+
+
+def store(provider: str, model: str, messages: List[Dict[str, str]], response: str) -> None:
+    if not settings.llm_cache_enabled:
+        return
+    key = fingerprint(provider, model, messages)
+    path = _entry_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {"created_at": time.time(), "provider": provider, "model": model, "response": response}
+    # Write-then-rename so concurrent runs never read a half-written entry.
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(entry, ensure_ascii=False))
+    os.replace(tmp_path, path)
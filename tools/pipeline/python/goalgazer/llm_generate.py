@@ -1,13 +1,22 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List
-import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
 import requests
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 
+from . import llm_cache, llm_limits, llm_metrics
+from .llm_hedge import run_hedged
+from .llm_repair import build_repair_messages, find_defects, merge_repairs
+from .narrative_rules import build_rule_output
 from .config import settings
+from .evidence import EvidenceCatalog
+from .prompt_compact import compact_payload, fit_to_budget
 from .schemas import MatchData, LLMOutput
+from .stream_guard import StreamAborted, StreamMonitor
+from .validation import check, find_forbidden, forbidden_matcher, narrative_texts
 
 
 LLM_SCHEMA: Dict[str, Any] = {
@@ -115,6 +124,52 @@ def _detect_limitations(availability: Dict[str, bool]) -> List[str]:
     return []
 
 
+SYSTEM_PROMPT = (
+    "You are a professional football tactical analyst and data editor. "
+    "Strictly follow these requirements:\n"
+    "1. Only use the supplied JSON data and derived metrics. Do not fabricate facts.\n"
+    "2. Output MUST be strict JSON with no extra text.\n"
+    "3. Provide at least 3 sections: 'Match Overview', 'Key Moments', and 'Tactical Notes'.\n"
+    "4. Each section must have at least 2 paragraphs, and each paragraph must be at least 5 sentences long.\n"
+    "5. Every claim MUST include evidence from the 'evidence' table. Rows map a path prefix to fields; "
+    "cite as '<row>.<field>=<value>' (e.g., row 'team_stats.normalized.123' field 'total_shots' -> "
+    "'team_stats.normalized.123.total_shots=15'). Do not cite anything outside the table.\n"
+    "6. Player notes MUST use player-specific evidence ONLY when availability.has_players=true.\n"
+    "7. Include a 'thesis' which is a 2-3 sentence core takeaway of the match.\n"
+    "8. Generate a 'multiverse' section: Identify 2-3 key 'Pivot Points' (e.g., missed goals, red cards, key substitutions). "
+    "For each pivot, provide the 'reality' and a high-probability 'symmetry' (an alternative outcome) with its hypothetical tactical ripple effect.\n"
+    "9. If availability.has_xg is false, do NOT mention xG or Expected Goals.\n"
+    "10. If availability.has_players is false, do NOT mention ratings or duels.\n"
+    "\n"
+    "JSON Structure:\n"
+    "{\n"
+    "  \"language\": \"en\",\n"
+    "  \"title\": \"...\",\n"
+    "  \"meta_description\": \"...\",\n"
+    "  \"tags\": [\"...\"],\n"
+    "  \"thesis\": \"...\",\n"
+    "  \"sections\": [\n"
+    "    { \"heading\": \"...\", \"bullets\": [\"...\"], \"paragraphs\": [\"...\"], \"claims\": [{ \"claim\": \"...\", \"evidence\": [\"...\"], \"confidence\": 0.9 }] }\n"
+    "  ],\n"
+    "  \"player_notes\": [\n"
+    "    { \"player\": \"...\", \"team\": \"...\", \"summary\": \"...\", \"evidence\": [\"...\"] }\n"
+    "  ],\n"
+    "  \"data_limitations\": [\"...\"],\n"
+    "  \"cta\": \"...\",\n"
+    "  \"multiverse\": {\n"
+    "    \"summary\": \"...\",\n"
+    "    \"pivots\": [\n"
+    "      {\n"
+    "        \"minute\": 35, \"type\": \"penalty\", \"description\": \"...\",\n"
+    "        \"reality\": { \"event\": \"...\", \"outcome\": \"...\", \"tactical_impact\": \"...\" },\n"
+    "        \"symmetry\": { \"event\": \"...\", \"outcome\": \"...\", \"tactical_impact\": \"...\", \"probability\": 0.65 }\n"
+    "      }\n"
+    "    ]\n"
+    "  }\n"
+    "}"
+)
+
+
 def build_prompt(
     match: MatchData,
     metrics: Dict[str, Any],
@@ -122,103 +177,160 @@ def build_prompt(
     availability: Dict[str, bool],
     allowed_evidence: List[str],
 ) -> List[Dict[str, str]]:
-    system_prompt = (
-        "You are a professional football tactical analyst and data editor. "
-        "Strictly follow these requirements:\n"
-        "1. Only use the supplied JSON data and derived metrics. Do not fabricate facts.\n"
-        "2. Output MUST be strict JSON with no extra text.\n"
-        "3. Provide at least 3 sections: 'Match Overview', 'Key Moments', and 'Tactical Notes'.\n"
-        "4. Each section must have at least 2 paragraphs, and each paragraph must be at least 5 sentences long.\n"
-        "5. Every claim MUST include evidence referencing fields from the payload and allowed evidence list (e.g., 'team_stats.normalized.123.total_shots=15').\n"
-        "6. Player notes MUST use player-specific evidence ONLY when availability.has_players=true.\n"
-        "7. Include a 'thesis' which is a 2-3 sentence core takeaway of the match.\n"
-        "8. Generate a 'multiverse' section: Identify 2-3 key 'Pivot Points' (e.g., missed goals, red cards, key substitutions). "
-        "For each pivot, provide the 'reality' and a high-probability 'symmetry' (an alternative outcome) with its hypothetical tactical ripple effect.\n"
-        f"8. availability.has_xg={availability.get('has_xg')}; if false, do NOT mention xG or Expected Goals.\n"
-        f"9. availability.has_players={availability.get('has_players')}; if false, do NOT mention ratings or duels.\n"
-        "\n"
-        "JSON Structure:\n"
-        "{\n"
-        "  \"language\": \"en\",\n"
-        "  \"title\": \"...\",\n"
-        "  \"meta_description\": \"...\",\n"
-        "  \"tags\": [\"...\"],\n"
-        "  \"thesis\": \"...\",\n"
-        "  \"sections\": [\n"
-        "    { \"heading\": \"...\", \"bullets\": [\"...\"], \"paragraphs\": [\"...\"], \"claims\": [{ \"claim\": \"...\", \"evidence\": [\"...\"], \"confidence\": 0.9 }] }\n"
-        "  ],\n"
-        "  \"player_notes\": [\n"
-        "    { \"player\": \"...\", \"team\": \"...\", \"summary\": \"...\", \"evidence\": [\"...\"] }\n"
-        "  ],\n"
-        "  \"data_limitations\": [\"...\"],\n"
-        "  \"cta\": \"...\",\n"
-        "  \"multiverse\": {\n"
-        "    \"summary\": \"...\",\n"
-        "    \"pivots\": [\n"
-        "      {\n"
-        "        \"minute\": 35, \"type\": \"penalty\", \"description\": \"...\",\n"
-        "        \"reality\": { \"event\": \"...\", \"outcome\": \"...\", \"tactical_impact\": \"...\" },\n"
-        "        \"symmetry\": { \"event\": \"...\", \"outcome\": \"...\", \"tactical_impact\": \"...\", \"probability\": 0.65 }\n"
-        "      }\n"
-        "    ]\n"
-        "  }\n"
-        "}"
-    )
-
+    # allowed_evidence is the same catalog as metrics; it is sent once, as the evidence table.
     is_sparse_data = not availability.get("has_shot_locations") or not availability.get("has_xg")
     
     inference_instruction = ""
     if is_sparse_data:
         inference_instruction = (
             "\n💡 TACTICAL INFERENCE MODE: Critical data (shot locations or xG) is missing. "
-            "Please use the 'timeline' events and 'aggregates' to infer the tactical narrative. "
+            "Please use the 'timeline.*' evidence rows and 'aggregates' to infer the tactical narrative. "
             "Focus on momentum shifts, substitution impacts, and how teams adapted their playstyle "
             "based on the sequence of events. Provide a richer description of key sequences to "
             "compensate for the lack of spatial charts."
         )
 
-    user_payload = {
-        "match_context": match.match.model_dump(),
-        "data_payload": {
-            "teams": [team.model_dump() for team in match.teams],
-            "players": [player.model_dump() for player in match.players],
-            "timeline": [t.model_dump() for t in match.timeline],
-            "aggregates": match.aggregates.model_dump(),
-            "derived_metrics": metrics,
+    user_payload = compact_payload(
+        match,
+        metrics,
+        figure_summaries,
+        availability,
+        {
+            "automatically_detected_limitations": _detect_limitations(availability),
+            "inference_instruction": inference_instruction,
         },
-        "figure_summaries": figure_summaries,
-        "automatically_detected_limitations": _detect_limitations(availability),
-        "inference_instruction": inference_instruction,
-        "availability": availability,
-        "allowed_evidence": allowed_evidence,
-    }
+    )
+    user_payload, dropped = fit_to_budget(user_payload, settings.llm_prompt_token_budget)
+    if dropped:
+        import sys
+        print(f"Prompt over {settings.llm_prompt_token_budget} token budget; dropped {dropped} low-priority items.", file=sys.stderr)
 
+    # The system prompt is static so providers can reuse its cached prefix.
     return [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": json.dumps(user_payload)},
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps(user_payload, separators=(",", ":"), ensure_ascii=False)},
     ]
 
 
-def call_llm(messages: List[Dict[str, str]], use_openai: bool = False) -> str:
+def _read_stream(response: requests.Response, monitor: Optional[StreamMonitor]) -> tuple[str, Optional[Dict[str, Any]]]:
+    """Collect an SSE chat-completions stream, feeding each delta to ``monitor``."""
+    if "text/event-stream" not in response.headers.get("Content-Type", ""):
+        # Provider ignored stream=true; validate the whole body at once.
+        body = response.json()
+        content = body["choices"][0]["message"]["content"]
+        if monitor is not None:
+            monitor.feed(content)
+        return content, body.get("usage")
+    parts: List[str] = []
+    usage = None
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        chunk = json.loads(data)
+        usage = chunk.get("usage") or usage
+        choices = chunk.get("choices") or []
+        delta = (choices[0].get("delta") or {}).get("content") if choices else None
+        if delta:
+            parts.append(delta)
+            if monitor is not None:
+                monitor.feed(delta)
+    return "".join(parts), usage
+
+
+def _endpoint(url: str) -> str:
+    if settings.llm_stub_url:
+        return settings.llm_stub_url
+    if settings.llm_stub:
+        from .llm_stub import ensure_background_server
+        return ensure_background_server()
+    return url
+
+
+def _post_chat(
+    url: str,
+    headers: Dict[str, str],
+    body: Dict[str, Any],
+    monitor: Optional[StreamMonitor],
+) -> tuple[str, Optional[Dict[str, Any]]]:
+    """Return the completion text and the provider's token usage, if reported."""
+    url = _endpoint(url)
+    if not settings.llm_stream:
+        response = requests.post(url, headers=headers, json=body, timeout=120)
+        response.raise_for_status()
+        payload = response.json()
+        return payload["choices"][0]["message"]["content"], payload.get("usage")
+
+    started = time.perf_counter()
+    # Leaving the with-block closes the connection, which cancels generation on abort.
+    with requests.post(url, headers=headers, json={**body, "stream": True}, timeout=120, stream=True) as response:
+        response.raise_for_status()
+        try:
+            return _read_stream(response, monitor)
+        except StreamAborted as e:
+            import sys
+            print(f"Stream aborted after {time.perf_counter() - started:.1f}s: {e}", file=sys.stderr)
+            raise
+
+
+def _metered_post(
+    provider: str,
+    model: str,
+    purpose: str,
+    messages: List[Dict[str, str]],
+    url: str,
+    headers: Dict[str, str],
+    body: Dict[str, Any],
+    monitor: Optional[StreamMonitor],
+) -> str:
+    with llm_limits.slot(provider):
+        started = time.perf_counter()
+        try:
+            content, usage = _post_chat(url, headers, body, monitor)
+        except Exception as e:
+            llm_metrics.record_call(
+                provider, model, purpose, messages, None, None, time.perf_counter() - started,
+                settings.llm_stream, error=f"{type(e).__name__}: {e}",
+            )
+            raise
+    llm_metrics.record_call(provider, model, purpose, messages, content, usage, time.perf_counter() - started, settings.llm_stream)
+    return content
+
+
+def call_llm(
+    messages: List[Dict[str, str]],
+    use_openai: bool = False,
+    monitor: Optional[StreamMonitor] = None,
+    purpose: str = "article",
+) -> str:
+    """Send ``messages`` and return the completion text.
+
+    Each request is recorded in llm_metrics under ``purpose``; callers report
+    the validation outcome with ``llm_metrics.set_outcome``.
+    """
     if use_openai and settings.openai_api_key:
         import sys
         print("Using OpenAI for Deep Analysis...", file=sys.stderr)
-        response = requests.post(
+        return _metered_post(
+            "openai",
+            settings.openai_model,
+            purpose,
+            messages,
             "https://api.openai.com/v1/chat/completions",
-            headers={
+            {
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {settings.openai_api_key}",
             },
-            json={
+            {
                 "model": settings.openai_model,
                 "messages": messages,
                 "temperature": 0.2,
                 "response_format": {"type": "json_object"},
             },
-            timeout=120,
+            monitor,
         )
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"]
 
     api_key = settings.pollinations_api_key
     headers = {"Content-Type": "application/json"}
@@ -227,26 +339,28 @@ def call_llm(messages: List[Dict[str, str]], use_openai: bool = False) -> str:
 
     import sys
     print(f"Calling Pollinations AI [{settings.pollinations_model}]...", file=sys.stderr)
-    response = requests.post(
+    return _metered_post(
+        "pollinations",
+        settings.pollinations_model,
+        purpose,
+        messages,
         settings.pollinations_endpoint,
-        headers=headers,
-        json={
+        headers,
+        {
             "model": settings.pollinations_model,
             "messages": messages,
             "temperature": 0.2,
             "response_format": {"type": "json_object"},
         },
-        timeout=120,
+        monitor,
     )
-    response.raise_for_status()
-    return response.json()["choices"][0]["message"]["content"]
 
 
 def validate_json(text: str) -> Dict[str, Any]:
     payload = json.loads(text)
     if "language" not in payload:
         payload["language"] = "en"
-    validate(instance=payload, schema=LLM_SCHEMA)
+    check(payload, LLM_SCHEMA)
     return payload
 
 
@@ -272,100 +386,226 @@ def fallback_output(
     availability: Dict[str, bool],
     allowed_evidence: List[str],
 ) -> LLMOutput:
-    title = f"{match.match.league} Tactical Review: {match.match.homeTeam['name']} vs {match.match.awayTeam['name']}"
-    evidence = [item for item in allowed_evidence if item.startswith("team_stats.normalized")][:2]
-    return LLMOutput(
-        title=title,
-        meta_description="Match analysis based on available team data and visualizations.",
-        tags=["tactical-analysis", "match-review"],
-        thesis=f"A tactical overview of the clash between {match.match.homeTeam['name']} and {match.match.awayTeam['name']}.",
-        sections=[
-            {
-                "heading": "Match Summary",
-                "bullets": [],
-                "paragraphs": [
-                    f"This report provides a data-driven look at the match between {match.match.homeTeam['name']} and {match.match.awayTeam['name']}.",
-                    "The following sections detail the key metrics and statistical performance of both teams."
-                ],
-                "claims": [
-                    {
-                        "claim": "Match statistics and figures successfully processed.",
-                        "evidence": evidence or [],
-                        "confidence": 0.9,
-                    }
-                ],
-            }
-        ],
-        player_notes=[],
-        data_limitations=[],
-        cta="Thank you for reading this tactical review.",
-    )
+    # The rule-based narrative is complete and traceable, unlike a stub section.
+    return build_rule_output(match, metrics, availability)
 
 
-def _validate_llm_payload(payload: Dict[str, Any], availability: Dict[str, bool], allowed_tokens: set[str]) -> bool:
-    forbidden_terms = []
-    if not availability.get("has_xg"):
-        forbidden_terms.extend([r"\bxg\b", r"expected goals"])
-    if not availability.get("has_players"):
-        forbidden_terms.extend([r"\brating\b", r"\bduel"])
+def _stream_monitor(availability: Dict[str, bool], cancel: Optional[threading.Event] = None) -> StreamMonitor:
+    return StreamMonitor(LLM_SCHEMA, forbidden_matcher(availability), cancel)
 
-    text_fields = []
-    for section in payload.get("sections", []):
-        text_fields.extend(section.get("paragraphs", []))
-        text_fields.extend(section.get("bullets", []))
-        for claim in section.get("claims", []):
-            text_fields.append(claim.get("claim", ""))
-    for note in payload.get("player_notes", []):
-        text_fields.append(note.get("summary", ""))
 
-    for term in forbidden_terms:
-        pattern = re.compile(term, re.IGNORECASE)
-        if any(pattern.search(text or "") for text in text_fields):
-            return False
+def _validate_llm_payload(payload: Dict[str, Any], availability: Dict[str, bool], allowed_tokens: set[str]) -> bool:
+    if find_forbidden(narrative_texts(payload), availability):
+        return False
 
     return evidence_traceable(payload, allowed_tokens)
 
 
+def _provider_model(use_openai: bool) -> tuple[str, str]:
+    if use_openai:
+        return "openai", settings.openai_model
+    return "pollinations", settings.pollinations_model
+
+
+def _cached_output(
+    messages: List[Dict[str, str]],
+    providers: List[bool],
+    availability: Dict[str, bool],
+    allowed_tokens: set[str],
+) -> Optional[LLMOutput]:
+    # Cached entries are re-validated so schema or rule changes invalidate them.
+    for use_openai in providers:
+        provider, model = _provider_model(use_openai)
+        response = llm_cache.lookup(provider, model, messages)
+        if response is None:
+            continue
+        try:
+            payload = validate_json(response)
+        except (ValidationError, json.JSONDecodeError):
+            continue
+        if _validate_llm_payload(payload, availability, allowed_tokens):
+            import sys
+            print(f"LLM cache hit [{provider}/{model}]; skipping generation.", file=sys.stderr)
+            llm_metrics.record_cache_hit()
+            return LLMOutput.model_validate(payload)
+    return None
+
+
+def _store_response(use_openai: bool, messages: List[Dict[str, str]], response: str) -> None:
+    provider, model = _provider_model(use_openai)
+    try:
+        llm_cache.store(provider, model, messages, response)
+    except OSError as e:
+        import sys
+        print(f"LLM cache write failed: {e}", file=sys.stderr)
+
+
+def _hedged_output(
+    messages: List[Dict[str, str]],
+    providers: List[bool],
+    availability: Dict[str, bool],
+    allowed_tokens: set[str],
+) -> Optional[LLMOutput]:
+    def attempt(use_openai: bool):
+        def run(cancel: threading.Event) -> tuple[str, LLMOutput]:
+            response = call_llm(messages, use_openai=use_openai, monitor=_stream_monitor(availability, cancel))
+            try:
+                payload = validate_json(response)
+                if not _validate_llm_payload(payload, availability, allowed_tokens):
+                    raise ValueError("LLM payload failed validation")
+            except (ValidationError, ValueError) as e:
+                llm_metrics.set_outcome("invalid", f"{type(e).__name__}: {e}")
+                raise
+            llm_metrics.set_outcome("ok")
+            return response, LLMOutput.model_validate(payload)
+        return run
+
+    result = run_hedged(
+        [(_provider_model(use_openai)[0], attempt(use_openai)) for use_openai in providers],
+        settings.llm_hedge_delay_seconds,
+    )
+    if result is None:
+        return None
+    provider, (response, output) = result
+    _store_response(provider == "openai", messages, response)
+    return output
+
+
+def _repair_response(
+    response: str,
+    use_openai: bool,
+    messages: List[Dict[str, str]],
+    metrics: Dict[str, Any],
+    availability: Dict[str, bool],
+    allowed_tokens: set[str],
+) -> Optional[LLMOutput]:
+    """Send only the failing fragments back for correction and merge the fixes."""
+    import sys
+    if not settings.llm_repair:
+        return None
+    try:
+        payload = json.loads(response)
+    except json.JSONDecodeError:
+        return None
+    if isinstance(payload, dict):
+        payload.setdefault("language", "en")
+    defects = find_defects(payload, LLM_SCHEMA, availability, allowed_tokens)
+    if not defects:
+        return None
+    paths = sorted({defect.path for defect in defects})
+    if len(paths) > settings.llm_repair_max_fragments:
+        print(f"{len(paths)} fragments need repair; regenerating instead.", file=sys.stderr)
+        return None
+
+    print(f"Repairing {', '.join(paths)}...", file=sys.stderr)
+    try:
+        repair_response = call_llm(
+            build_repair_messages(payload, defects, metrics, availability), use_openai=use_openai, purpose="repair"
+        )
+        merged = merge_repairs(payload, defects, repair_response)
+        check(merged, LLM_SCHEMA)
+    except (ValidationError, ValueError, requests.RequestException) as e:
+        print(f"Repair failed: {type(e).__name__}: {str(e)[:100]}", file=sys.stderr)
+        llm_metrics.set_outcome("invalid", f"{type(e).__name__}: {e}")
+        return None
+    if not _validate_llm_payload(merged, availability, allowed_tokens):
+        print("Repaired payload still failed validation.", file=sys.stderr)
+        llm_metrics.set_outcome("invalid", "repaired payload failed validation")
+        return None
+    llm_metrics.set_outcome("ok")
+    output = LLMOutput.model_validate(merged)
+    _store_response(use_openai, messages, json.dumps(merged, ensure_ascii=False))
+    return output
+
+
 def generate_llm_output(
     match: MatchData,
-    metrics: Dict[str, Any],
+    metrics: EvidenceCatalog,
     figure_summaries: Dict[str, Any],
     availability: Dict[str, bool],
 ) -> LLMOutput:
-    allowed_evidence = [f"{key}={value}" for key, value in metrics.items()]
-    allowed_tokens = set(metrics.keys())
+    allowed_evidence = metrics.citations()
+    allowed_tokens = set(metrics)
     messages = build_prompt(match, metrics, figure_summaries, availability, allowed_evidence)
 
     # Use OpenAI directly for sparse data (Deep Analysis mode)
     is_sparse_data = not availability.get("has_shot_locations") or not availability.get("has_xg")
+    providers = [False]
+    if settings.openai_api_key:
+        providers = [True, False] if is_sparse_data else [False, True]
+    cached = _cached_output(messages, providers, availability, allowed_tokens)
+    if cached is not None:
+        return cached
+
+    if settings.llm_section_parallel:
+        from .llm_sections import generate_sections_parallel
+        result = generate_sections_parallel(messages[1], providers[0], availability, allowed_tokens)
+        if result is not None:
+            article, output = result
+            _store_response(providers[0], messages, json.dumps(article, ensure_ascii=False))
+            return output
+        import sys
+        print("Falling back to single-call generation...", file=sys.stderr)
+
+    if settings.llm_hedge and len(providers) > 1:
+        hedged = _hedged_output(messages, providers, availability, allowed_tokens)
+        if hedged is not None:
+            return hedged
+        import sys
+        print("All hedged requests failed; retrying sequentially...", file=sys.stderr)
+
     if is_sparse_data and settings.openai_api_key:
         try:
-            response = call_llm(messages, use_openai=True)
+            response = call_llm(messages, use_openai=True, monitor=_stream_monitor(availability))
             payload = validate_json(response)
             if _validate_llm_payload(payload, availability, allowed_tokens):
-                return LLMOutput.model_validate(payload)
+                output = LLMOutput.model_validate(payload)
+                llm_metrics.set_outcome("ok")
+                _store_response(True, messages, response)
+                return output
+            llm_metrics.set_outcome("invalid", "LLM payload failed validation")
         except Exception as e:
+            llm_metrics.set_outcome("invalid", f"{type(e).__name__}: {e}")
             import sys
             print(f"Deep Analysis (OpenAI) failed: {e}. Falling back to default...", file=sys.stderr)
 
     for attempt in range(3):
+        response = None
         try:
-            response = call_llm(messages, use_openai=False)
+            response = call_llm(messages, use_openai=False, monitor=_stream_monitor(availability))
             payload = validate_json(response)
             if not _validate_llm_payload(payload, availability, allowed_tokens):
                 import sys
                 print(f"Attempt {attempt + 1}: LLM payload failed validation.", file=sys.stderr)
+                llm_metrics.set_outcome("invalid", "LLM payload failed validation")
+                repaired = _repair_response(response, False, messages, metrics, availability, allowed_tokens)
+                if repaired is not None:
+                    return repaired
                 continue
-            return LLMOutput.model_validate(payload)
-        except (ValidationError, json.JSONDecodeError, requests.RequestException) as e:
+            output = LLMOutput.model_validate(payload)
+            llm_metrics.set_outcome("ok")
+            _store_response(False, messages, response)
+            return output
+        except (ValidationError, json.JSONDecodeError, requests.RequestException, StreamAborted) as e:
             import sys
             print(f"Attempt {attempt + 1} failed: {type(e).__name__}: {str(e)[:100]}", file=sys.stderr)
+            llm_metrics.set_outcome("invalid", f"{type(e).__name__}: {e}")
+            if isinstance(e, ValidationError) and response is not None:
+                repaired = _repair_response(response, False, messages, metrics, availability, allowed_tokens)
+                if repaired is not None:
+                    return repaired
             if settings.openai_api_key and attempt == 2: # Last resort
                 print("Final attempt using OpenAI fallback...", file=sys.stderr)
                 try:
-                    response = call_llm(messages, use_openai=True)
+                    response = call_llm(messages, use_openai=True, monitor=_stream_monitor(availability))
                     payload = validate_json(response)
-                    return LLMOutput.model_validate(payload)
+                    output = LLMOutput.model_validate(payload)
+                    if _validate_llm_payload(payload, availability, allowed_tokens):
+                        llm_metrics.set_outcome("ok")
+                        _store_response(True, messages, response)
+                    else:
+                        llm_metrics.set_outcome("invalid", "LLM payload failed validation")
+                    return output
                 except: pass
             continue
 
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import contextvars
+import queue
+import sys
+import threading
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+# Hedged LLM requests: the primary provider starts at once, the next one after
+# ``delay`` seconds (or as soon as an earlier one fails). The first attempt to
+# return without raising wins; the rest are cancelled through their event.
+# Every attempt is an ordinary call_llm request, so its latency lands in the
+# llm_metrics log; tune the delay from the per-provider p90 reported by
+# python -m goalgazer.llm_metrics --group-by provider.
+
+T = TypeVar("T")
+Attempt = Tuple[str, Callable[[threading.Event], T]]
+
+
+def _run(
+    provider: str,
+    attempt: Callable[[threading.Event], T],
+    cancel: threading.Event,
+    results: "queue.Queue[Tuple[str, bool, Any]]",
+) -> None:
+    try:
+        result = attempt(cancel)
+    except Exception as exc:
+        results.put((provider, False, exc))
+        return
+    results.put((provider, True, result))
+
+
+def run_hedged(attempts: List[Attempt], delay: float) -> Optional[Tuple[str, T]]:
+    """Race ``attempts`` with staggered starts; return (provider, result) of the first success."""
+    cancel = threading.Event()
+    results: "queue.Queue[Tuple[str, bool, Any]]" = queue.Queue()
+    pending = list(attempts)
+    running = 0
+
+    def launch() -> None:
+        nonlocal running
+        provider, attempt = pending.pop(0)
+        print(f"Hedge: starting {provider}.", file=sys.stderr)
+        # Daemon threads: a losing blocking request must not hold the process open.
+        # Each runs in a copy of this context so its calls reach the match's metrics ledger.
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(_run, provider, attempt, cancel, results),
+            name=f"llm-hedge-{provider}",
+            daemon=True,
+        ).start()
+        running += 1
+
+    try:
+        while pending or running:
+            if pending and running == 0:
+                launch()
+            try:
+                provider, ok, value = results.get(timeout=max(delay, 0) if pending else None)
+            except queue.Empty:
+                launch()
+                continue
+            running -= 1
+            if ok:
+                print(f"Hedge: {provider} won; cancelling {running} other request(s).", file=sys.stderr)
+                return provider, value
+            print(f"Hedge: {provider} failed: {type(value).__name__}: {str(value)[:100]}", file=sys.stderr)
+            # A failure starts the next provider without waiting out the delay.
+            if pending:
+                launch()
+        return None
+    finally:
+        # Streaming attempts notice the event and close their connection;
+        # blocking ones finish in the background and are discarded.
+        cancel.set()
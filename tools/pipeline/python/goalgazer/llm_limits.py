@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from .config import settings
+
+# Process-wide limits on outgoing LLM requests: a cap on concurrent requests
+# across all providers and a per-provider requests-per-minute budget. Every
+# call_llm request passes through ``slot``, so batch runs, section-parallel
+# generation and hedging all share the same budget.
+
+
+class RateLimiter:
+    """Token bucket refilled at ``per_minute`` requests per minute, bursting to ``per_minute``."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute
+        self.capacity = max(1.0, per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request may start; return the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) / self.interval)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) * self.interval
+            time.sleep(delay)
+            waited += delay
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """Parse "pollinations=30,openai=120" into {provider: requests per minute}."""
+    limits: Dict[str, float] = {}
+    for item in spec.split(","):
+        provider, _, value = item.partition("=")
+        if provider.strip() and value.strip():
+            limits[provider.strip()] = float(value)
+    return limits
+
+
+_lock = threading.Lock()
+_limiters: Dict[str, Optional[RateLimiter]] = {}
+_in_flight: Optional[threading.BoundedSemaphore] = None
+_in_flight_size = 0
+
+
+def _limiter(provider: str) -> Optional[RateLimiter]:
+    with _lock:
+        if provider not in _limiters:
+            rpm = parse_rate_limits(settings.llm_rate_limits).get(provider, 0)
+            _limiters[provider] = RateLimiter(rpm) if rpm > 0 else None
+        return _limiters[provider]
+
+
+def _semaphore() -> Optional[threading.BoundedSemaphore]:
+    global _in_flight, _in_flight_size
+    with _lock:
+        if settings.llm_max_in_flight != _in_flight_size:
+            _in_flight_size = settings.llm_max_in_flight
+            _in_flight = threading.BoundedSemaphore(_in_flight_size) if _in_flight_size > 0 else None
+        return _in_flight
+
+
+@contextmanager
+def slot(provider: str) -> Iterator[None]:
+    """Hold one in-flight request slot for ``provider`` for the duration of the block."""
+    semaphore = _semaphore()
+    if semaphore is not None:
+        semaphore.acquire()
+    try:
+        limiter = _limiter(provider)
+        if limiter is not None:
+            limiter.acquire()
+        yield
+    finally:
+        if semaphore is not None:
+            semaphore.release()
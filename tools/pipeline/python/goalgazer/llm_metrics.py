@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .config import settings
+from .prompt_compact import estimate_tokens
+
+# Token, latency and outcome accounting for every LLM call. call_llm records
+# one CallRecord per request; the caller then marks it with the validation
+# outcome. Records are appended to a JSON-lines log (one line per call) and,
+# while a MatchLedger is active, aggregated per match for data_provenance.
+# The ledger lives in a context variable, so threads that make calls on a
+# match's behalf must run in a copy of the caller's context.
+
+PENDING = "pending"
+
+
+@dataclass
+class CallRecord:
+    ts: float
+    match_id: Optional[str]
+    purpose: str
+    provider: str
+    model: str
+    attempt: int
+    prompt_tokens: int
+    completion_tokens: int
+    tokens_estimated: bool
+    latency_ms: float
+    streamed: bool
+    outcome: str = PENDING
+    error: Optional[str] = None
+
+
+class MatchLedger:
+    def __init__(self, match_id: str):
+        self.match_id = match_id
+        self.records: List[CallRecord] = []
+        self.cache_hits = 0
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def next_attempt(self, purpose: str) -> int:
+        with self._lock:
+            self._attempts[purpose] = self._attempts.get(purpose, 0) + 1
+            return self._attempts[purpose]
+
+    def add(self, record: CallRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            records = list(self.records)
+        by_provider: Dict[str, Dict[str, Any]] = {}
+        outcomes: Dict[str, int] = {}
+        for record in records:
+            entry = by_provider.setdefault(
+                f"{record.provider}/{record.model}",
+                {"calls": 0, "ok": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_ms": 0.0},
+            )
+            entry["calls"] += 1
+            entry["ok"] += record.outcome == "ok"
+            entry["prompt_tokens"] += record.prompt_tokens
+            entry["completion_tokens"] += record.completion_tokens
+            entry["latency_ms"] = round(entry["latency_ms"] + record.latency_ms, 1)
+            outcomes[record.outcome] = outcomes.get(record.outcome, 0) + 1
+        return {
+            "calls": len(records),
+            "cache_hits": self.cache_hits,
+            "prompt_tokens": sum(record.prompt_tokens for record in records),
+            "completion_tokens": sum(record.completion_tokens for record in records),
+            "tokens_estimated": any(record.tokens_estimated for record in records),
+            "latency_ms": round(sum(record.latency_ms for record in records), 1),
+            "outcomes": outcomes,
+            "by_provider": by_provider,
+        }
+
+
+_LEDGER: ContextVar[Optional[MatchLedger]] = ContextVar("llm_ledger", default=None)
+_LAST_CALL: ContextVar[Optional[CallRecord]] = ContextVar("llm_last_call", default=None)
+_LOG_LOCK = threading.Lock()
+
+
+def log_path() -> Path:
+    return settings.llm_cache_dir / "calls.jsonl"
+
+
+def _write(record: CallRecord) -> None:
+    try:
+        path = log_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _LOG_LOCK, path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+    except OSError as exc:
+        print(f"Could not record LLM call metrics: {exc}", file=sys.stderr)
+
+
+@contextmanager
+def track(match_id: str) -> Iterator[MatchLedger]:
+    """Collect every LLM call made in this context (and copies of it) for ``match_id``."""
+    ledger = MatchLedger(match_id)
+    token = _LEDGER.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _LEDGER.reset(token)
+        # Calls whose caller never reported a validation outcome are logged as-is.
+        for record in ledger.records:
+            if record.outcome == PENDING:
+                record.outcome = "unvalidated"
+                _write(record)
+
+
+def record_call(
+    provider: str,
+    model: str,
+    purpose: str,
+    messages: List[Dict[str, str]],
+    content: Optional[str],
+    usage: Optional[Dict[str, Any]],
+    seconds: float,
+    streamed: bool,
+    error: Optional[str] = None,
+) -> CallRecord:
+    """Record one request; failed requests are final, successful ones await set_outcome."""
+    ledger = _LEDGER.get()
+    usage = usage or {}
+    estimated = "prompt_tokens" not in usage or "completion_tokens" not in usage
+    record = CallRecord(
+        ts=time.time(),
+        match_id=ledger.match_id if ledger else None,
+        purpose=purpose,
+        provider=provider,
+        model=model,
+        attempt=ledger.next_attempt(purpose) if ledger else 1,
+        prompt_tokens=int(usage.get("prompt_tokens") or estimate_tokens("".join(m.get("content", "") for m in messages))),
+        completion_tokens=int(usage.get("completion_tokens") or estimate_tokens(content or "")),
+        tokens_estimated=estimated,
+        latency_ms=round(seconds * 1000, 1),
+        streamed=streamed,
+    )
+    if error is not None:
+        record.outcome = "aborted" if error.startswith("StreamAborted") else "error"
+        record.error = error[:200]
+    if ledger:
+        ledger.add(record)
+    _LAST_CALL.set(record)
+    if record.outcome != PENDING:
+        _write(record)
+    return record
+
+
+def set_outcome(outcome: str, error: Optional[str] = None) -> None:
+    """Mark the last call made in this context with its validation outcome."""
+    record = _LAST_CALL.get()
+    if record is None or record.outcome != PENDING:
+        return
+    record.outcome = outcome
+    if error:
+        record.error = error[:200]
+    _write(record)
+
+
+def record_cache_hit() -> None:
+    ledger = _LEDGER.get()
+    if ledger:
+        ledger.cache_hits += 1
+
+
+def load_records(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    path = path or log_path()
+    records = []
+    if path.exists():
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def summarize(
+    records: List[Dict[str, Any]],
+    group_by: str = "provider",
+    match_id: Optional[str] = None,
+    since_hours: float = 0,
+) -> Dict[str, Dict[str, Any]]:
+    """Per-group call counts, success rate, mean tokens and latency percentiles."""
+    cutoff = time.time() - since_hours * 3600 if since_hours else 0
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        if record.get("ts", 0) < cutoff or (match_id and record.get("match_id") != match_id):
+            continue
+        key = "/".join(str(record.get(field)) for field in group_by.split(","))
+        groups.setdefault(key, []).append(record)
+
+    summary: Dict[str, Dict[str, Any]] = {}
+    for key, entries in sorted(groups.items()):
+        latencies = sorted(entry["latency_ms"] for entry in entries)
+
+        def percentile(q: float) -> float:
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        summary[key] = {
+            "calls": len(entries),
+            "ok_rate": round(sum(entry.get("outcome") == "ok" for entry in entries) / len(entries), 3),
+            "prompt_tokens": sum(entry["prompt_tokens"] for entry in entries),
+            "completion_tokens": sum(entry["completion_tokens"] for entry in entries),
+            "mean_prompt_tokens": round(sum(entry["prompt_tokens"] for entry in entries) / len(entries)),
+            "p50_latency_ms": percentile(0.5),
+            "p90_latency_ms": percentile(0.9),
+        }
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize the LLM call metrics log")
+    parser.add_argument("--group-by", default="provider,model", help="Comma-separated record fields, e.g. purpose or match_id")
+    parser.add_argument("--match", help="Only calls made for this match ID")
+    parser.add_argument("--since-hours", type=float, default=0, help="Only calls from the last N hours (0 = all)")
+    args = parser.parse_args()
+    print(json.dumps(summarize(load_records(), args.group_by, args.match, args.since_hours), indent=2))
+
+
+if __name__ == "__main__":
+    main()
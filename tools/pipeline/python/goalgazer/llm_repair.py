@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import copy
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .prompt_compact import evidence_rows
+from .validation import find_forbidden, forbidden_terms, narrative_texts, schema_validator
+
+# Targeted repair of an LLM article payload. Instead of regenerating the whole
+# article, the failing fragments (a section, a player note, the multiverse
+# block or a missing top-level field) are sent back with the problems found,
+# and the corrected fragments are merged into the original payload.
+
+REPAIR_SYSTEM_PROMPT = (
+    "You are fixing fragments of a football match analysis JSON document. "
+    "Each fragment has a 'path', its current 'value' (null if missing) and a list of 'problems'.\n"
+    "1. Fix every listed problem and keep everything else as close to the original as possible.\n"
+    "2. Keep the same JSON shape as the original value; a section needs 'heading', 'paragraphs' and 'claims', "
+    "each claim needs 'claim', 'evidence' and 'confidence'.\n"
+    "3. Evidence must be cited as '<row>.<field>=<value>' using rows from the supplied 'evidence' table only.\n"
+    "4. Never use any term listed in 'forbidden_terms'.\n"
+    "5. Output MUST be strict JSON: {\"fragments\": [{\"path\": \"...\", \"value\": ...}]} with one entry per requested path."
+)
+
+
+@dataclass
+class Defect:
+    path: str
+    problem: str
+    evidence: bool = False
+
+
+def _fragment_path(parts: List[Any]) -> Optional[str]:
+    if not parts:
+        return None
+    if parts[0] in ("sections", "player_notes") and len(parts) >= 2 and isinstance(parts[1], int):
+        return f"{parts[0]}.{parts[1]}"
+    return str(parts[0])
+
+
+def _bad_evidence(items: List[str], allowed_tokens: set[str]) -> List[str]:
+    return [item for item in items if item.split("=")[0] not in allowed_tokens]
+
+
+def find_defects(
+    payload: Any,
+    schema: Dict[str, Any],
+    availability: Dict[str, bool],
+    allowed_tokens: set[str],
+) -> Optional[List[Defect]]:
+    """Locate repairable problems; None when the payload is beyond fragment repair."""
+    if not isinstance(payload, dict):
+        return None
+    defects: List[Defect] = []
+    for error in schema_validator(schema).iter_errors(payload):
+        parts = list(error.absolute_path)
+        if not parts and error.validator == "required":
+            missing = [key for key in schema.get("required", []) if key not in payload]
+            defects.extend(Defect(key, "missing required field") for key in missing)
+            continue
+        path = _fragment_path(parts)
+        if path is None:
+            return None
+        detail = ".".join(str(part) for part in parts)
+        defects.append(Defect(path, f"schema: {detail}: {error.message[:160]}"))
+
+    for kind in ("sections", "player_notes"):
+        items = payload.get(kind)
+        if not isinstance(items, list):
+            continue
+        for idx, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            wrapper = {kind: [item]}
+            term = find_forbidden(narrative_texts(wrapper), availability)
+            if term:
+                defects.append(Defect(f"{kind}.{idx}", f"uses forbidden term '{term}'"))
+            if kind == "sections":
+                claims = item.get("claims") if isinstance(item.get("claims"), list) else []
+                evidence = [e for claim in claims if isinstance(claim, dict) for e in claim.get("evidence") or []]
+            else:
+                evidence = item.get("evidence") or []
+            bad = _bad_evidence([e for e in evidence if isinstance(e, str)], allowed_tokens)
+            if bad:
+                defects.append(Defect(f"{kind}.{idx}", f"evidence not in table: {bad[:5]}", evidence=True))
+    return defects
+
+
+def _get(payload: Dict[str, Any], path: str) -> Any:
+    key, _, idx = path.partition(".")
+    value = payload.get(key)
+    if idx:
+        return value[int(idx)] if isinstance(value, list) and int(idx) < len(value) else None
+    return value
+
+
+def _set(payload: Dict[str, Any], path: str, value: Any) -> None:
+    key, _, idx = path.partition(".")
+    if idx:
+        payload[key][int(idx)] = value
+    else:
+        payload[key] = value
+
+
+def build_repair_messages(
+    payload: Dict[str, Any],
+    defects: List[Defect],
+    metrics: Dict[str, Any],
+    availability: Dict[str, bool],
+) -> List[Dict[str, str]]:
+    problems: Dict[str, List[str]] = {}
+    for defect in defects:
+        problems.setdefault(defect.path, []).append(defect.problem)
+    request: Dict[str, Any] = {
+        "fragments": [
+            {"path": path, "value": _get(payload, path), "problems": items}
+            for path, items in problems.items()
+        ],
+        "forbidden_terms": forbidden_terms(availability),
+        "availability": availability,
+    }
+    # The evidence table is the bulk of the prompt; only send it when needed.
+    if any(defect.evidence or defect.path.startswith(("sections", "player_notes")) for defect in defects):
+        request["evidence"] = evidence_rows(metrics)
+    return [
+        {"role": "system", "content": REPAIR_SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps(request, separators=(",", ":"), ensure_ascii=False)},
+    ]
+
+
+def merge_repairs(payload: Dict[str, Any], defects: List[Defect], response: str) -> Dict[str, Any]:
+    """Return a copy of ``payload`` with the requested fragments replaced.
+
+    Fragments for paths that were not requested are ignored; a requested path
+    missing from the response raises ValueError.
+    """
+    fragments = json.loads(response).get("fragments")
+    if not isinstance(fragments, list):
+        raise ValueError("repair response has no 'fragments' list")
+    requested = {defect.path for defect in defects}
+    repaired = {
+        fragment.get("path"): fragment.get("value")
+        for fragment in fragments
+        if isinstance(fragment, dict) and fragment.get("path") in requested
+    }
+    missing = requested - set(repaired)
+    if missing:
+        raise ValueError(f"repair response is missing fragments: {sorted(missing)}")
+    merged = copy.deepcopy(payload)
+    for path, value in repaired.items():
+        _set(merged, path, value)
+    return merged
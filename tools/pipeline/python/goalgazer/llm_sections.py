@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from jsonschema import ValidationError
+import requests
+
+from . import llm_metrics
+from .config import settings
+from .llm_generate import LLM_SCHEMA, call_llm, evidence_traceable
+from .schemas import LLMOutput
+from .stream_guard import StreamAborted, StreamMonitor
+from .validation import check, find_forbidden, forbidden_matcher, narrative_texts
+
+# Section-parallel generation: the article is split into independent parts
+# that are requested concurrently and merged. Every part shares the same
+# system prompt and data message, so providers can reuse the cached prefix;
+# only the short final instruction differs. Part responses use the same keys
+# as the full article ("sections" is a one-item list), so the streaming
+# monitor and validators apply unchanged.
+
+SECTION_SYSTEM_PROMPT = (
+    "You are a professional football tactical analyst and data editor writing ONE part of a match article. "
+    "Strictly follow these requirements:\n"
+    "1. Only use the supplied JSON data. Do not fabricate facts.\n"
+    "2. Output MUST be strict JSON with exactly the keys the part instruction asks for, and no extra text.\n"
+    "3. A section is {\"heading\", \"bullets\", \"paragraphs\", \"claims\"}; it needs at least 2 paragraphs of at least 5 sentences.\n"
+    "4. Every claim needs 'evidence' from the 'evidence' table cited as '<row>.<field>=<value>', and a 'confidence' between 0 and 1.\n"
+    "5. If availability.has_xg is false, do NOT mention xG or Expected Goals.\n"
+    "6. If availability.has_players is false, do NOT mention ratings or duels, and player notes may only cite timeline rows."
+)
+
+
+@dataclass(frozen=True)
+class ArticlePart:
+    name: str
+    keys: Tuple[str, ...]
+    instruction: str
+    required: bool = True
+    section_index: Optional[int] = None
+
+
+ARTICLE_PARTS: List[ArticlePart] = [
+    ArticlePart(
+        "overview",
+        ("title", "meta_description", "tags", "thesis", "sections", "data_limitations", "cta"),
+        "Write the article frame: 'title', 'meta_description', 'tags', a 2-3 sentence 'thesis', "
+        "'data_limitations', a closing 'cta', and 'sections' with ONE section headed 'Match Overview'.",
+        section_index=0,
+    ),
+    ArticlePart(
+        "key_moments",
+        ("sections",),
+        "Write 'sections' with ONE section headed 'Key Moments' covering goals, cards and turning points in order.",
+        section_index=1,
+    ),
+    ArticlePart(
+        "tactical_notes",
+        ("sections",),
+        "Write 'sections' with ONE section headed 'Tactical Notes' on shape, possession and chance creation.",
+        section_index=2,
+    ),
+    ArticlePart(
+        "player_notes",
+        ("player_notes",),
+        "Write 'player_notes': 2-4 entries {\"player\", \"team\", \"summary\", \"evidence\"} for the most influential players.",
+        required=False,
+    ),
+    ArticlePart(
+        "multiverse",
+        ("multiverse",),
+        "Write 'multiverse': {\"summary\", \"pivots\"} with 2-3 pivot points, each with 'minute', 'type', "
+        "'description', 'reality' and a high-probability 'symmetry' including 'probability'.",
+        required=False,
+    ),
+]
+
+
+def part_schema(part: ArticlePart) -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": {key: LLM_SCHEMA["properties"][key] for key in part.keys},
+        "required": list(part.keys),
+    }
+
+
+_PART_SCHEMAS = {part.name: part_schema(part) for part in ARTICLE_PARTS}
+
+
+def select_part(article: Dict[str, Any], part_name: str) -> Dict[str, Any]:
+    """Cut the keys for ``part_name`` out of a full article (used by the stub)."""
+    part = next(part for part in ARTICLE_PARTS if part.name == part_name)
+    selected = {key: article.get(key) for key in part.keys if key in article}
+    if part.section_index is not None:
+        sections = article.get("sections") or []
+        selected["sections"] = sections[part.section_index : part.section_index + 1]
+    return selected
+
+
+def part_messages(data_message: Dict[str, str], part: ArticlePart) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SECTION_SYSTEM_PROMPT},
+        data_message,
+        {"role": "user", "content": json.dumps({"part": part.name, "instruction": part.instruction})},
+    ]
+
+
+def _generate_part(
+    part: ArticlePart,
+    data_message: Dict[str, str],
+    use_openai: bool,
+    availability: Dict[str, bool],
+    allowed_tokens: set[str],
+) -> Optional[Dict[str, Any]]:
+    messages = part_messages(data_message, part)
+    for attempt in range(settings.llm_section_attempts):
+        try:
+            monitor = StreamMonitor(LLM_SCHEMA, forbidden_matcher(availability))
+            payload = json.loads(call_llm(messages, use_openai=use_openai, monitor=monitor, purpose=f"part:{part.name}"))
+            check(payload, _PART_SCHEMAS[part.name])
+            term = find_forbidden(narrative_texts(payload), availability)
+            if term:
+                raise ValueError(f"forbidden term '{term}'")
+            if not evidence_traceable(payload, allowed_tokens):
+                raise ValueError("evidence not traceable to the catalog")
+            llm_metrics.set_outcome("ok")
+            return payload
+        except (ValidationError, ValueError, requests.RequestException, StreamAborted) as e:
+            llm_metrics.set_outcome("invalid", f"{type(e).__name__}: {e}")
+            print(f"Part {part.name} attempt {attempt + 1} failed: {type(e).__name__}: {str(e)[:100]}", file=sys.stderr)
+    return None
+
+
+def merge_parts(parts: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    article: Dict[str, Any] = {"language": "en", "sections": [], "player_notes": []}
+    for part in ARTICLE_PARTS:
+        payload = parts.get(part.name)
+        if not payload:
+            continue
+        for key in part.keys:
+            if key == "sections":
+                article["sections"].extend(payload.get("sections", []))
+            else:
+                article[key] = payload[key]
+    return article
+
+
+def generate_sections_parallel(
+    data_message: Dict[str, str],
+    use_openai: bool,
+    availability: Dict[str, bool],
+    allowed_tokens: set[str],
+) -> Optional[Tuple[Dict[str, Any], LLMOutput]]:
+    """Request every article part concurrently; None if a required part failed."""
+    with ThreadPoolExecutor(max_workers=len(ARTICLE_PARTS), thread_name_prefix="llm-part") as executor:
+        futures = {
+            part.name: executor.submit(
+                contextvars.copy_context().run,
+                _generate_part, part, data_message, use_openai, availability, allowed_tokens,
+            )
+            for part in ARTICLE_PARTS
+        }
+        parts = {name: future.result() for name, future in futures.items()}
+
+    failed = [part.name for part in ARTICLE_PARTS if part.required and parts.get(part.name) is None]
+    if failed:
+        print(f"Section-parallel generation failed for {', '.join(failed)}.", file=sys.stderr)
+        return None
+    skipped = [part.name for part in ARTICLE_PARTS if parts.get(part.name) is None]
+    if skipped:
+        print(f"Optional parts omitted: {', '.join(skipped)}.", file=sys.stderr)
+
+    article = merge_parts(parts)
+    try:
+        check(article, LLM_SCHEMA)
+    except ValidationError as e:
+        print(f"Merged article failed validation: {e.message[:100]}", file=sys.stderr)
+        return None
+    return article, LLMOutput.model_validate(article)
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import llm_cache
+from .config import settings
+from .llm_repair import REPAIR_SYSTEM_PROMPT
+from .llm_sections import SECTION_SYSTEM_PROMPT, select_part
+from .translate import TRANSLATION_SYSTEM_PROMPT
+
+# Deterministic local stand-in for the OpenAI-compatible chat-completions
+# endpoints. Responses are replayed from the LLM response cache when the same
+# prompt was answered before, otherwise synthesized from the prompt's evidence
+# table so they pass validation. Latency, HTTP errors and malformed output are
+# injected from a seeded RNG keyed by the request and how often it was seen,
+# so a run is reproducible and retries can still succeed.
+
+MALFORMED_KINDS = ("truncated", "forbidden_term", "wrong_shape", "missing_field")
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 0.0
+    error_rate: float = 0.0
+    malformed_rate: float = 0.0
+    seed: int = 0
+    replay: bool = True
+
+    @classmethod
+    def from_settings(cls) -> "StubConfig":
+        return cls(
+            latency_ms=settings.llm_stub_latency_ms,
+            error_rate=settings.llm_stub_error_rate,
+            malformed_rate=settings.llm_stub_malformed_rate,
+            seed=settings.llm_stub_seed,
+        )
+
+
+def _citations(evidence: Dict[str, Dict[str, Any]], prefix: str, limit: int) -> List[str]:
+    cited = []
+    for row, fields in evidence.items():
+        if not row.startswith(prefix):
+            continue
+        for field, value in fields.items():
+            cited.append(f"{row}.{field}={value}")
+            if len(cited) >= limit:
+                return cited
+    return cited
+
+
+def _sentences(subject: str, angle: str) -> str:
+    return " ".join(
+        [
+            f"{subject} shaped the {angle} from the opening phase.",
+            f"The numbers in the supplied data frame the {angle} clearly.",
+            f"Both sides adjusted their structure as the {angle} developed.",
+            f"The sequence of events explains how the {angle} settled.",
+            f"This summary stays within the recorded match data.",
+        ]
+    )
+
+
+def synthesize_article(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a schema-valid article whose evidence all comes from ``payload``."""
+    context = payload.get("match_context") or {}
+    home = (context.get("homeTeam") or {}).get("name") or "Home"
+    away = (context.get("awayTeam") or {}).get("name") or "Away"
+    evidence = payload.get("evidence") or {}
+    score = _citations(evidence, "match.score", 2)
+    stats = _citations(evidence, "team_stats.", 4)
+    events = [
+        (row, fields)
+        for row, fields in evidence.items()
+        if row.startswith("timeline.") and fields.get("type") in ("goal", "card")
+    ]
+    moments = [f"{row}.minute={fields['minute']}" for row, fields in events[:3] if "minute" in fields]
+
+    def section(heading: str, angle: str, cited: List[str]) -> Dict[str, Any]:
+        return {
+            "heading": heading,
+            "bullets": [],
+            "paragraphs": [_sentences(home, angle), _sentences(away, angle)],
+            "claims": [{"claim": f"The reading of the {angle} is supported by the recorded data.", "evidence": cited, "confidence": 0.8}],
+        }
+
+    players = [(row, fields) for row, fields in evidence.items() if row.startswith("players.") and "name" in fields]
+    notes = [
+        {
+            "player": fields["name"],
+            "team": home if row.startswith("players.home") else away,
+            "summary": f"{fields['name']} featured for {fields.get('minutes', 'unrecorded')} minutes.",
+            "evidence": [f"{row}.name={fields['name']}"],
+        }
+        for row, fields in players[:2]
+    ]
+    pivot_minute = int(events[0][1].get("minute", 45)) if events else 45
+    return {
+        "language": "en",
+        "title": f"{home} vs {away}: Tactical Review",
+        "meta_description": f"Data-led review of {home} against {away}.",
+        "tags": ["tactical-analysis", "match-review"],
+        "thesis": f"{home} and {away} produced a match best read through its recorded events. The data frames every claim below.",
+        "sections": [
+            section("Match Overview", "overall contest", score or stats[:1]),
+            section("Key Moments", "key moments", moments or score),
+            section("Tactical Notes", "tactical balance", stats or score),
+        ],
+        "player_notes": notes,
+        "data_limitations": [],
+        "cta": "Follow the next fixture for more data-led analysis.",
+        "multiverse": {
+            "summary": "One moment could have changed the course of the match.",
+            "pivots": [
+                {
+                    "minute": pivot_minute,
+                    "type": "goal" if events and events[0][1].get("type") == "goal" else "other",
+                    "description": f"The turning point around minute {pivot_minute}.",
+                    "reality": {"event": "The recorded event stood.", "outcome": "The match followed its recorded course.", "tactical_impact": "Both sides kept their shape."},
+                    "symmetry": {"event": "The moment went the other way.", "outcome": "The balance shifted.", "tactical_impact": "The trailing side pushed higher.", "probability": 0.4},
+                }
+            ],
+        },
+    }
+
+
+def synthesize_repair(request: Dict[str, Any]) -> Dict[str, Any]:
+    article = synthesize_article({"evidence": request.get("evidence") or {}})
+    fragments = []
+    for fragment in request.get("fragments", []):
+        path = fragment.get("path", "")
+        key, _, idx = path.partition(".")
+        value = article.get(key)
+        if idx and isinstance(value, list):
+            value = value[int(idx) % len(value)] if value else {}
+        fragments.append({"path": path, "value": value})
+    return {"fragments": fragments}
+
+
+def _malform(content: str, kind: str) -> str:
+    if kind == "truncated":
+        return content[: len(content) // 2]
+    payload = json.loads(content)
+    if kind == "wrong_shape":
+        return json.dumps([payload])
+    if kind == "missing_field" and isinstance(payload, dict):
+        payload.pop("cta", None)
+        payload.pop("fragments", None)
+    if kind == "forbidden_term" and payload.get("sections"):
+        payload["sections"][0]["paragraphs"][0] += " Their xG told the same story."
+    return json.dumps(payload)
+
+
+def _load_json(text: str) -> Dict[str, Any]:
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: StubConfig):
+        super().__init__(address, _StubHandler)
+        self.config = config
+        self.seen: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def next_rng(self, key: str) -> random.Random:
+        with self.lock:
+            count = self.seen.get(key, 0)
+            self.seen[key] = count + 1
+        digest = hashlib.sha256(f"{self.config.seed}:{key}:{count}".encode()).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:
+        if not self.path.rstrip("/").endswith("chat/completions"):
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            messages = body["messages"]
+        except (ValueError, KeyError) as exc:
+            self._send_json(400, {"error": {"message": f"bad request: {exc}"}})
+            return
+
+        config = self.server.config
+        model = body.get("model", "stub")
+        key = llm_cache.fingerprint("stub", "", messages)
+        rng = self.server.next_rng(key)
+        latency = config.latency_ms * (0.5 + rng.random()) / 1000
+        if rng.random() < config.error_rate:
+            time.sleep(latency)
+            status = rng.choice([429, 500, 503])
+            self._send_json(status, {"error": {"message": f"stub injected HTTP {status}"}})
+            return
+
+        content = self._content(messages, model)
+        if rng.random() < config.malformed_rate:
+            content = _malform(content, rng.choice(MALFORMED_KINDS))
+
+        usage = {
+            "prompt_tokens": sum(len(m.get("content", "")) for m in messages) // 4,
+            "completion_tokens": len(content) // 4,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        if body.get("stream"):
+            self._stream(content, model, latency)
+            return
+        time.sleep(latency)
+        self._send_json(
+            200,
+            {
+                "id": f"stub-{key[:12]}",
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            },
+        )
+
+    def _content(self, messages: List[Dict[str, str]], model: str) -> str:
+        if self.server.config.replay:
+            for provider in ("pollinations", "openai"):
+                cached = llm_cache.lookup(provider, model, messages)
+                if cached is not None:
+                    return cached
+        system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+        user_payloads = [_load_json(m.get("content", "")) for m in messages if m.get("role") == "user"]
+        if system == TRANSLATION_SYSTEM_PROMPT and user_payloads:
+            request = user_payloads[-1]
+            language = request.get("target_language", "")
+            strings = request.get("strings") or {}
+            return json.dumps({"translations": {key: f"[{language[:2]}] {text}" for key, text in strings.items()}}, ensure_ascii=False)
+        if system == REPAIR_SYSTEM_PROMPT:
+            return json.dumps(synthesize_repair(user_payloads[-1] if user_payloads else {}))
+        article = synthesize_article(user_payloads[0] if user_payloads else {})
+        if system == SECTION_SYSTEM_PROMPT and user_payloads:
+            return json.dumps(select_part(article, user_payloads[-1].get("part", "overview")))
+        return json.dumps(article)
+
+    def _stream(self, content: str, model: str, latency: float) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        chunks = [content[i : i + 64] for i in range(0, len(content), 64)] or [""]
+        try:
+            for chunk in chunks:
+                time.sleep(latency / len(chunks))
+                event = {"object": "chat.completion.chunk", "model": model, "choices": [{"index": 0, "delta": {"content": chunk}}]}
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+_background: Optional[StubServer] = None
+_background_lock = threading.Lock()
+
+
+def ensure_background_server(config: Optional[StubConfig] = None) -> str:
+    """Start one in-process stub on an ephemeral port and return its URL."""
+    global _background
+    with _background_lock:
+        if _background is None:
+            _background = StubServer(("127.0.0.1", 0), config or StubConfig.from_settings())
+            threading.Thread(target=_background.serve_forever, name="llm-stub", daemon=True).start()
+            print(f"LLM stub listening on {_background.url}", file=sys.stderr)
+        return _background.url
+
+
+def main() -> None:
+    defaults = StubConfig.from_settings()
+    parser = argparse.ArgumentParser(description="Run a deterministic local chat-completions stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--malformed-rate", type=float, default=defaults.malformed_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--no-replay", action="store_true", help="Always synthesize; ignore cached responses")
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency_ms, args.error_rate, args.malformed_rate, args.seed, not args.no_replay)
+    server = StubServer((args.host, args.port), config)
+    print(f"LLM stub listening on {server.url} (set LLM_STUB_URL to use it)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
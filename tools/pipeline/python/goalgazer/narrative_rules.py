@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .evidence import EvidenceCatalog
+from .schemas import LLMOutput, MatchData, TimelineEvent
+
+# Deterministic narrative engine. Builds a complete LLMOutput from templates
+# and simple rules over the score, timeline, normalized team stats and player
+# rows. Every evidence item is formatted from the same catalog the validators
+# check against, so the output is traceable by construction. It runs in
+# milliseconds and serves as an instant first publish that a later LLM run
+# replaces.
+
+# (stat key, label, unit) compared in the tactical notes, in display order.
+TACTICAL_STATS: List[Tuple[str, str, str]] = [
+    ("possession", "possession", "%"),
+    ("total_shots", "shots", ""),
+    ("shots_on_target", "shots on target", ""),
+    ("shots_inside_box", "shots from inside the box", ""),
+    ("passes_total", "passes", ""),
+    ("pass_accuracy", "pass accuracy", "%"),
+    ("corners", "corners", ""),
+    ("fouls", "fouls", ""),
+    ("gk_saves", "goalkeeper saves", ""),
+]
+
+PLAYER_COUNTS: List[Tuple[str, str, str]] = [
+    ("goals", "goal", "goals"),
+    ("assists", "assist", "assists"),
+    ("key_passes", "key pass", "key passes"),
+    ("shots", "shot", "shots"),
+]
+
+
+def _cite(metrics: EvidenceCatalog, path: str) -> List[str]:
+    citation = metrics.citation(path)
+    return [citation] if citation else []
+
+
+def _timeline_cites(metrics: EvidenceCatalog, idx: int, *fields: str) -> List[str]:
+    cites: List[str] = []
+    for field in fields:
+        cites.extend(_cite(metrics, f"timeline.{idx}.{field}"))
+    return cites
+
+
+def _claim(claim: str, evidence: List[str], confidence: float) -> Dict[str, Any]:
+    return {"claim": claim, "evidence": evidence, "confidence": confidence}
+
+
+def _verb(margin: int) -> str:
+    if margin >= 3:
+        return "beat"
+    if margin > 0:
+        return "edged past" if margin == 1 else "saw off"
+    return "drew with"
+
+
+def _event_line(event: TimelineEvent) -> str:
+    who = event.playerName or "an unrecorded player"
+    team = f" ({event.teamName})" if event.teamName else ""
+    if event.type == "goal":
+        line = f"{event.minute}' Goal: {who}{team}"
+        if event.assistName:
+            line += f", assisted by {event.assistName}"
+        if event.score_after:
+            line += f" to make it {event.score_after.get('home')}-{event.score_after.get('away')}"
+        return line
+    if event.type == "card":
+        return f"{event.minute}' {event.detail or 'Card'}: {who}{team}"
+    return f"{event.minute}' {event.detail or event.type.title()}: {who}{team}"
+
+
+def _is_red(event: TimelineEvent) -> bool:
+    return event.type == "card" and "red" in (event.detail or "").lower()
+
+
+def _overview(match: MatchData, metrics: EvidenceCatalog, home: str, away: str, ids: Dict[str, str]) -> Dict[str, Any]:
+    score = match.match.score or {}
+    home_goals, away_goals = score.get("home"), score.get("away")
+    paragraphs: List[str] = []
+    claims: List[Dict[str, Any]] = []
+    score_cites = _cite(metrics, "match.score.home") + _cite(metrics, "match.score.away")
+
+    if home_goals is not None and away_goals is not None:
+        if home_goals == away_goals:
+            result = f"{home} and {away} drew {home_goals}-{away_goals}"
+        elif home_goals > away_goals:
+            result = f"{home} {_verb(home_goals - away_goals)} {away} {home_goals}-{away_goals}"
+        else:
+            result = f"{away} {_verb(away_goals - home_goals)} {home} {away_goals}-{home_goals} away from home"
+        ht = (score.get("ht_home"), score.get("ht_away"))
+        half_time = f" after a {ht[0]}-{ht[1]} half-time score" if None not in ht else ""
+        venue = f" at {match.match.venue}" if match.match.venue else ""
+        paragraphs.append(f"{result}{venue}{half_time}. This review walks through how the result was built from the recorded data.")
+        claims.append(_claim(f"The final score was {home} {home_goals}-{away_goals} {away}.", score_cites, 0.99))
+    else:
+        paragraphs.append(f"{home} met {away} in {match.match.league}. No final score was recorded in the source data.")
+
+    stats = match.aggregates.normalized or {}
+    home_stats, away_stats = stats.get(ids["home"]) or {}, stats.get(ids["away"]) or {}
+    possession = (home_stats.get("possession"), away_stats.get("possession"))
+    shots = (home_stats.get("total_shots"), away_stats.get("total_shots"))
+    if None not in possession and possession[0] != possession[1]:
+        leader = home if possession[0] > possession[1] else away
+        paragraphs.append(
+            f"{leader} had more of the ball, with possession split {possession[0]}% to {possession[1]}%."
+            + (f" The shot count finished {shots[0]} to {shots[1]}." if None not in shots else "")
+        )
+        claims.append(
+            _claim(
+                f"{leader} controlled possession.",
+                _cite(metrics, f"team_stats.normalized.{ids['home']}.possession")
+                + _cite(metrics, f"team_stats.normalized.{ids['away']}.possession"),
+                0.9,
+            )
+        )
+    if len(paragraphs) < 2:
+        paragraphs.append("Team-level statistics were limited, so this review leans on the score and recorded events.")
+    if not claims:
+        claims.append(_claim(f"{home} hosted {away}.", score_cites, 0.5))
+    return {"heading": "Match Overview", "bullets": [], "paragraphs": paragraphs, "claims": claims}
+
+
+def _key_moments(match: MatchData, metrics: EvidenceCatalog, fallback_cites: List[str]) -> Dict[str, Any]:
+    moments = [(idx, event) for idx, event in enumerate(match.timeline) if event.type in ("goal", "card", "var")]
+    bullets = [_event_line(event) for _, event in moments]
+    claims: List[Dict[str, Any]] = []
+    for idx, event in moments:
+        if event.type == "goal" or _is_red(event):
+            what = "scored" if event.type == "goal" else "was sent off"
+            claims.append(
+                _claim(
+                    f"{event.playerName or 'A player'} {what} in minute {event.minute}.",
+                    _timeline_cites(metrics, idx, "minute", "type", "playerName", "teamName"),
+                    0.95,
+                )
+            )
+
+    goals = [event for _, event in moments if event.type == "goal"]
+    cards = [event for _, event in moments if event.type == "card"]
+    paragraphs: List[str] = []
+    if goals:
+        first = goals[0]
+        paragraphs.append(
+            f"The first goal came in minute {first.minute} through {first.playerName or 'an unrecorded scorer'}"
+            + (f" for {first.teamName}" if first.teamName else "")
+            + (f", the only goal of the match." if len(goals) == 1 else f", and {len(goals)} goals were scored in total.")
+        )
+        if len(goals) > 1:
+            paragraphs.append(f"The last goal arrived in minute {goals[-1].minute}, settling the scoreline.")
+    if cards:
+        reds = [event for event in cards if _is_red(event)]
+        paragraphs.append(
+            f"The referee showed {len(cards)} card{'s' if len(cards) != 1 else ''}"
+            + (f", including {len(reds)} red, which changed the numbers on the pitch." if reds else ", none of them red.")
+        )
+    if not moments:
+        paragraphs.append("No goals, cards or review decisions were recorded in the event feed for this match.")
+        claims.append(_claim("The final score is the main recorded outcome.", fallback_cites, 0.6))
+    if len(paragraphs) < 2:
+        paragraphs.append("The bullet list above gives every recorded moment in match order.")
+    if not claims:
+        first_idx = moments[0][0] if moments else None
+        cites = _timeline_cites(metrics, first_idx, "minute", "type") if first_idx is not None else fallback_cites
+        claims.append(_claim("The recorded events are listed in match order.", cites, 0.8))
+    return {"heading": "Key Moments", "bullets": bullets, "paragraphs": paragraphs, "claims": claims}
+
+
+def _tactical_notes(
+    match: MatchData,
+    metrics: EvidenceCatalog,
+    availability: Dict[str, bool],
+    home: str,
+    away: str,
+    ids: Dict[str, str],
+    fallback_cites: List[str],
+) -> Dict[str, Any]:
+    stats = match.aggregates.normalized or {}
+    home_stats, away_stats = stats.get(ids["home"]) or {}, stats.get(ids["away"]) or {}
+    keys = TACTICAL_STATS + ([("xg", "xG", "")] if availability.get("has_xg") else [])
+    bullets: List[str] = []
+    claims: List[Dict[str, Any]] = []
+    edges: List[str] = []
+    for key, label, unit in keys:
+        home_value, away_value = home_stats.get(key), away_stats.get(key)
+        if home_value is None or away_value is None:
+            continue
+        bullets.append(f"{label[0].upper()}{label[1:]}: {home} {home_value}{unit}, {away} {away_value}{unit}")
+        if home_value == away_value or key in ("fouls", "gk_saves"):
+            continue
+        leader = home if home_value > away_value else away
+        edges.append(f"{label} ({leader})")
+        claims.append(
+            _claim(
+                f"{leader} led on {label}.",
+                _cite(metrics, f"team_stats.normalized.{ids['home']}.{key}")
+                + _cite(metrics, f"team_stats.normalized.{ids['away']}.{key}"),
+                0.9,
+            )
+        )
+
+    paragraphs: List[str] = []
+    if edges:
+        paragraphs.append(f"The statistical edges were: {', '.join(edges)}.")
+        for side, team, team_stats in (("home", home, home_stats), ("away", away, away_stats)):
+            total, on_target = team_stats.get("total_shots"), team_stats.get("shots_on_target")
+            if total:
+                if on_target is not None:
+                    paragraphs.append(f"{team} put {on_target} of {total} shots on target ({round(100 * on_target / total)}%).")
+    else:
+        paragraphs.append("Team statistics were not detailed enough to compare the two sides.")
+        claims.append(_claim("The tactical picture rests on the score and events.", fallback_cites, 0.5))
+    if match.match.formation:
+        paragraphs.append(f"The recorded formation was {match.match.formation}.")
+    if len(paragraphs) < 2:
+        paragraphs.append("The comparison above covers every statistic recorded for both teams.")
+    return {"heading": "Tactical Notes", "bullets": bullets, "paragraphs": paragraphs, "claims": claims}
+
+
+def _player_notes(
+    match: MatchData,
+    metrics: EvidenceCatalog,
+    availability: Dict[str, bool],
+    team_names: Dict[str, str],
+    limit: int = 3,
+) -> List[Dict[str, Any]]:
+    players_output = metrics.players_output
+    notes: List[Dict[str, Any]] = []
+    if players_output:
+        ranked = []
+        for side, players in players_output.items():
+            for idx, player in enumerate(players):
+                impact = 3 * (player.get("goals") or 0) + 2 * (player.get("assists") or 0) + (player.get("key_passes") or 0)
+                if impact:
+                    ranked.append((impact, side, idx, player))
+        ranked.sort(key=lambda row: (-row[0], row[3]["name"]))
+        for _, side, idx, player in ranked[:limit]:
+            parts, cites = [], _cite(metrics, f"players.{side}.{idx}.name")
+            for key, one, many in PLAYER_COUNTS:
+                value = player.get(key)
+                if value:
+                    parts.append(f"{value} {one if value == 1 else many}")
+                    cites.extend(_cite(metrics, f"players.{side}.{idx}.{key}"))
+            minutes = f" in {player['minutes']} minutes" if player.get("minutes") else ""
+            notes.append(
+                {
+                    "player": player["name"],
+                    "team": team_names[side],
+                    "summary": f"{player['name']} finished with {', '.join(parts)}{minutes}.",
+                    "evidence": cites,
+                }
+            )
+        return notes
+
+    # Without player stats, notes may only cite timeline rows.
+    seen = set()
+    for idx, event in enumerate(match.timeline):
+        if event.type != "goal" or not event.playerName or event.playerName in seen:
+            continue
+        seen.add(event.playerName)
+        goals = [e for e in match.timeline if e.type == "goal" and e.playerName == event.playerName]
+        minutes = ", ".join(f"{e.minute}'" for e in goals)
+        notes.append(
+            {
+                "player": event.playerName,
+                "team": event.teamName or "",
+                "summary": f"{event.playerName} scored {len(goals)} goal{'s' if len(goals) != 1 else ''} ({minutes}).",
+                "evidence": _timeline_cites(metrics, idx, "minute", "playerName"),
+            }
+        )
+        if len(notes) >= limit:
+            break
+    return notes
+
+
+def _multiverse(match: MatchData, home: str, away: str) -> Optional[Dict[str, Any]]:
+    pivots = []
+    for event in match.timeline:
+        if event.type == "goal":
+            pivot_type, probability = "goal", 0.35
+            counterfactual = f"{event.playerName or 'The scorer'}'s chance is missed."
+        elif _is_red(event):
+            pivot_type, probability = "red card", 0.3
+            counterfactual = f"{event.playerName or 'The player'} stays on the pitch."
+        else:
+            continue
+        team = event.teamName or "their side"
+        other = away if event.teamName == home else home
+        pivots.append(
+            {
+                "minute": event.minute,
+                "type": pivot_type,
+                "description": _event_line(event),
+                "reality": {
+                    "event": _event_line(event),
+                    "outcome": "The match continued on its recorded course.",
+                    "tactical_impact": f"{team} could manage the game state while {other} had to respond.",
+                },
+                "symmetry": {
+                    "event": counterfactual,
+                    "outcome": "The game state stays level at that moment.",
+                    "tactical_impact": f"{other} would not have needed to chase the game.",
+                    "probability": probability,
+                },
+            }
+        )
+        if len(pivots) >= 3:
+            break
+    if not pivots:
+        return None
+    return {"summary": f"{len(pivots)} recorded moment{'s' if len(pivots) != 1 else ''} shaped this match.", "pivots": pivots}
+
+
+def _limitations(availability: Dict[str, bool]) -> List[str]:
+    limitations = []
+    if not availability.get("has_events"):
+        limitations.append("The event feed was unavailable, so key moments are limited.")
+    if not availability.get("has_statistics"):
+        limitations.append("Team-level statistics were unavailable for this match.")
+    if not availability.get("has_players"):
+        limitations.append("Individual player statistics were unavailable; player notes use the event feed only.")
+    limitations.append("This is an automatically generated first draft and will be replaced by a full analysis.")
+    return limitations
+
+
+def build_rule_output(match: MatchData, metrics: EvidenceCatalog, availability: Dict[str, bool]) -> LLMOutput:
+    """Template and rules narrative for ``match``; evidence is drawn from ``metrics`` only."""
+    home, away = match.match.homeTeam["name"], match.match.awayTeam["name"]
+    ids = {"home": str(match.match.homeTeam["id"]), "away": str(match.match.awayTeam["id"])}
+    score_cites = _cite(metrics, "match.score.home") + _cite(metrics, "match.score.away")
+
+    overview = _overview(match, metrics, home, away, ids)
+    return LLMOutput(
+        title=f"{home} vs {away}: {match.match.league} Match Review",
+        meta_description=f"Score, key moments and team statistics from {home} against {away}.",
+        tags=["match-review", match.match.league.lower().replace(" ", "-")],
+        thesis=overview["paragraphs"][0],
+        sections=[
+            overview,
+            _key_moments(match, metrics, score_cites),
+            _tactical_notes(match, metrics, availability, home, away, ids, score_cites),
+        ],
+        player_notes=_player_notes(match, metrics, availability, {"home": home, "away": away}),
+        data_limitations=_limitations(availability),
+        cta=f"Check back for the full tactical analysis of {home} vs {away}.",
+        multiverse=_multiverse(match, home, away),
+    )
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .schemas import MatchData, PlayerInfo
+
+
+@dataclass
+class TeamPassNetwork:
+    """Pass network for one team: nodes are players, links are pass sequences."""
+
+    team_id: str
+    players: List[PlayerInfo]
+    x: np.ndarray
+    y: np.ndarray
+    pass_counts: np.ndarray
+    link_src: np.ndarray
+    link_dst: np.ndarray
+    link_counts: np.ndarray
+
+    @property
+    def total_passes(self) -> int:
+        return int(self.pass_counts.sum())
+
+    @property
+    def max_link(self) -> int:
+        return int(self.link_counts.max()) if len(self.link_counts) else 1
+
+    def top_passers(self, limit: int = 3) -> List[Dict[str, Any]]:
+        order = np.argsort(-self.pass_counts, kind="stable")[:limit]
+        return [
+            {"player": self.players[i].name, "passes": int(self.pass_counts[i])}
+            for i in order
+            if self.pass_counts[i] > 0
+        ]
+
+    def strongest_links(self, limit: int = 3) -> List[Dict[str, Any]]:
+        order = np.argsort(-self.link_counts, kind="stable")[:limit]
+        return [
+            {
+                "from": self.players[self.link_src[i]].name,
+                "to": self.players[self.link_dst[i]].name,
+                "passes": int(self.link_counts[i]),
+            }
+            for i in order
+        ]
+
+
+PassNetwork = Dict[str, TeamPassNetwork]
+
+
+def _factorize(values: Sequence[Any]) -> tuple[np.ndarray, List[Any]]:
+    lookup: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (lookup.setdefault(value, len(lookup)) for value in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return codes, list(lookup)
+
+
+def compute_pass_network(match: MatchData) -> PassNetwork:
+    """Compute mean positions, pass counts and directed links for both teams."""
+    return compute_season_pass_network([match])
+
+
+def compute_season_pass_network(matches: Iterable[MatchData]) -> PassNetwork:
+    """Aggregate pass networks over many matches in one vectorized pass.
+
+    Pass sequences never link across match boundaries; positions and counts
+    are accumulated over every event of every match. Players are keyed by
+    (team, player id), so a player who changed teams mid-season appears in
+    each team's network with only the passes made for that team.
+    """
+    match_codes: List[int] = []
+    team_ids: List[str] = []
+    player_keys: List[Optional[Tuple[str, str]]] = []
+    xs: List[float] = []
+    ys: List[float] = []
+    is_pass: List[bool] = []
+    roster: Dict[Tuple[str, str], PlayerInfo] = {}
+    team_order: List[str] = []
+
+    for match_idx, match in enumerate(matches):
+        for team in match.teams:
+            if team.id not in team_order:
+                team_order.append(team.id)
+        for player in match.players:
+            roster[(player.teamId, player.id)] = player
+        for event in match.events:
+            match_codes.append(match_idx)
+            team_ids.append(event.teamId)
+            player_keys.append((event.teamId, event.playerId) if event.playerId is not None else None)
+            xs.append(event.x)
+            ys.append(event.y)
+            is_pass.append(event.type == "Pass" and event.outcome == "Complete")
+
+    team_codes, team_values = _factorize(team_ids)
+    player_codes, player_values = _factorize(player_keys)
+    n_players = len(player_values)
+    x = np.asarray(xs, dtype=float)
+    y = np.asarray(ys, dtype=float)
+    pass_mask = np.asarray(is_pass, dtype=bool)
+    match_arr = np.asarray(match_codes, dtype=np.int64)
+
+    # Mean positions over every event a player was involved in.
+    event_counts = np.bincount(player_codes, minlength=n_players)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = np.bincount(player_codes, weights=x, minlength=n_players) / event_counts
+        mean_y = np.bincount(player_codes, weights=y, minlength=n_players) / event_counts
+
+    # Completed passes, grouped by (match, team) while keeping event order.
+    pass_idx = np.flatnonzero(pass_mask)
+    group = match_arr[pass_idx] * max(len(team_values), 1) + team_codes[pass_idx]
+    order = np.argsort(group, kind="stable")
+    pass_idx = pass_idx[order]
+    group = group[order]
+    pass_team = team_codes[pass_idx]
+    pass_player = player_codes[pass_idx]
+
+    null_code = player_values.index(None) if None in player_values else -1
+    src = pass_player[:-1]
+    dst = pass_player[1:]
+    link_mask = (group[:-1] == group[1:]) & (src != dst) & (src != null_code) & (dst != null_code)
+    link_team = pass_team[:-1][link_mask]
+    stride = max(n_players, 1)
+    link_keys = (link_team * stride + src[link_mask]) * stride + dst[link_mask]
+    unique_keys, unique_counts = np.unique(link_keys, return_counts=True)
+    key_team, key_rest = np.divmod(unique_keys, stride * stride)
+    key_src, key_dst = np.divmod(key_rest, stride)
+
+    code_of = {player_key: code for code, player_key in enumerate(player_values)}
+    networks: PassNetwork = {}
+    for team_id in team_order:
+        team_code = team_values.index(team_id) if team_id in team_values else -1
+        node_codes = [code_of[key] for key in roster if key[0] == team_id and key in code_of]
+        node_arr = np.asarray(node_codes, dtype=np.int64)
+        local_index = np.full(stride, -1, dtype=np.int64)
+        local_index[node_arr] = np.arange(len(node_arr))
+
+        team_passes = pass_player[pass_team == team_code]
+        pass_counts = np.bincount(team_passes, minlength=n_players)[node_arr]
+
+        in_team = key_team == team_code
+        local_src = local_index[key_src[in_team]]
+        local_dst = local_index[key_dst[in_team]]
+        keep = (local_src >= 0) & (local_dst >= 0)
+
+        networks[team_id] = TeamPassNetwork(
+            team_id=team_id,
+            players=[roster[player_values[code]] for code in node_codes],
+            x=mean_x[node_arr],
+            y=mean_y[node_arr],
+            pass_counts=pass_counts,
+            link_src=local_src[keep],
+            link_dst=local_dst[keep],
+            link_counts=unique_counts[in_team][keep],
+        )
+
+    return networks
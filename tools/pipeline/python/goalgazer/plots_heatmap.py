@@ -1,27 +1,95 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Optional
 import matplotlib.pyplot as plt
 from mplsoccer import Pitch
 import numpy as np
 
+from .config import settings
 from .schemas import MatchData, FigureMeta
 from .figure_paths import build_src_relative
+from .chart_specs import build_heatmap_spec, resolve_output, wants_spec, write_chart_spec
 
+# Half-metre cells on the 120x80 statsbomb pitch; sigma is in cells.
+GRID_BINS = (240, 160)
+GRID_SIGMA = 8.0
 
-def render_touch_heatmap(match: MatchData, team_side: str, out_path: Path) -> FigureMeta:
-    team = next(team for team in match.teams if team.side == team_side)
+
+def _gaussian_kernel_matrix(size: int, sigma: float) -> np.ndarray:
+    offsets = np.arange(size)
+    kernel = np.exp(-0.5 * ((offsets[:, None] - offsets[None, :]) / sigma) ** 2)
+    return kernel / kernel.sum(axis=0, keepdims=True)
+
+
+def _grid_density(xs: np.ndarray, ys: np.ndarray, pitch: Pitch, sigma: float = GRID_SIGMA) -> np.ndarray:
+    """Binned 2D histogram smoothed by a separable Gaussian; returns (y, x) grid."""
+    counts, _, _ = np.histogram2d(
+        xs,
+        ys,
+        bins=GRID_BINS,
+        range=[
+            sorted((pitch.dim.left, pitch.dim.right)),
+            sorted((pitch.dim.bottom, pitch.dim.top)),
+        ],
+    )
+    smoothed = _gaussian_kernel_matrix(GRID_BINS[0], sigma) @ counts @ _gaussian_kernel_matrix(GRID_BINS[1], sigma).T
+    return smoothed.T
+
+
+def _draw_grid_heatmap(ax, pitch: Pitch, xs: np.ndarray, ys: np.ndarray) -> None:
+    density = _grid_density(xs, ys, pitch)
+    peak = density.max()
+    if peak <= 0:
+        return
+    ax.imshow(
+        np.ma.masked_less(density / peak, 0.05),
+        extent=(pitch.dim.left, pitch.dim.right, pitch.dim.bottom, pitch.dim.top),
+        origin="upper",
+        cmap="Reds",
+        alpha=0.6,
+        interpolation="nearest",
+        aspect="auto",
+        zorder=1,
+    )
+
+
+def render_touch_heatmap(
+    match: MatchData,
+    team_side: str,
+    out_path: Path,
+    engine: Optional[str] = None,
+    output: Optional[str] = None,
+) -> FigureMeta:
+    """Render a touch heatmap for ``home``, ``away`` or ``both`` teams.
+
+    ``engine`` is ``grid`` (histogram + Gaussian blur, linear in events) or
+    ``kde`` (seaborn contour KDE); it defaults to ``settings.heatmap_engine``.
+    """
+    engine = engine or settings.heatmap_engine
+    output = resolve_output(output)
+    spec_relative = write_chart_spec(build_heatmap_spec(match, team_side), out_path) if wants_spec(output) else None
+    if team_side == "both":
+        team_ids = {team.id for team in match.teams}
+        team_name = f"{match.match.homeTeam['name']} & {match.match.awayTeam['name']}"
+    else:
+        team = next(team for team in match.teams if team.side == team_side)
+        team_ids = {team.id}
+        team_name = team.name
     pitch = Pitch(pitch_type="statsbomb", pitch_color="#f8fafc", line_color="#1f2937")
     fig, ax = pitch.draw(figsize=(12, 8))
 
-    events = [event for event in match.events if event.teamId == team.id]
+    events = [event for event in match.events if event.teamId in team_ids]
     xs = np.array([event.x for event in events])
     ys = np.array([event.y for event in events])
 
-    if len(xs) > 1:
-        pitch.kdeplot(xs, ys, ax=ax, cmap="Reds", fill=True, alpha=0.6, levels=20)
+    if engine == "kde":
+        if len(xs) > 1:
+            pitch.kdeplot(xs, ys, ax=ax, cmap="Reds", fill=True, alpha=0.6, levels=20)
+    elif len(xs) > 0:
+        _draw_grid_heatmap(ax, pitch, xs, ys)
 
-    ax.set_title(f"{team.name} Touch Heatmap", fontsize=12)
+    ax.set_title(f"{team_name} Touch Heatmap", fontsize=12)
     fig.tight_layout()
     out_path.parent.mkdir(parents=True, exist_ok=True)
     fig.savefig(out_path, dpi=200)
@@ -30,9 +98,10 @@ def render_touch_heatmap(match: MatchData, team_side: str, out_path: Path) -> Fi
     return FigureMeta(
         id=f"touch_heatmap_{team_side}",
         src_relative=build_src_relative(out_path),
-        alt=f"Touch heatmap for {team.name}.",
-        caption=f"Touch heatmap for {team.name} across all events.",
+        alt=f"Touch heatmap for {team_name}.",
+        caption=f"Touch heatmap for {team_name} across all events.",
         width=1600,
         height=1000,
         kind="other",
+        spec_relative=spec_relative,
     )
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.patches import Patch
+
+from .config import settings
+from .schemas import MatchData, FigureMeta
+from .figure_paths import build_src_relative
+from .chart_specs import (
+    AWAY_COLOR,
+    GOAL_COLOR,
+    HOME_COLOR,
+    SHOT_DEFAULT_COLOR,
+    SHOT_OUTCOME_COLORS,
+    SPEC_VERSION,
+    build_shot_map_spec,
+    build_stats_comparison_spec,
+    build_timeline_spec,
+    resolve_output,
+    wants_png,
+    wants_spec,
+    write_chart_spec,
+)
+
+PITCH_GREEN = "#1e7a46"
+MATCHWEEK_KINDS = ("results", "shot_maps", "stats", "timelines")
+COMPACT_STATS = [
+    ("Possession", "possession"),
+    ("Shots", "total_shots"),
+    ("On Target", "shots_on_target"),
+    ("Corners", "corners"),
+]
+
+
+def _panel_title(match: MatchData) -> str:
+    score = match.match.score or {}
+    return (
+        f"{match.match.homeTeam['name']} {score.get('home', '-')}"
+        f" - {score.get('away', '-')} {match.match.awayTeam['name']}"
+    )
+
+
+def _grid(n_panels: int, panel_size: tuple[float, float], ncols: int):
+    ncols = max(1, min(ncols, n_panels))
+    nrows = max(1, math.ceil(n_panels / ncols))
+    fig, axes = plt.subplots(
+        nrows,
+        ncols,
+        figsize=(panel_size[0] * ncols, panel_size[1] * nrows),
+        facecolor=PITCH_GREEN,
+        squeeze=False,
+    )
+    flat = axes.ravel()
+    for ax in flat[n_panels:]:
+        ax.set_visible(False)
+    return fig, flat[:n_panels]
+
+
+def _draw_shot_maps(matches: Sequence[MatchData], ncols: int):
+    from mplsoccer import Pitch
+
+    # One pitch template drives every panel.
+    pitch = Pitch(pitch_type="statsbomb", pitch_color=PITCH_GREEN, line_color="#ffffff", linewidth=1)
+    fig, axes = _grid(len(matches), (4.5, 3.4), ncols)
+    for ax, match in zip(axes, matches):
+        pitch.draw(ax=ax)
+        shots = [event for event in match.events if event.type == "Shot"]
+        if shots:
+            xs = np.array([shot.x for shot in shots], dtype=float)
+            ys = np.array([shot.y for shot in shots], dtype=float)
+            pitch.scatter(
+                xs, ys,
+                s=np.maximum(20, 80 - np.hypot(100 - xs, 50 - ys)),
+                c=[SHOT_OUTCOME_COLORS.get(shot.outcome or "Unknown", SHOT_DEFAULT_COLOR) for shot in shots],
+                edgecolor="white",
+                linewidth=0.8,
+                alpha=0.85,
+                ax=ax,
+                zorder=2,
+            )
+        ax.set_title(_panel_title(match), fontsize=9, fontweight="bold", color="white")
+    fig.legend(
+        handles=[
+            Patch(facecolor=SHOT_OUTCOME_COLORS["Goal"], edgecolor="white", label="Goal"),
+            Patch(facecolor=SHOT_OUTCOME_COLORS["Saved"], edgecolor="white", label="Saved"),
+            Patch(facecolor=SHOT_OUTCOME_COLORS["Miss"], edgecolor="white", label="Miss/Off Target"),
+            Patch(facecolor=SHOT_OUTCOME_COLORS["Blocked"], edgecolor="white", label="Blocked"),
+        ],
+        loc="lower center",
+        ncol=4,
+        framealpha=0.9,
+    )
+    return fig
+
+
+def _draw_stats(matches: Sequence[MatchData], ncols: int):
+    fig, axes = _grid(len(matches), (4.5, 2.6), ncols)
+    labels = [label for label, _ in COMPACT_STATS]
+    y = np.arange(len(labels))
+    for ax, match in zip(axes, matches):
+        home_team = next(t for t in match.teams if t.side == "home")
+        away_team = next(t for t in match.teams if t.side == "away")
+        normalized = match.aggregates.normalized or {}
+        home_vals = np.array([normalized.get(home_team.id, {}).get(key) or 0 for _, key in COMPACT_STATS], dtype=float)
+        away_vals = np.array([normalized.get(away_team.id, {}).get(key) or 0 for _, key in COMPACT_STATS], dtype=float)
+        # Diverging bars share one scale per row so metrics stay comparable.
+        totals = np.maximum(home_vals + away_vals, 1)
+        ax.barh(y, -home_vals / totals, color=HOME_COLOR, edgecolor="white", linewidth=0.5)
+        ax.barh(y, away_vals / totals, color=AWAY_COLOR, edgecolor="white", linewidth=0.5)
+        for row, (home_val, away_val) in enumerate(zip(home_vals, away_vals)):
+            ax.text(-1.02, row, f"{home_val:g}", ha="right", va="center", color="white", fontsize=8)
+            ax.text(1.02, row, f"{away_val:g}", ha="left", va="center", color="white", fontsize=8)
+        ax.set_xlim(-1.25, 1.25)
+        ax.set_yticks(y)
+        ax.set_yticklabels(labels, color="white", fontsize=8)
+        ax.set_xticks([])
+        ax.axvline(0, color="white", linewidth=0.8)
+        ax.set_facecolor(PITCH_GREEN)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        ax.set_title(_panel_title(match), fontsize=9, fontweight="bold", color="white")
+    return fig
+
+
+def _draw_timelines(matches: Sequence[MatchData], ncols: int):
+    fig, axes = _grid(len(matches), (4.5, 1.6), ncols)
+    for ax, match in zip(axes, matches):
+        home_team_id = next(t.id for t in match.teams if t.side == "home")
+        events = [event for event in match.timeline if event.type in ("goal", "card")]
+        max_minute = max([90] + [event.minute for event in match.timeline])
+        ax.axhline(0, color="white", linewidth=1.5, zorder=1)
+        if events:
+            minutes = np.array([event.minute for event in events], dtype=float)
+            sides = np.array([1.0 if event.teamId == home_team_id else -1.0 for event in events])
+            colors = [
+                GOAL_COLOR if event.type == "goal"
+                else ("#dc2626" if event.detail and "Red" in event.detail else "#facc15")
+                for event in events
+            ]
+            markers = np.array([event.type == "goal" for event in events])
+            ax.scatter(minutes[markers], sides[markers] * 0.5, s=60, c=[c for c, m in zip(colors, markers) if m],
+                       marker="o", edgecolor="white", linewidth=0.8, zorder=3)
+            ax.scatter(minutes[~markers], sides[~markers] * 0.5, s=40, c=[c for c, m in zip(colors, markers) if not m],
+                       marker="s", edgecolor="white", linewidth=0.5, zorder=3)
+        ax.set_xlim(0, max_minute + 2)
+        ax.set_ylim(-1, 1)
+        ax.set_xticks([0, 45, 90])
+        ax.tick_params(axis="x", colors="white", labelsize=7)
+        ax.set_yticks([0.5, -0.5])
+        ax.set_yticklabels(["H", "A"], color="white", fontsize=7)
+        ax.set_facecolor(PITCH_GREEN)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        ax.set_title(_panel_title(match), fontsize=9, fontweight="bold", color="white")
+    return fig
+
+
+def _draw_results(matches: Sequence[MatchData], ncols: int):
+    fig, axes = _grid(len(matches), (3.6, 1.1), ncols)
+    for ax, match in zip(axes, matches):
+        score = match.match.score or {}
+        ax.set_facecolor("#14532d")
+        ax.set_xticks([])
+        ax.set_yticks([])
+        for spine in ax.spines.values():
+            spine.set_color("white")
+        ax.text(0.05, 0.5, match.match.homeTeam["name"], ha="left", va="center", color="white", fontsize=9, transform=ax.transAxes)
+        ax.text(0.95, 0.5, match.match.awayTeam["name"], ha="right", va="center", color="white", fontsize=9, transform=ax.transAxes)
+        ax.text(0.5, 0.5, f"{score.get('home', '-')} - {score.get('away', '-')}", ha="center", va="center",
+                color=GOAL_COLOR, fontsize=12, fontweight="bold", transform=ax.transAxes)
+    return fig
+
+
+_DRAWERS: Dict[str, Callable[[Sequence[MatchData], int], object]] = {
+    "results": _draw_results,
+    "shot_maps": _draw_shot_maps,
+    "stats": _draw_stats,
+    "timelines": _draw_timelines,
+}
+
+_PANEL_SPECS: Dict[str, Callable[[MatchData], Dict]] = {
+    "results": lambda match: {"title": _panel_title(match), "score": match.match.score},
+    "shot_maps": build_shot_map_spec,
+    "stats": build_stats_comparison_spec,
+    "timelines": build_timeline_spec,
+}
+
+_LABELS = {
+    "results": "Results",
+    "shot_maps": "Shot maps",
+    "stats": "Team stats",
+    "timelines": "Key-event timelines",
+}
+
+
+def render_matchweek_figures(
+    matches: Sequence[MatchData],
+    out_dir: Path,
+    title: str,
+    kinds: Sequence[str] = MATCHWEEK_KINDS,
+    ncols: int = 3,
+    output: Optional[str] = None,
+) -> List[FigureMeta]:
+    """Render small-multiple grids for many matches in one figure session.
+
+    Each kind produces a single figure containing one panel per match, so a
+    digest needs one savefig per kind instead of one per match and chart.
+    """
+    output = resolve_output(output)
+    figures: List[FigureMeta] = []
+    matches = list(matches)
+    if not matches:
+        return figures
+    for kind in kinds:
+        out_path = out_dir / f"matchweek_{kind}.png"
+        spec_relative = None
+        if wants_spec(output):
+            spec = {
+                "version": SPEC_VERSION,
+                "id": f"matchweek_{kind}",
+                "type": "small_multiples",
+                "title": title,
+                "panels": [_PANEL_SPECS[kind](match) for match in matches],
+            }
+            spec_relative = write_chart_spec(spec, out_path)
+
+        width, height = 1200, 800
+        if wants_png(output):
+            fig = _DRAWERS[kind](matches, ncols)
+            fig.suptitle(f"{title} — {_LABELS[kind]}", fontsize=16, fontweight="bold", color="white")
+            fig.tight_layout(rect=(0, 0.04 if kind == "shot_maps" else 0, 1, 0.96))
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            fig.savefig(out_path, dpi=150, facecolor=PITCH_GREEN)
+            width, height = (fig.get_size_inches() * 150).astype(int)
+            plt.close(fig)
+
+        figures.append(
+            FigureMeta(
+                id=f"matchweek_{kind}",
+                src_relative=build_src_relative(out_path) if wants_png(output) else None,
+                alt=f"{_LABELS[kind]} for {len(matches)} matches: {title}.",
+                caption=f"{_LABELS[kind]} across {len(matches)} matches.",
+                width=int(width),
+                height=int(height),
+                kind="other",
+                spec_relative=spec_relative,
+            )
+        )
+    return figures
+
+
+def _load_match(match_id: str) -> MatchData:
+    from .normalize import load_mock_match, normalize_api_payload
+
+    if not settings.api_football_key:
+        return load_mock_match(match_id)
+    from .fetch_api_football import fetch_events, fetch_fixture, fetch_lineups, fetch_players, fetch_stats
+
+    return normalize_api_payload(
+        fetch_fixture(match_id),
+        fetch_events(match_id),
+        fetch_lineups(match_id),
+        fetch_stats(match_id),
+        fetch_players(match_id),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render matchweek composite figures")
+    parser.add_argument("--matchIds", nargs="+", required=True)
+    parser.add_argument("--key", required=True, help="Output folder name, e.g. 2025-10-18_epl")
+    parser.add_argument("--title", default="Matchweek")
+    parser.add_argument("--kinds", nargs="+", choices=MATCHWEEK_KINDS, default=list(MATCHWEEK_KINDS))
+    parser.add_argument("--cols", type=int, default=3)
+    args = parser.parse_args()
+
+    matches = [_load_match(match_id) for match_id in args.matchIds]
+    figures = render_matchweek_figures(
+        matches,
+        settings.figure_output_base_dir / "matchweeks" / args.key,
+        args.title,
+        kinds=args.kinds,
+        ncols=args.cols,
+    )
+    print(json.dumps([figure.model_dump() for figure in figures]))
+
+
+if __name__ == "__main__":
+    main()
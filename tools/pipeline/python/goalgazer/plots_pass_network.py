@@ -1,40 +1,38 @@
 from __future__ import annotations
 
 from pathlib import Path
-from collections import Counter
-from typing import Tuple
+from typing import Optional
 
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Patch
 from mplsoccer import Pitch
 
 from .schemas import MatchData, FigureMeta
 from .figure_paths import build_src_relative
+from .pass_network import PassNetwork, compute_pass_network
+from .chart_specs import build_pass_network_spec, resolve_output, wants_spec, write_chart_spec
 
 
-def _compute_pass_links(match: MatchData, team_id: str) -> Tuple[Counter, Counter]:
-    passes = [event for event in match.events if event.type == "Pass" and event.teamId == team_id and event.outcome == "Complete"]
-    player_positions = {}
-    player_counts = Counter()
-    link_counts = Counter()
-
-    for event in passes:
-        player_counts[event.playerId] += 1
-        if event.playerId not in player_positions:
-            player_positions[event.playerId] = []
-        player_positions[event.playerId].append((event.x, event.y))
-
-    for i in range(len(passes) - 1):
-        src = passes[i].playerId
-        dst = passes[i + 1].playerId
-        if src and dst and src != dst:
-            link_counts[(src, dst)] += 1
-
-    return player_counts, link_counts
-
-
-def render_pass_network(match: MatchData, team_side: str, out_path: Path) -> FigureMeta:
+def render_pass_network(
+    match: MatchData,
+    team_side: str,
+    out_path: Path,
+    network: Optional[PassNetwork] = None,
+    output: Optional[str] = None,
+) -> FigureMeta:
     team = next(team for team in match.teams if team.side == team_side)
-    player_counts, link_counts = _compute_pass_links(match, team.id)
+    if network is None:
+        network = compute_pass_network(match)
+    team_network = network[team.id]
+    output = resolve_output(output)
+    spec_relative = (
+        write_chart_spec(build_pass_network_spec(match, team_side, team_network), out_path)
+        if wants_spec(output)
+        else None
+    )
 
     # Use professional grass green pitch
     pitch = Pitch(
@@ -49,57 +47,45 @@ def render_pass_network(match: MatchData, team_side: str, out_path: Path) -> Fig
     # Add subtle grass texture effect
     ax.set_facecolor("#1e7a46")
 
-    # Get players for this team and calculate average positions
-    players = [player for player in match.players if player.teamId == team.id]
-    player_positions = {}
-    
-    for player in players:
-        events = [event for event in match.events if event.playerId == player.id]
-        if events:
-            xs = [event.x for event in events]
-            ys = [event.y for event in events]
-            x_mean = sum(xs) / len(xs)
-            y_mean = sum(ys) / len(ys)
-            player_positions[player.id] = (x_mean, y_mean, player)
-    
-    # Draw pass links first (behind players)
-    max_link = max(link_counts.values()) if link_counts else 1
-    for (src, dst), count in link_counts.items():
-        if src in player_positions and dst in player_positions:
-            src_x, src_y, _ = player_positions[src]
-            dst_x, dst_y, _ = player_positions[dst]
-            
-            # Thicker, more visible lines
-            pitch.lines(
-                src_x, src_y, dst_x, dst_y,
-                ax=ax,
-                color="#ffffff",
-                lw=1 + (count / max_link) * 5,
-                alpha=0.4 + (count / max_link) * 0.5,
-                zorder=1
-            )
-    
-    # Draw players with formation positions
-    for player_id, (x_mean, y_mean, player) in player_positions.items():
-        pass_count = player_counts.get(player_id, 0)
-        
-        # Size based on pass involvement
-        size = max(200, min(600, 200 + pass_count * 20))
-        
-        # Player marker - white circle with team color border
-        team_color = "#3b82f6" if team_side == "home" else "#ef4444"
-        
-        pitch.scatter(
-            x_mean, y_mean, 
-            s=size, 
-            ax=ax, 
-            color="#ffffff",
-            edgecolor=team_color,
-            linewidth=3,
-            alpha=0.95,
-            zorder=3
+    # Draw pass links first (behind players) as a single collection
+    weight = team_network.link_counts / team_network.max_link
+    segments = np.stack(
+        [
+            np.column_stack([team_network.x[team_network.link_src], team_network.y[team_network.link_src]]),
+            np.column_stack([team_network.x[team_network.link_dst], team_network.y[team_network.link_dst]]),
+        ],
+        axis=1,
+    ).reshape(-1, 2, 2)
+    link_colors = np.tile(to_rgba("#ffffff"), (len(weight), 1))
+    link_colors[:, 3] = 0.4 + weight * 0.5
+    ax.add_collection(
+        LineCollection(
+            segments,
+            colors=link_colors,
+            linewidths=1 + weight * 5,
+            capstyle="round",
+            zorder=1,
         )
-        
+    )
+
+    # Player marker - white circle with team color border
+    team_color = "#3b82f6" if team_side == "home" else "#ef4444"
+
+    # Draw all players in one scatter, sized by pass involvement
+    sizes = np.clip(200 + team_network.pass_counts * 20, 200, 600)
+    pitch.scatter(
+        team_network.x, team_network.y,
+        s=sizes,
+        ax=ax,
+        color="#ffffff",
+        edgecolor=team_color,
+        linewidth=3,
+        alpha=0.95,
+        zorder=3
+    )
+
+    # Labels stay per player; their count is bounded by the squad, not by events
+    for player, x_mean, y_mean in zip(team_network.players, team_network.x, team_network.y):
         # Player name - split to get last name or first word
         name_parts = player.name.split(" ")
         display_name = name_parts[-1] if len(name_parts) > 1 else player.name
@@ -134,7 +120,6 @@ def render_pass_network(match: MatchData, team_side: str, out_path: Path) -> Fig
     ax.set_title(title, fontsize=14, fontweight="bold", color="#1e7a46", pad=20)
     
     # Add legend
-    from matplotlib.patches import Patch
     legend_elements = [
         Patch(facecolor='#ffffff', edgecolor=team_color, linewidth=2, label=f'{team.name} Players'),
         Patch(facecolor='none', edgecolor='#ffffff', linewidth=3, label='Pass Connections')
@@ -154,4 +139,5 @@ def render_pass_network(match: MatchData, team_side: str, out_path: Path) -> Fig
         width=1600,
         height=1000,
         kind="pass_network",
+        spec_relative=spec_relative,
     )
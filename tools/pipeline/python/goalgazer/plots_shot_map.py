@@ -1,22 +1,33 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
-import math
-import matplotlib.pyplot as plt
-from mplsoccer import Pitch
-from matplotlib.patches import Patch
+from typing import Optional
 
 from .schemas import MatchData, FigureMeta
 from .figure_paths import build_src_relative
+from .chart_specs import (
+    SHOT_DEFAULT_COLOR,
+    SHOT_OUTCOME_COLORS,
+    build_shot_map_spec,
+    build_shot_proxy_spec,
+    resolve_output,
+    shot_sizes,
+    wants_png,
+    wants_spec,
+    write_chart_spec,
+)
+
+
+def render_shot_map(match: MatchData, out_path: Path, output: Optional[str] = None) -> FigureMeta:
+    # matplotlib/mplsoccer pull in seaborn/scipy; keep them off the render_shot_proxy path.
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from matplotlib.patches import Patch
+    from mplsoccer import Pitch
+
+    output = resolve_output(output)
+    spec_relative = write_chart_spec(build_shot_map_spec(match), out_path) if wants_spec(output) else None
 
-
-def _shot_size(shot_x: float, shot_y: float) -> float:
-    distance = math.hypot(100 - shot_x, 50 - shot_y)
-    return max(80, 320 - distance * 3)
-
-
-def render_shot_map(match: MatchData, out_path: Path) -> FigureMeta:
     # Professional grass green pitch
     pitch = Pitch(
         pitch_type="statsbomb", 
@@ -29,26 +40,17 @@ def render_shot_map(match: MatchData, out_path: Path) -> FigureMeta:
     shots = [event for event in match.events if event.type == "Shot"]
     
     # Enhanced color scheme for outcomes
-    colors = {
-        "Goal": "#fbbf24",      # Gold for goals
-        "Miss": "#ef4444",      # Red for misses
-        "Saved": "#3b82f6",     # Blue for saves
-        "Blocked": "#f97316",   # Orange for blocks
-        "Off Target": "#ef4444",
-        "Woodwork": "#a855f7",  # Purple for hitting the post
-    }
-
-    for shot in shots:
-        x = shot.x
-        y = shot.y
-        size = _shot_size(x, y)
-        outcome = shot.outcome or "Unknown"
-        
+    colors = SHOT_OUTCOME_COLORS
+
+    # One scatter for every shot, with per-point sizes and colors
+    xs = np.array([shot.x for shot in shots], dtype=float)
+    ys = np.array([shot.y for shot in shots], dtype=float)
+    if len(shots):
         pitch.scatter(
-            x, y,
-            s=size,
+            xs, ys,
+            s=shot_sizes(xs, ys),
             ax=ax,
-            color=colors.get(outcome, "#6b7280"),
+            c=[colors.get(shot.outcome or "Unknown", SHOT_DEFAULT_COLOR) for shot in shots],
             edgecolor="white",
             linewidth=2,
             alpha=0.85,
@@ -81,20 +83,36 @@ def render_shot_map(match: MatchData, out_path: Path) -> FigureMeta:
         width=1600,
         height=1000,
         kind="other",
+        spec_relative=spec_relative,
     )
 
 
-def render_shot_proxy(match: MatchData, out_path: Path) -> FigureMeta:
+def render_shot_proxy(match: MatchData, out_path: Path, output: Optional[str] = None) -> FigureMeta:
     """Render a shot proxy chart based on team aggregates."""
+    output = resolve_output(output)
+    spec = build_shot_proxy_spec(match)
+    spec_relative = write_chart_spec(spec, out_path) if wants_spec(output) else None
     home_team = next(t for t in match.teams if t.side == "home")
     away_team = next(t for t in match.teams if t.side == "away")
+    figure_meta = FigureMeta(
+        id="shot_proxy",
+        src_relative=build_src_relative(out_path) if wants_png(output) else None,
+        alt=f"Shot proxy chart comparing {home_team.name} and {away_team.name} total shots and shots on target.",
+        caption="Comparison of total attempts and shots on target between both teams.",
+        width=1200,
+        height=800,
+        kind="shot_proxy",
+        spec_relative=spec_relative,
+    )
+    if not wants_png(output):
+        return figure_meta
 
-    h_stats = match.aggregates.normalized.get(home_team.id, {}) if match.aggregates.normalized else {}
-    a_stats = match.aggregates.normalized.get(away_team.id, {}) if match.aggregates.normalized else {}
+    import matplotlib.pyplot as plt
 
-    labels = ["Total Shots", "Shots on Target"]
-    home_vals = [h_stats.get("total_shots", 0) or 0, h_stats.get("shots_on_target", 0) or 0]
-    away_vals = [a_stats.get("total_shots", 0) or 0, a_stats.get("shots_on_target", 0) or 0]
+    labels = spec["categories"]
+    home_series, away_series = spec["series"]
+    home_vals = home_series["values"]
+    away_vals = away_series["values"]
 
     x = range(len(labels))
     width = 0.35
@@ -102,8 +120,8 @@ def render_shot_proxy(match: MatchData, out_path: Path) -> FigureMeta:
     fig, ax = plt.subplots(figsize=(12, 8), facecolor="#1e7a46")
     ax.set_facecolor("#1e7a46")
 
-    ax.bar([i - width / 2 for i in x], home_vals, width, label=home_team.name, color="#3b82f6", edgecolor="white")
-    ax.bar([i + width / 2 for i in x], away_vals, width, label=away_team.name, color="#ef4444", edgecolor="white")
+    ax.bar([i - width / 2 for i in x], home_vals, width, label=home_series["name"], color=home_series["color"], edgecolor="white")
+    ax.bar([i + width / 2 for i in x], away_vals, width, label=away_series["name"], color=away_series["color"], edgecolor="white")
 
     ax.set_xticks(list(x))
     ax.set_xticklabels(labels, color="white", fontsize=12, fontweight="bold")
@@ -130,12 +148,4 @@ def render_shot_proxy(match: MatchData, out_path: Path) -> FigureMeta:
     fig.savefig(out_path, dpi=200, facecolor="#1e7a46")
     plt.close(fig)
 
-    return FigureMeta(
-        id="shot_proxy",
-        src_relative=build_src_relative(out_path),
-        alt=f"Shot proxy chart comparing {home_team.name} and {away_team.name} total shots and shots on target.",
-        caption="Comparison of total attempts and shots on target between both teams.",
-        width=1200,
-        height=800,
-        kind="shot_proxy",
-    )
+    return figure_meta
@@ -1,32 +1,39 @@
 from __future__ import annotations
 
-import numpy as np
 from pathlib import Path
-import matplotlib.pyplot as plt
+from typing import Optional
 from .schemas import MatchData, FigureMeta
 from .figure_paths import build_src_relative
+from .chart_specs import build_stats_comparison_spec, resolve_output, wants_png, wants_spec, write_chart_spec
 
-def render_stats_comparison(match: MatchData, out_path: Path) -> FigureMeta:
+def render_stats_comparison(match: MatchData, out_path: Path, output: Optional[str] = None) -> FigureMeta:
     """Render a bar chart comparing key team statistics."""
-    # Data preparation
+    output = resolve_output(output)
+    spec = build_stats_comparison_spec(match)
+    spec_relative = write_chart_spec(spec, out_path) if wants_spec(output) else None
     home_team = next(t for t in match.teams if t.side == "home")
     away_team = next(t for t in match.teams if t.side == "away")
-    
-    h_stats = match.aggregates.normalized.get(home_team.id, {})
-    a_stats = match.aggregates.normalized.get(away_team.id, {})
-    
-    metrics = [
-        ("Possession (%)", "possession"),
-        ("Total Shots", "total_shots"),
-        ("Shots on Target", "shots_on_target"),
-        ("Pass Accuracy (%)", "pass_accuracy"),
-        ("Corners", "corners"),
-        ("Fouls", "fouls")
-    ]
-    
-    labels = [m[0] for m in metrics]
-    home_vals = [h_stats.get(m[1], 0) or 0 for m in metrics]
-    away_vals = [a_stats.get(m[1], 0) or 0 for m in metrics]
+    figure_meta = FigureMeta(
+        id="stats_comparison",
+        src_relative=build_src_relative(out_path) if wants_png(output) else None,
+        alt=f"Statistical comparison between {home_team.name} and {away_team.name}.",
+        caption="Comparison of core team metrics including possession, shots, and accuracy.",
+        width=1600,
+        height=1000,
+        kind="stats_comparison",
+        spec_relative=spec_relative,
+    )
+    if not wants_png(output):
+        return figure_meta
+
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    # Data preparation
+    labels = spec["categories"]
+    home_series, away_series = spec["series"]
+    home_vals = home_series["values"]
+    away_vals = away_series["values"]
     
     y = np.arange(len(labels))
     width = 0.35
@@ -35,8 +42,8 @@ def render_stats_comparison(match: MatchData, out_path: Path) -> FigureMeta:
     ax.set_facecolor('#1e7a46')
     
     # Horizontal bars
-    rects1 = ax.barh(y + width/2, home_vals, width, label=home_team.name, color='#3b82f6', edgecolor='white', linewidth=1)
-    rects2 = ax.barh(y - width/2, away_vals, width, label=away_team.name, color='#ef4444', edgecolor='white', linewidth=1)
+    rects1 = ax.barh(y + width/2, home_vals, width, label=home_series["name"], color=home_series["color"], edgecolor='white', linewidth=1)
+    rects2 = ax.barh(y - width/2, away_vals, width, label=away_series["name"], color=away_series["color"], edgecolor='white', linewidth=1)
     
     # Styling
     ax.set_yticks(y)
@@ -69,12 +76,4 @@ def render_stats_comparison(match: MatchData, out_path: Path) -> FigureMeta:
     fig.savefig(out_path, dpi=200, facecolor='#1e7a46')
     plt.close(fig)
 
-    return FigureMeta(
-        id="stats_comparison",
-        src_relative=build_src_relative(out_path),
-        alt=f"Statistical comparison between {home_team.name} and {away_team.name}.",
-        caption="Comparison of core team metrics including possession, shots, and accuracy.",
-        width=1600,
-        height=1000,
-        kind="stats_comparison",
-    )
+    return figure_meta
@@ -1,12 +1,30 @@
 from __future__ import annotations
 
 from pathlib import Path
-import matplotlib.pyplot as plt
+from typing import Optional
 from .schemas import MatchData, FigureMeta
 from .figure_paths import build_src_relative
+from .chart_specs import build_timeline_spec, resolve_output, wants_png, wants_spec, write_chart_spec
 
-def render_match_timeline(match: MatchData, out_path: Path) -> FigureMeta:
+def render_match_timeline(match: MatchData, out_path: Path, output: Optional[str] = None) -> FigureMeta:
     """Render a vertical timeline of key match events."""
+    output = resolve_output(output)
+    spec_relative = write_chart_spec(build_timeline_spec(match), out_path) if wants_spec(output) else None
+    figure_meta = FigureMeta(
+        id="timeline",
+        src_relative=build_src_relative(out_path) if wants_png(output) else None,
+        alt=f"Vertical timeline of match events for {match.match.homeTeam['name']} vs {match.match.awayTeam['name']}.",
+        caption="Match timeline showing goals, cards, and substitutions.",
+        width=1200,
+        height=1600,
+        kind="timeline",
+        spec_relative=spec_relative,
+    )
+    if not wants_png(output):
+        return figure_meta
+
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(12, 16), facecolor='#1e7a46')
     ax.set_facecolor('#1e7a46')
     
@@ -65,12 +83,4 @@ def render_match_timeline(match: MatchData, out_path: Path) -> FigureMeta:
     fig.savefig(out_path, dpi=200, facecolor='#1e7a46')
     plt.close(fig)
 
-    return FigureMeta(
-        id="timeline",
-        src_relative=build_src_relative(out_path),
-        alt=f"Vertical timeline of match events for {match.match.homeTeam['name']} vs {match.match.awayTeam['name']}.",
-        caption="Match timeline showing goals, cards, and substitutions.",
-        width=1200,
-        height=1600,
-        kind="timeline",
-    )
+    return figure_meta
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .evidence import EvidenceCatalog
+from .schemas import MatchData
+
+# Compact encoding of the evidence catalog for the LLM prompt. Each row groups
+# the catalog paths that share a prefix, e.g.
+#   "team_stats.normalized.50": {"possession": 58, "total_shots": 15}
+# and the model cites "<row>.<field>=<value>". Players, timeline and
+# normalized team stats are sent only through these rows.
+
+CHARS_PER_TOKEN = 4
+
+# Lower tier = dropped first when the prompt is over budget.
+TIER_UNUSED_PLAYER = 0
+TIER_MINOR_EVENT = 1
+TIER_PLAYER = 2
+TIER_FIGURE_SUMMARY = 3
+TIER_ROSTER = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count; good enough for budgeting without a tokenizer."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _drop_none(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def evidence_rows(catalog: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Group ``catalog`` paths by everything before the last dot, keeping order.
+
+    Null values carry no citable fact and are left out. Always a fresh dict:
+    fit_to_budget trims it in place, and the catalog is shared with repair
+    and retry prompts.
+    """
+    if isinstance(catalog, EvidenceCatalog):
+        return {row: dict(fields) for row, fields in catalog.rows.items()}
+    rows: Dict[str, Dict[str, Any]] = {}
+    for path, value in catalog.items():
+        if value is None:
+            continue
+        row, _, field = path.rpartition(".")
+        rows.setdefault(row, {})[field] = value
+    return rows
+
+
+def _row_tier(row: str, fields: Dict[str, Any]) -> Optional[int]:
+    """Truncation tier for a row, or None when the row is never dropped."""
+    if row.startswith("players."):
+        return TIER_PLAYER if fields.get("minutes") else TIER_UNUSED_PLAYER
+    if row.startswith("timeline."):
+        return None if fields.get("type") in ("goal", "card") else TIER_MINOR_EVENT
+    return None
+
+
+def compact_payload(
+    match: MatchData,
+    catalog: Dict[str, Any],
+    figure_summaries: Dict[str, Any],
+    availability: Dict[str, bool],
+    extras: Dict[str, Any],
+) -> Dict[str, Any]:
+    aggregates = _drop_none(match.aggregates.model_dump(exclude={"raw", "normalized"}))
+    payload: Dict[str, Any] = {
+        "match_context": _drop_none(match.match.model_dump()),
+        "teams": [[team.id, team.name, team.side] for team in match.teams],
+        "availability": availability,
+        "evidence": evidence_rows(catalog),
+    }
+    if aggregates:
+        payload["aggregates"] = aggregates
+    has_player_rows = (
+        catalog.in_namespace("players")
+        if isinstance(catalog, EvidenceCatalog)
+        else any(path.startswith("players.") for path in catalog)
+    )
+    if not has_player_rows:
+        # Without player evidence rows the model still needs names for the narrative.
+        payload["roster"] = [[player.name, player.teamId, player.position] for player in match.players]
+    if figure_summaries:
+        payload["figure_summaries"] = figure_summaries
+    payload.update({key: value for key, value in extras.items() if value})
+    return payload
+
+
+def _droppable(payload: Dict[str, Any]) -> List[Tuple[int, int, str, Optional[str]]]:
+    """Deterministic drop order: (tier, position, container, key)."""
+    candidates: List[Tuple[int, int, str, Optional[str]]] = []
+    rows = list(payload["evidence"].items())
+    # Later rows (bench players, late events) go before earlier ones.
+    for position, (row, fields) in enumerate(reversed(rows)):
+        tier = _row_tier(row, fields)
+        if tier is not None:
+            candidates.append((tier, position, "evidence", row))
+    for position, key in enumerate(reversed(list(payload.get("figure_summaries", {})))):
+        candidates.append((TIER_FIGURE_SUMMARY, position, "figure_summaries", key))
+    if "roster" in payload:
+        candidates.append((TIER_ROSTER, 0, "roster", None))
+    return sorted(candidates, key=lambda item: (item[0], item[1]))
+
+
+def fit_to_budget(payload: Dict[str, Any], token_budget: int) -> Tuple[Dict[str, Any], int]:
+    """Drop low-priority content until ``payload`` fits; return it and the drop count.
+
+    Match context, team stats, score and goal/card events are never dropped,
+    so a very small budget can still be exceeded.
+    """
+    if token_budget <= 0 or estimate_tokens(_dumps(payload)) <= token_budget:
+        return payload, 0
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    size = len(_dumps(payload))
+    dropped = 0
+    for _, _, container, key in _droppable(payload):
+        if size <= budget_chars:
+            break
+        if container == "roster":
+            size -= len(_dumps(payload.pop("roster"))) + len('"roster":,')
+        else:
+            section = payload[container]
+            size -= len(_dumps(key)) + len(_dumps(section.pop(key))) + 2
+            if not section and container == "figure_summaries":
+                payload.pop(container)
+        dropped += 1
+    payload["omitted_items"] = dropped
+    return payload, dropped
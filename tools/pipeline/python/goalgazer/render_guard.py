@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .schemas import FigureMeta
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows has no RLIMIT_AS
+    resource = None
+
+
+@dataclass
+class RenderJob:
+    """One figure to render in an isolated worker process."""
+
+    figure_id: str
+    render: Callable[..., FigureMeta]
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    # Cheap in-process substitute used when the guarded render fails.
+    fallback: Optional[Callable[[], FigureMeta]] = None
+
+
+@dataclass
+class RenderOutcome:
+    figure_id: str
+    figure: Optional[FigureMeta]
+    error: Optional[str] = None
+    fallback_used: bool = False
+    seconds: float = 0.0
+
+
+def _current_address_space() -> int:
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[0])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _apply_memory_cap(memory_mb: int) -> None:
+    # The cap is on memory *added* by the render, on top of the forked image.
+    if resource is None or memory_mb <= 0:
+        return
+    limit = _current_address_space() + memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _describe(exc: BaseException) -> str:
+    message = str(exc)[:200]
+    if isinstance(exc, MemoryError) and not message:
+        message = "memory cap exceeded"
+    return f"{type(exc).__name__}: {message}" if message else type(exc).__name__
+
+
+def _child(conn, job: RenderJob, memory_mb: int) -> None:
+    try:
+        _apply_memory_cap(memory_mb)
+        conn.send(("ok", job.render(*job.args, **job.kwargs)))
+    except BaseException as exc:
+        try:
+            conn.send(("error", _describe(exc)))
+        except Exception:
+            pass
+    finally:
+        conn.close()
+
+
+def mp_context():
+    """Start method for figure and batch worker processes."""
+    methods = multiprocessing.get_all_start_methods()
+    # fork keeps warm imports; spawn is the only option on Windows.
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+
+def _stop(process) -> None:
+    process.terminate()
+    process.join(2)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+
+def _finish(job: RenderJob, error: Optional[str], started: float) -> RenderOutcome:
+    outcome = RenderOutcome(job.figure_id, None, error, seconds=time.perf_counter() - started)
+    if job.fallback is not None:
+        try:
+            outcome.figure = job.fallback()
+            outcome.fallback_used = True
+        except Exception as exc:
+            outcome.error = f"{error}; fallback failed: {type(exc).__name__}: {exc}"
+    print(f"Figure {job.figure_id} failed ({outcome.error}); "
+          f"{'using fallback' if outcome.fallback_used else 'dropped'}.", file=sys.stderr)
+    return outcome
+
+
+def run_guarded(
+    jobs: List[RenderJob],
+    timeout: float,
+    memory_mb: int,
+    max_parallel: Optional[int] = None,
+) -> List[RenderOutcome]:
+    """Render each job in its own process under a wall-clock timeout and memory cap.
+
+    Outcomes are returned in job order. A crash, timeout or exception in one
+    figure never propagates; the job's fallback (if any) is used instead.
+    """
+    ctx = mp_context()
+    max_parallel = max(1, max_parallel or os.cpu_count() or 1)
+    outcomes: Dict[int, RenderOutcome] = {}
+    pending = list(enumerate(jobs))
+    running: Dict[int, Tuple[Any, Any, float]] = {}
+
+    while pending or running:
+        while pending and len(running) < max_parallel:
+            index, job = pending.pop(0)
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            process = ctx.Process(target=_child, args=(child_conn, job, memory_mb), daemon=True)
+            process.start()
+            child_conn.close()
+            running[index] = (process, parent_conn, time.perf_counter())
+
+        for index, (process, conn, started) in list(running.items()):
+            job = jobs[index]
+            if conn.poll(0.05):
+                try:
+                    status, payload = conn.recv()
+                except EOFError:
+                    # Died before reporting; the exit code is only set once joined.
+                    process.join(5)
+                    status, payload = "error", f"render process exited with code {process.exitcode}"
+                process.join(5)
+                if process.is_alive():
+                    _stop(process)
+                conn.close()
+                del running[index]
+                if status == "ok":
+                    outcomes[index] = RenderOutcome(job.figure_id, payload, seconds=time.perf_counter() - started)
+                else:
+                    outcomes[index] = _finish(job, payload, started)
+            elif time.perf_counter() - started > timeout:
+                _stop(process)
+                conn.close()
+                del running[index]
+                outcomes[index] = _finish(job, f"timed out after {timeout:g}s", started)
+
+    return [outcomes[index] for index in range(len(jobs))]
+
+
+def run_inline(jobs: List[RenderJob]) -> List[RenderOutcome]:
+    """Render jobs in-process; exceptions are contained but nothing is capped."""
+    outcomes = []
+    for job in jobs:
+        started = time.perf_counter()
+        try:
+            figure = job.render(*job.args, **job.kwargs)
+            outcomes.append(RenderOutcome(job.figure_id, figure, seconds=time.perf_counter() - started))
+        except Exception as exc:
+            outcomes.append(_finish(job, _describe(exc), started))
+    return outcomes
+
+
+def figure_failures(outcomes: List[RenderOutcome]) -> List[Dict[str, Any]]:
+    return [
+        {"id": outcome.figure_id, "reason": outcome.error, "fallback": outcome.fallback_used}
+        for outcome in outcomes
+        if outcome.error
+    ]
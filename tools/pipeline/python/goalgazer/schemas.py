@@ -124,12 +124,14 @@ class MatchData(BaseModel):
 
 class FigureMeta(BaseModel):
     id: str
-    src_relative: str
+    # PNG only; None when the figure was emitted as a chart spec alone.
+    src_relative: Optional[str] = None
     alt: str
     caption: str
     width: int
     height: int
     kind: Literal["stats_comparison", "timeline", "pass_network", "shot_proxy", "other"]
+    spec_relative: Optional[str] = None
 
 
 class LLMClaim(BaseModel):
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import settings
+from .figure_paths import build_src_relative
+
+# Slim article layout. The full article carries blocks no page render needs:
+# the raw API statistics response, the full player tables and the provenance
+# notes. slim_article moves each of them into a sidecar JSON file
+# named by the SHA-256 of its content and leaves a reference in its place:
+#   "sidecars": {"players": {"src": "/generated/sidecars/ab/ab12….json",
+#                            "sha256": "ab12…", "bytes": 18342}, ...}
+# Sidecars live next to the generated figures, so the Node wrapper uploads
+# them the same way; identical content maps to the same file, so re-running a
+# match does not duplicate anything. hydrate_article restores the full layout.
+
+SidecarBlock = Tuple[Callable[[Dict[str, Any]], Any], Callable[[Dict[str, Any], Any], None]]
+
+
+def _pop_team_stats_raw(article: Dict[str, Any]) -> Any:
+    return article.get("team_stats", {}).pop("raw", None)
+
+
+def _put_team_stats_raw(article: Dict[str, Any], value: Any) -> None:
+    article.setdefault("team_stats", {})["raw"] = value
+
+
+def _pop_players(article: Dict[str, Any]) -> Any:
+    return article.pop("players", None)
+
+
+def _put_players(article: Dict[str, Any], value: Any) -> None:
+    article["players"] = value
+
+
+def _pop_provenance(article: Dict[str, Any]) -> Any:
+    # llm_usage stays inline: it changes on every uncached run, and in a
+    # content-hashed sidecar it would make every regeneration look changed.
+    provenance = article.get("data_provenance", {})
+    return {"notes": provenance.pop("notes")} if "notes" in provenance else None
+
+
+def _put_provenance(article: Dict[str, Any], value: Any) -> None:
+    article.setdefault("data_provenance", {}).update(value)
+
+
+SIDECAR_BLOCKS: Dict[str, SidecarBlock] = {
+    "team_stats_raw": (_pop_team_stats_raw, _put_team_stats_raw),
+    "players": (_pop_players, _put_players),
+    "provenance": (_pop_provenance, _put_provenance),
+}
+
+_write_lock = threading.Lock()
+
+
+def sidecar_dir() -> Path:
+    return settings.figure_output_base_dir / "sidecars"
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def write_sidecar(value: Any, root: Optional[Path] = None) -> Dict[str, Any]:
+    """Store ``value`` under its content hash and return the reference to embed."""
+    body = _encode(value)
+    digest = hashlib.sha256(body).hexdigest()
+    path = (root or sidecar_dir()) / digest[:2] / f"{digest}.json"
+    with _write_lock:
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, path)
+    src = build_src_relative(path) if root is None else path.relative_to(root).as_posix()
+    return {"src": src, "sha256": digest, "bytes": len(body)}
+
+
+def slim_article(article: Dict[str, Any], root: Optional[Path] = None) -> Dict[str, Any]:
+    """A copy of ``article`` with the heavy blocks replaced by sidecar references."""
+    slim = json.loads(json.dumps(article))
+    refs: Dict[str, Dict[str, Any]] = {}
+    # Empty blocks are dropped rather than referenced; hydration leaves them absent.
+    for name, (take, _) in SIDECAR_BLOCKS.items():
+        value = take(slim)
+        if value:
+            refs[name] = write_sidecar(value, root)
+    if refs:
+        slim["sidecars"] = refs
+    return slim
+
+
+def read_sidecar(ref: Dict[str, Any], root: Optional[Path] = None) -> Any:
+    """Load a sidecar from the local store, checking it against its hash."""
+    base = root or settings.figure_output_base_dir
+    src = ref["src"]
+    path = base / (src.removeprefix("/generated/") if root is None else src)
+    body = path.read_bytes()
+    if hashlib.sha256(body).hexdigest() != ref["sha256"]:
+        raise ValueError(f"Sidecar {src} does not match its sha256")
+    return json.loads(body)
+
+
+def hydrate_article(article: Dict[str, Any], root: Optional[Path] = None) -> Dict[str, Any]:
+    """A copy of a slim article with every sidecar block restored in place."""
+    full = json.loads(json.dumps(article))
+    for name, ref in (full.pop("sidecars", None) or {}).items():
+        if name in SIDECAR_BLOCKS:
+            SIDECAR_BLOCKS[name][1](full, read_sidecar(ref, root))
+    return full
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Pattern
+
+# Incremental checks over a streamed LLM JSON response. The monitor tokenizes
+# characters as they arrive and raises StreamAborted only for violations that
+# no later content can repair: a non-object root, a known top-level field with
+# the wrong JSON type, or a forbidden term in a narrative string.
+
+_JSON_TYPES = {
+    "{": "object",
+    "[": "array",
+    '"': "string",
+    "t": "boolean",
+    "f": "boolean",
+    "n": "null",
+}
+
+# (top-level key, innermost object key) pairs whose string values are narrative.
+NARRATIVE_FIELDS = {
+    ("sections", "paragraphs"),
+    ("sections", "bullets"),
+    ("sections", "claim"),
+    ("player_notes", "summary"),
+}
+
+
+_TRAILING_WORD = re.compile(r"\w+$")
+
+
+class StreamAborted(ValueError):
+    """A streamed response is certain to fail validation."""
+
+
+@dataclass
+class _Frame:
+    kind: str  # object | array
+    key: Optional[str] = None
+    expecting_key: bool = False
+
+
+@dataclass
+class StreamMonitor:
+    schema: Dict[str, Any]
+    # Combined forbidden-term matcher from validation.forbidden_matcher.
+    forbidden: Optional[Pattern[str]] = None
+    # Set by a hedged race once another provider has won.
+    cancel: Optional[threading.Event] = None
+    chars_seen: int = 0
+    _stack: List[_Frame] = field(default_factory=list)
+    _started: bool = False
+    _awaiting_value: bool = False
+    _in_string: bool = False
+    _escape: bool = False
+    _string_is_key: bool = False
+    _buffer: List[str] = field(default_factory=list)
+
+    def feed(self, chunk: str) -> None:
+        if self.cancel is not None and self.cancel.is_set():
+            self._abort("cancelled")
+        self.chars_seen += len(chunk)
+        for char in chunk:
+            self._consume(char)
+        # Text only grows, so a term inside an open string is final once the
+        # trailing, possibly unfinished word is excluded.
+        if self._in_string and not self._string_is_key:
+            self._check_narrative(_TRAILING_WORD.sub("", "".join(self._buffer)))
+
+    def _abort(self, reason: str) -> None:
+        raise StreamAborted(f"{reason} (after {self.chars_seen} chars)")
+
+    def _consume(self, char: str) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+                self._buffer.append(char)
+            elif char == "\\":
+                self._escape = True
+                self._buffer.append(char)
+            elif char == '"':
+                self._in_string = False
+                self._end_string("".join(self._buffer))
+            else:
+                self._buffer.append(char)
+            return
+        if char.isspace():
+            return
+        if not self._started:
+            if char != "{":
+                self._abort("response root is not a JSON object")
+            self._started = True
+            self._stack.append(_Frame("object", expecting_key=True))
+            return
+        if not self._stack:
+            return
+        top = self._stack[-1]
+        if char in "}]":
+            self._stack.pop()
+            self._awaiting_value = False
+            return
+        if char == ":":
+            self._awaiting_value = True
+            return
+        if char == ",":
+            if top.kind == "object":
+                top.expecting_key = True
+            else:
+                self._awaiting_value = True
+            return
+        if char == '"':
+            self._in_string = True
+            self._buffer = []
+            self._string_is_key = top.kind == "object" and top.expecting_key
+            if self._string_is_key:
+                return
+        if self._awaiting_value or top.kind == "array":
+            self._start_value(char)
+
+    def _start_value(self, char: str) -> None:
+        self._awaiting_value = False
+        if len(self._stack) == 1:
+            key = self._stack[0].key
+            expected = self.schema.get("properties", {}).get(key or "", {}).get("type")
+            actual = _JSON_TYPES.get(char, "number")
+            if expected and actual != expected and not (expected == "integer" and actual == "number"):
+                self._abort(f"top-level field {key!r} is {actual}, expected {expected}")
+        if char == "{":
+            self._stack.append(_Frame("object", expecting_key=True))
+        elif char == "[":
+            self._stack.append(_Frame("array"))
+            self._awaiting_value = True
+
+    def _end_string(self, text: str) -> None:
+        top = self._stack[-1]
+        if self._string_is_key:
+            top.key = text
+            top.expecting_key = False
+            return
+        self._check_narrative(text)
+
+    def _check_narrative(self, text: str) -> None:
+        object_keys = [frame.key for frame in self._stack if frame.kind == "object"]
+        if len(object_keys) >= 2 and (object_keys[0], object_keys[-1]) in NARRATIVE_FIELDS:
+            match = self.forbidden.search(text) if self.forbidden is not None else None
+            if match:
+                self._abort(f"forbidden term {match.group(0)!r} in {object_keys[0]}.{object_keys[-1]}")
+
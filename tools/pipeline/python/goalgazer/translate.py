@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import argparse
+import contextvars
+import copy
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from . import llm_metrics
+from .config import settings
+from .schemas import TRANSLATABLE_TEXT_PATHS
+from .validation import check_article
+
+# Translation stage for finished articles. Strings are pulled out by
+# TRANSLATABLE_TEXT_PATHS, deduplicated, and looked up in a persistent
+# translation memory keyed by language and source-text hash. Only misses are
+# sent to the model, in batches; every target language runs concurrently.
+
+LANGUAGE_NAMES = {"zh": "Simplified Chinese (zh-CN)", "ja": "Japanese (ja-JP)"}
+
+TRANSLATION_SYSTEM_PROMPT = (
+    "You are a professional sports localization translator. "
+    "Translate every value in 'strings' from English into 'target_language'.\n"
+    "1. Return STRICT JSON only: {\"translations\": {\"<id>\": \"<translated text>\"}} with exactly the same ids.\n"
+    "2. Keep numbers, minutes, scores, dates, URLs and paths unchanged.\n"
+    "3. Keep team and player names exactly as written.\n"
+    "4. Translate naturally for football readers; do not add or drop information."
+)
+
+PathKey = Tuple[Any, ...]
+
+
+def _walk(node: Any, parts: List[str], prefix: PathKey) -> Iterator[Tuple[PathKey, str]]:
+    if not parts:
+        if isinstance(node, str) and node.strip():
+            yield prefix, node
+        return
+    part, rest = parts[0], parts[1:]
+    if part.endswith("[]"):
+        items = node.get(part[:-2]) if isinstance(node, dict) else None
+        if isinstance(items, list):
+            for idx, item in enumerate(items):
+                yield from _walk(item, rest, prefix + (part[:-2], idx))
+    elif isinstance(node, dict) and part in node:
+        yield from _walk(node[part], rest, prefix + (part,))
+
+
+def extract_strings(article: Dict[str, Any], paths: Sequence[str] = TRANSLATABLE_TEXT_PATHS) -> List[Tuple[PathKey, str]]:
+    """Every (location, text) pair matched by ``paths``, in path order."""
+    found: List[Tuple[PathKey, str]] = []
+    for path in paths:
+        found.extend(_walk(article, path.split("."), ()))
+    return found
+
+
+def _set(article: Dict[str, Any], location: PathKey, value: str) -> None:
+    node: Any = article
+    for part in location[:-1]:
+        node = node[part]
+    node[location[-1]] = value
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """On-disk memory: one JSON shard per language and hash prefix."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or settings.translation_memory_dir
+        self._lock = threading.Lock()
+
+    def _shard(self, lang: str, key: str) -> Path:
+        return self.root / lang / f"{key[:2]}.json"
+
+    def _read(self, path: Path) -> Dict[str, str]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def get_many(self, lang: str, texts: Sequence[str]) -> Dict[str, str]:
+        shards: Dict[Path, Dict[str, str]] = {}
+        hits: Dict[str, str] = {}
+        for text in texts:
+            key = text_hash(text)
+            path = self._shard(lang, key)
+            if path not in shards:
+                shards[path] = self._read(path)
+            if key in shards[path]:
+                hits[text] = shards[path][key]
+        return hits
+
+    def put_many(self, lang: str, pairs: Dict[str, str]) -> None:
+        by_shard: Dict[Path, Dict[str, str]] = {}
+        for text, translated in pairs.items():
+            key = text_hash(text)
+            by_shard.setdefault(self._shard(lang, key), {})[key] = translated
+        with self._lock:
+            for path, entries in by_shard.items():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                merged = {**self._read(path), **entries}
+                tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_text(json.dumps(merged, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp_path, path)
+
+
+def _batches(texts: List[str], max_items: int, max_chars: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    size = 0
+    for text in texts:
+        if batch and (len(batch) >= max_items or size + len(text) > max_chars):
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text)
+    if batch:
+        yield batch
+
+
+def _translate_batch(texts: List[str], lang: str) -> Dict[str, str]:
+    from .llm_generate import call_llm
+
+    request = {
+        "target_language": LANGUAGE_NAMES.get(lang, lang),
+        "strings": {str(idx): text for idx, text in enumerate(texts)},
+    }
+    messages = [
+        {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps(request, ensure_ascii=False)},
+    ]
+    try:
+        translations = json.loads(call_llm(messages, purpose=f"translate:{lang}")).get("translations")
+        if not isinstance(translations, dict):
+            raise ValueError("response has no 'translations' object")
+    except ValueError as e:
+        llm_metrics.set_outcome("invalid", f"{type(e).__name__}: {e}")
+        raise
+    result = {}
+    for idx, text in enumerate(texts):
+        value = translations.get(str(idx))
+        if isinstance(value, str) and value.strip():
+            result[text] = value
+    llm_metrics.set_outcome("ok" if len(result) == len(texts) else "partial")
+    return result
+
+
+def _translate_language(texts: List[str], lang: str, memory: TranslationMemory) -> Tuple[Dict[str, str], Dict[str, int]]:
+    known = memory.get_many(lang, texts)
+    misses = [text for text in texts if text not in known]
+    stats = {"strings": len(texts), "memory_hits": len(known), "translated": 0, "failed": 0}
+    for batch in _batches(misses, settings.translation_batch_items, settings.translation_batch_chars):
+        translated: Dict[str, str] = {}
+        for attempt in range(2):
+            try:
+                translated = _translate_batch(batch, lang)
+                break
+            except Exception as e:
+                print(f"Translation batch ({lang}, {len(batch)} strings) attempt {attempt + 1} failed: {type(e).__name__}: {str(e)[:100]}", file=sys.stderr)
+        if translated:
+            memory.put_many(lang, translated)
+            known.update(translated)
+        stats["translated"] += len(translated)
+        stats["failed"] += len(batch) - len(translated)
+    return known, stats
+
+
+def translate_article(
+    article: Dict[str, Any],
+    languages: Sequence[str],
+    memory: Optional[TranslationMemory] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Translated copies of ``article`` per language.
+
+    A language with any string left untranslated is omitted so the caller can
+    fall back to another translator; its successful batches stay in memory.
+    """
+    memory = memory or TranslationMemory()
+    located = extract_strings(article)
+    unique = list(dict.fromkeys(text for _, text in located))
+
+    with ThreadPoolExecutor(max_workers=max(1, len(languages)), thread_name_prefix="translate") as executor:
+        futures = {lang: executor.submit(contextvars.copy_context().run, _translate_language, unique, lang, memory) for lang in languages}
+        results = {lang: future.result() for lang, future in futures.items()}
+
+    translated_articles: Dict[str, Dict[str, Any]] = {}
+    for lang, (lookup, stats) in results.items():
+        print(
+            f"Translation [{lang}]: {stats['strings']} unique strings, {stats['memory_hits']} from memory, "
+            f"{stats['translated']} translated, {stats['failed']} failed.",
+            file=sys.stderr,
+        )
+        if stats["failed"]:
+            continue
+        translated = copy.deepcopy(article)
+        for location, text in located:
+            if text in lookup:
+                _set(translated, location, lookup[text])
+        check_article(translated)
+        translated_articles[lang] = translated
+    return translated_articles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Translate a GoalGazer article JSON (read from stdin or --input)")
+    parser.add_argument("--langs", nargs="+", default=["zh", "ja"])
+    parser.add_argument("--input", help="Article JSON file; defaults to stdin")
+    args = parser.parse_args()
+
+    article = json.loads(Path(args.input).read_text(encoding="utf-8") if args.input else sys.stdin.read())
+    match_id = str((article.get("frontmatter") or {}).get("matchId", ""))
+    with llm_metrics.track(match_id):
+        translated = translate_article(article, args.langs)
+    print(json.dumps(translated, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,28 +5,28 @@ import json
 from pathlib import Path
 from typing import Any, Dict
 
-from jsonschema import validate
-
 from .config import settings
+from .content_index import ContentIndex
+from .validation import ARTICLE_SCHEMA_PATH, article_schema, check
 
 
 def _load_schema() -> Dict[str, Any]:
-    schema_path = Path(__file__).with_name("schema_match_analysis.json")
-    return json.loads(schema_path.read_text())
+    schema = article_schema()
+    if schema is None:
+        raise FileNotFoundError(f"Article schema not found: {ARTICLE_SCHEMA_PATH}")
+    return schema
 
 
 def _locate_article(match_id: str) -> Path:
     matches_dir = settings.web_content_dir / "matches"
-    index_path = settings.web_content_dir / "index.json"
-    if index_path.exists():
-        index = json.loads(index_path.read_text())
-        for entry in index:
-            if str(entry.get("matchId")) == str(match_id):
-                slug = entry.get("slug")
-                if slug:
-                    candidate = matches_dir / f"{slug}.json"
-                    if candidate.exists():
-                        return candidate
+    entry = ContentIndex().lookup(match_id)
+    if entry and entry.get("path"):
+        candidate = settings.web_content_dir / entry["path"]
+        if candidate.exists():
+            return candidate
+    candidate = matches_dir / str(match_id) / "index.en.json"
+    if candidate.exists():
+        return candidate
     matches_dir.mkdir(parents=True, exist_ok=True)
     candidates = sorted(matches_dir.glob(f"*_{match_id}.json"))
     if candidates:
@@ -37,8 +37,7 @@ def _locate_article(match_id: str) -> Path:
 def validate_match(match_id: str) -> Path:
     article_path = _locate_article(match_id)
     article = json.loads(article_path.read_text())
-    schema = _load_schema()
-    validate(instance=article, schema=schema)
+    check(article, _load_schema())
     return article_path
 
 
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+# Validation primitives shared by llm_generate, compose_article and
+# validate_match. Schemas are compiled and forbidden-term patterns combined
+# once per process; batch runs reuse them for every match.
+
+ARTICLE_SCHEMA_PATH = Path(__file__).with_name("schema_match_analysis.json")
+
+XG_TERMS = [r"\bxg\b", r"expected goals"]
+PLAYER_TERMS = [r"\brating\b", r"\bduel"]
+
+# id(schema) -> (schema, validator). Holding the schema keeps its id from
+# being reused by another dict while the entry exists.
+_VALIDATORS: Dict[int, Tuple[Dict[str, Any], Any]] = {}
+
+
+def schema_validator(schema: Dict[str, Any]):
+    """Compiled validator for ``schema``, built on first use."""
+    cached = _VALIDATORS.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    validator = cls(schema)
+    _VALIDATORS[id(schema)] = (schema, validator)
+    return validator
+
+
+def check(instance: Any, schema: Dict[str, Any]) -> None:
+    """Drop-in for ``jsonschema.validate`` that reuses the compiled validator."""
+    error = best_match(schema_validator(schema).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+@lru_cache(maxsize=1)
+def article_schema() -> Optional[Dict[str, Any]]:
+    if not ARTICLE_SCHEMA_PATH.exists():
+        return None
+    return json.loads(ARTICLE_SCHEMA_PATH.read_text())
+
+
+def check_article(article: Dict[str, Any]) -> None:
+    schema = article_schema()
+    if schema is not None:
+        check(article, schema)
+
+
+def forbidden_terms(availability: Dict[str, bool]) -> List[str]:
+    terms: List[str] = []
+    if not availability.get("has_xg"):
+        terms.extend(XG_TERMS)
+    if not availability.get("has_players"):
+        terms.extend(PLAYER_TERMS)
+    return terms
+
+
+@lru_cache(maxsize=None)
+def _combined(has_xg: bool, has_players: bool) -> Optional[Pattern[str]]:
+    terms = forbidden_terms({"has_xg": has_xg, "has_players": has_players})
+    if not terms:
+        return None
+    return re.compile("|".join(f"(?:{term})" for term in terms), re.IGNORECASE)
+
+
+def forbidden_matcher(availability: Dict[str, bool]) -> Optional[Pattern[str]]:
+    """One alternation over every forbidden term for this availability."""
+    return _combined(bool(availability.get("has_xg")), bool(availability.get("has_players")))
+
+
+def narrative_texts(payload: Dict[str, Any]) -> List[str]:
+    texts: List[str] = []
+    for section in payload.get("sections", []):
+        texts.extend(section.get("paragraphs", []))
+        texts.extend(section.get("bullets", []))
+        for claim in section.get("claims", []):
+            texts.append(claim.get("claim", ""))
+    for note in payload.get("player_notes", []):
+        texts.append(note.get("summary", ""))
+    return texts
+
+
+def find_forbidden(texts: Iterable[Optional[str]], availability: Dict[str, bool]) -> Optional[str]:
+    """Return the first forbidden term found in ``texts``, scanning them in one pass."""
+    matcher = forbidden_matcher(availability)
+    if matcher is None:
+        return None
+    match = matcher.search("\n".join(text or "" for text in texts))
+    return match.group(0) if match else None
+
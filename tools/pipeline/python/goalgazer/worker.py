@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import importlib
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, TextIO
+
+from .config import settings
+
+# Long-lived pipeline worker: `python -m goalgazer --mode worker`. Jobs arrive
+# as JSON lines on stdin or as POST /jobs on a local HTTP socket and run one at
+# a time in a warm child process, which keeps imports, matplotlib, compiled
+# schemas and HTTP sessions between jobs. The child is replaced after
+# ``max_jobs`` jobs (or if it dies) to contain leaks.
+#
+# Request:   {"id": "j1", "type": "run", "matchId": "1035037", "league": "epl",
+#             "options": {"narrative": "rules", "layout": "slim", "refresh_llm": true},
+#             "previous": {...published article, optional}}
+#            {"type": "ping"} | {"type": "shutdown"}
+# Events:    {"id", "event": "queued", "position"}
+#            {"id", "event": "progress", "stage": "prepared"|"narrated"|"composed", "seconds", ...}
+#            {"id", "event": "article", "article", "diff"?}   (final)
+#            {"id", "event": "error", "error"}                (final)
+#            {"event": "ready"|"pong"|"recycled"|"shutdown", ...}
+# Over HTTP, POST /jobs streams the job's events as application/x-ndjson;
+# GET /health reports the same as ping and POST /shutdown stops the worker.
+# stdin EOF or a shutdown message drains the queue first; SIGTERM/SIGINT
+# finish the running job and cancel the queued ones.
+
+# Job option -> Settings field, applied for the duration of one job.
+JOB_OPTIONS = {
+    "narrative": "narrative_engine",
+    "layout": "article_layout",
+    "chart_output": "chart_output",
+    "refresh_llm": "llm_cache_refresh",
+}
+FINAL_EVENTS = ("article", "error")
+STOP_TIMEOUT_SECONDS = 30.0
+
+Emit = Callable[[Dict[str, Any]], None]
+
+
+class _Shutdown(Exception):
+    pass
+
+
+def _pipeline():
+    return importlib.import_module(f"{__package__}.__main__")
+
+
+def run_job(payload: Dict[str, Any], emit: Emit) -> None:
+    """Run one job in this process, emitting progress events and one final event."""
+    options = payload.get("options") or {}
+    saved = {field: getattr(settings, field) for field in JOB_OPTIONS.values()}
+    try:
+        for option, field in JOB_OPTIONS.items():
+            if option in options:
+                setattr(settings, field, options[option])
+        article = _pipeline().generate_article(
+            str(payload["matchId"]),
+            payload.get("league", "epl"),
+            progress=lambda stage, **info: emit({"event": "progress", "stage": stage, **info}),
+        )
+        result: Dict[str, Any] = {"event": "article", "article": article}
+        if payload.get("previous"):
+            result["diff"] = importlib.import_module(f"{__package__}.article_diff").diff_articles(payload["previous"], article)
+        emit(result)
+    except Exception as e:
+        emit({"event": "error", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        for field, value in saved.items():
+            setattr(settings, field, value)
+
+
+def _child_main(conn, overrides: Dict[str, Any]) -> None:
+    # stdout belongs to the protocol; stray prints from the pipeline go to stderr.
+    sys.stdout = sys.stderr
+    # Shutdown is the parent's call: it lets the running job finish, then stops us.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    started = time.perf_counter()
+    _pipeline().warm_worker(overrides)
+    conn.send({"event": "warm", "seconds": round(time.perf_counter() - started, 3)})
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message.get("type") == "stop":
+            break
+        run_job(message, conn.send)
+    conn.close()
+
+
+class PipelineWorker:
+    """Runs jobs one at a time in a warm child process, replaced every ``max_jobs`` jobs."""
+
+    def __init__(self, max_jobs: int, overrides: Dict[str, Any]):
+        self.max_jobs = max(1, max_jobs)
+        self.overrides = overrides
+        self.jobs_done = 0
+        self.process = None
+        self.conn = None
+        self._since_spawn = 0
+
+    def start(self) -> None:
+        # Spawned rather than forked: replacements start from the job thread while
+        # other threads run, and the warm-up happens in the child either way.
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_child_main, args=(child_conn, self.overrides), name="goalgazer-worker")
+        self.process.start()
+        child_conn.close()
+        self._since_spawn = 0
+        warm = self.conn.recv()
+        print(f"Worker: process {self.process.pid} warm in {warm['seconds']:.1f}s.", file=sys.stderr)
+
+    def stop(self) -> None:
+        if self.process is None:
+            return
+        try:
+            self.conn.send({"type": "stop"})
+        except (OSError, ValueError):
+            pass
+        self.process.join(STOP_TIMEOUT_SECONDS)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        self.process = self.conn = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.process is not None and self._since_spawn >= self.max_jobs
+
+    def recycle(self) -> Dict[str, Any]:
+        """Replace the child with a fresh warm one."""
+        old_pid = self.process.pid if self.process else None
+        self.stop()
+        self.start()
+        return {"event": "recycled", "old_pid": old_pid, "pid": self.process.pid, "jobs_done": self.jobs_done}
+
+    def run(self, payload: Dict[str, Any], emit: Emit) -> None:
+        """Run one job in the child, forwarding its events until the final one."""
+        if self.process is None or not self.process.is_alive():
+            self.start()
+        try:
+            self.conn.send(payload)
+            while True:
+                event = self.conn.recv()
+                if event.get("event") in FINAL_EVENTS:
+                    break
+                emit(event)
+        except (EOFError, OSError) as e:
+            code = self.process.exitcode if self.process else None
+            event = {"event": "error", "error": f"Worker process exited ({code}): {type(e).__name__}"}
+            self.stop()
+        # Count the job before the final event so a ping right after it sees it.
+        self.jobs_done += 1
+        self._since_spawn += 1
+        emit(event)
+
+
+class JobQueue:
+    """Feeds queued jobs to one PipelineWorker on a background thread."""
+
+    def __init__(self, worker: PipelineWorker, notify: Emit):
+        self.worker = worker
+        self.notify = notify
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="goalgazer-jobs", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            payload, emit, done = item
+            try:
+                self.worker.run(payload, emit)
+            finally:
+                done.set()
+            # Replace the child between jobs. While draining for shutdown (stdin
+            # EOF) queued jobs still get a fresh child; only after the last one
+            # is the restart skipped.
+            if self.worker.exhausted and (not self._closing or self._has_queued_job()):
+                self.notify(self.worker.recycle())
+
+    def _has_queued_job(self) -> bool:
+        with self._queue.mutex:
+            return any(item is not None for item in self._queue.queue)
+
+    def submit(self, payload: Dict[str, Any], emit: Emit) -> threading.Event:
+        done = threading.Event()
+        emit({"event": "queued", "position": self._queue.qsize()})
+        self._queue.put((payload, emit, done))
+        return done
+
+    def status(self) -> Dict[str, Any]:
+        pid = self.worker.process.pid if self.worker.process else None
+        return {"pid": pid, "jobs_done": self.worker.jobs_done, "queued": self._queue.qsize()}
+
+    def close(self, drain: bool) -> None:
+        """Stop after the running job; queued jobs are run first when ``drain``."""
+        self._closing = True
+        if not drain:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    payload, emit, done = item
+                    emit({"event": "error", "error": "cancelled: worker shutting down"})
+                    done.set()
+        self._queue.put(None)
+        self._thread.join()
+        self.worker.stop()
+
+
+def _line_writer(stream: TextIO) -> Emit:
+    lock = threading.Lock()
+
+    def write(event: Dict[str, Any]) -> None:
+        with lock:
+            stream.write(json.dumps(event) + "\n")
+            stream.flush()
+
+    return write
+
+
+def _serve_stdio(jobs: JobQueue, write: Emit) -> bool:
+    """Read requests until EOF or shutdown; True when the queue should be drained."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            write({"event": "error", "error": f"Invalid request: {e}"})
+            continue
+        kind = request.get("type", "run")
+        if kind == "ping":
+            write({"event": "pong", **jobs.status()})
+        elif kind == "shutdown":
+            break
+        elif kind == "run" and request.get("matchId"):
+            job_id = request.get("id") or str(request["matchId"])
+            jobs.submit(request, lambda event, job_id=job_id: write({"id": job_id, **event}))
+        else:
+            write({"id": request.get("id"), "event": "error", "error": "Expected a run request with a matchId"})
+    return True
+
+
+def _serve_http(jobs: JobQueue, host: str, port: int) -> bool:
+    class Handler(BaseHTTPRequestHandler):
+        def _json(self, status: int, body: Dict[str, Any]) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                self._json(200, {"status": "ok", **jobs.status()})
+            else:
+                self._json(404, {"error": "not found"})
+
+        def do_POST(self) -> None:
+            if self.path == "/shutdown":
+                self._json(202, {"status": "shutting down"})
+                threading.Thread(target=server.shutdown, daemon=True).start()
+                return
+            if self.path != "/jobs":
+                self._json(404, {"error": "not found"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            except ValueError as e:
+                self._json(400, {"error": f"Invalid request: {e}"})
+                return
+            if not request.get("matchId"):
+                self._json(400, {"error": "matchId is required"})
+                return
+            job_id = request.get("id") or str(request["matchId"])
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            write = _line_writer(_TextSink(self.wfile))
+            jobs.submit(request, lambda event: write({"id": job_id, **event})).wait()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            print(f"Worker HTTP: {format % args}", file=sys.stderr)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    print(f"Worker: listening on http://{host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+    return True
+
+
+class _TextSink:
+    """Minimal text stream over a binary socket file for _line_writer."""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def write(self, text: str) -> None:
+        try:
+            self.raw.write(text.encode("utf-8"))
+        except OSError:
+            pass  # the client went away; the job still completes
+
+    def flush(self) -> None:
+        try:
+            self.raw.flush()
+        except OSError:
+            pass
+
+
+def serve(listen: str = "stdio", max_jobs: Optional[int] = None) -> None:
+    """Run the worker until stdin closes, a shutdown request or SIGTERM/SIGINT."""
+    # Keep the real stdout for protocol lines; anything else printed goes to stderr.
+    protocol, sys.stdout = sys.stdout, sys.stderr
+    write = _line_writer(protocol)
+    notify = write if listen == "stdio" else lambda event: print(f"Worker: {json.dumps(event)}", file=sys.stderr)
+
+    def on_signal(signum, frame):
+        raise _Shutdown()
+
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+    overrides = {name: getattr(settings, name) for name in vars(settings)}
+    worker = PipelineWorker(max_jobs or settings.worker_max_jobs, overrides)
+    worker.start()
+    jobs = JobQueue(worker, notify)
+    notify({"event": "ready", **jobs.status(), "max_jobs": worker.max_jobs})
+
+    drain = False
+    try:
+        if listen == "stdio":
+            drain = _serve_stdio(jobs, write)
+        else:
+            host, _, port = listen.rpartition(":")
+            drain = _serve_http(jobs, host or "127.0.0.1", int(port))
+    except _Shutdown:
+        print("Worker: signal received; finishing the running job.", file=sys.stderr)
+    finally:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        jobs.close(drain)
+        notify({"event": "shutdown", "jobs_done": worker.jobs_done, "pid": os.getpid()})
@@ -0,0 +1,62 @@
+import threading
+
+from goalgazer.content_index import ContentIndex
+
+
+def _entry(match_id, date, lang="en"):
+    return {
+        "matchId": match_id,
+        "title": f"Match {match_id}",
+        "date": date,
+        "league": "epl",
+        "season": "2024",
+        "path": f"matches/{match_id}/index.en.json",
+        "lang": lang,
+    }
+
+
+def _listing(index, pages):
+    return [[item["matchId"] for item in index.page("epl", "2024", n)["items"]] for n in range(1, pages + 1)]
+
+
+def test_upsert_pages_newest_first_and_lookup(tmp_path):
+    index = ContentIndex(root=tmp_path, page_size=2)
+    for n in (1, 3, 2, 5, 4):
+        index.upsert(_entry(str(n), f"2024-08-0{n}"))
+    assert _listing(index, 3) == [["5", "4"], ["3", "2"], ["1"]]
+
+    # Moving an entry rewrites only what changed but keeps the order right.
+    index.upsert(_entry("1", "2024-08-09"))
+    assert _listing(index, 3) == [["1", "5"], ["4", "3"], ["2"]]
+
+    index.upsert(_entry("3", "2024-08-03", lang="zh"))
+    assert index.lookup("3") == {
+        "path": "matches/3/index.en.json",
+        "league": "epl",
+        "season": "2024",
+        "langs": ["en", "zh"],
+    }
+    assert index.lookup("missing") is None
+
+
+def test_page_size_change_rewrites_every_page(tmp_path):
+    for n in range(5):
+        ContentIndex(root=tmp_path, page_size=2).upsert(_entry(str(n), f"2024-08-0{n}"))
+    resized = ContentIndex(root=tmp_path, page_size=3)
+    resized.upsert(_entry("5", "2024-08-05"))
+
+    assert _listing(resized, 2) == [["5", "4", "3"], ["2", "1", "0"]]
+    assert not (tmp_path / "pages" / "epl" / "2024" / "3.json").exists()
+
+
+def test_concurrent_language_upserts_keep_every_lang(tmp_path):
+    index = ContentIndex(root=tmp_path, page_size=10)
+    langs = ["en", "zh", "ja", "ko", "fr", "de"]
+    threads = [threading.Thread(target=index.upsert, args=(_entry("7", "2024-08-07", lang),)) for lang in langs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert index.lookup("7")["langs"] == sorted(langs)
+    assert _listing(index, 1) == [["7"]]
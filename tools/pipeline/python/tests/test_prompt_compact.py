@@ -0,0 +1,25 @@
+from goalgazer.evidence import EvidenceCatalog
+from goalgazer.prompt_compact import evidence_rows, fit_to_budget
+
+
+def _catalog() -> EvidenceCatalog:
+    values = {"match.score.home": 2, "match.score.away": 1}
+    for idx in range(11):
+        values[f"players.home.{idx}.name"] = f"Player {idx}"
+        values[f"players.home.{idx}.minutes"] = 90 - idx
+    values["timeline.0.type"] = "subst"
+    values["timeline.0.minute"] = 60
+    return EvidenceCatalog(values)
+
+
+def test_fit_to_budget_leaves_catalog_rows_intact():
+    catalog = _catalog()
+    rows_before = {row: dict(fields) for row, fields in catalog.rows.items()}
+    namespaces_before = {name: list(rows) for name, rows in catalog.namespaces.items()}
+
+    payload, dropped = fit_to_budget({"evidence": evidence_rows(catalog)}, token_budget=20)
+
+    assert dropped > 0
+    assert len(payload["evidence"]) < len(rows_before)
+    assert catalog.rows == rows_before
+    assert catalog.namespaces == namespaces_before